@@ -0,0 +1,56 @@
+"""Micro-benchmark of trimesh_to_speckle_mesh() against the previous per-face loop.
+
+Usage: python -m benchmarks.bench_mesh --sizes 1000 100000
+"""
+
+import argparse
+import time
+import numpy as np
+import trimesh
+from specklepy.objects.geometry import Mesh
+from specklepy.objects.other import RenderMaterial
+from src.utils.colors import Color
+from src.utils.mesh import trimesh_to_speckle_mesh
+
+def legacy_trimesh_to_speckle_mesh(mesh: 'trimesh.Trimesh', opacity: float, color: 'Color'):
+    """The conversion before it was vectorised, kept here as the reference"""
+    vertices = [item for sublist in mesh.vertices for item in sublist]
+    faces, colors = [], []
+    for face in mesh.faces:
+        faces.append(3)
+        for vertex in face:
+            faces.append(int(vertex))
+            colors.append(color.value)
+    mesh = Mesh.create(faces=faces, vertices=vertices)
+    mesh['renderMaterial'] = RenderMaterial(opacity=opacity, diffuse=color.value, emissive=color.value)
+    return mesh
+
+def strip(faces: int) -> 'trimesh.Trimesh':
+    """Triangle strip with the given number of faces"""
+    vertices = np.random.default_rng(0).uniform(0, 1, (faces + 2, 3))
+    triangles = np.arange(faces)[:, np.newaxis] + np.arange(3)
+    return trimesh.Trimesh(vertices, triangles, process=False)
+
+def timed(function, meshes) -> float:
+    start = time.perf_counter()
+    for mesh in meshes:
+        function(mesh, 1, Color.Success)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000])
+    args = parser.parse_args()
+
+    print(f'{"meshes":>8} {"faces":>8} {"legacy (s)":>11} {"numpy (s)":>10} {"speedup":>8}')
+    for size in args.sizes:
+        # NOTE: as many column boxes as in a run of that size, and a single mesh with that many faces
+        for meshes in [[trimesh.creation.box((0.2, 0.3, 3.0))] * size, [strip(size)]]:
+            faces = len(meshes[0].faces)
+            assert legacy_trimesh_to_speckle_mesh(meshes[0], 1, Color.Success).faces == \
+                   trimesh_to_speckle_mesh(meshes[0], 1, Color.Success).faces
+            legacy, vectorised = timed(legacy_trimesh_to_speckle_mesh, meshes), timed(trimesh_to_speckle_mesh, meshes)
+            print(f'{len(meshes):>8} {faces:>8} {legacy:>11.3f} {vectorised:>10.3f} {legacy / vectorised:>8.2f}')
+
+if __name__ == '__main__':
+    main()
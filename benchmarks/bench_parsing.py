@@ -0,0 +1,41 @@
+"""Scaling of StructuralModel.create_column_objects() on synthetic ETABS models.
+
+Usage: python -m benchmarks.bench_parsing --sizes 1000 10000 50000 --workers 1 2 4
+"""
+
+import argparse
+import time
+from benchmarks.synthetic import assign_ids, create_model
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+
+def run(commit, workers: int, backend: str) -> float:
+    model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.setup_model()
+    start = time.perf_counter()
+    model.create_column_objects(workers=workers, backend=backend)
+    elapsed = time.perf_counter() - start
+    assert len(model.automate_results.elements_selected_conformity) == len(model.columns)
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--combinations', type=int, default=3)
+    parser.add_argument('--stations', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"elements":>9} {"backend":>8} {"workers":>8} {"time (s)":>9} {"speedup":>8}')
+    for size in args.sizes:
+        commit = create_model(columns=size, combinations=args.combinations, stations=args.stations)
+        assign_ids(commit)
+        serial = run(commit, 1, 'thread')
+        print(f'{size:>9} {"serial":>8} {1:>8} {serial:>9.3f} {1.0:>8.2f}')
+        for backend in ['thread', 'process']:
+            for workers in [workers for workers in args.workers if workers > 1]:
+                elapsed = run(commit, workers, backend)
+                print(f'{size:>9} {backend:>8} {workers:>8} {elapsed:>9.3f} {serial / elapsed:>8.2f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""End-to-end benchmark of automate_function() on synthetic ETABS commits, run offline against an in-memory server.
+
+Reports the throughput (columns per second) and the time and peak memory of every stage, and compares the throughput
+with the baselines stored by --save-baseline (benchmarks/baselines.json). Exits with 1 if a scenario is slower than its
+baseline by more than the tolerance. Throughput depends on the hardware, so baselines are machine-local: save them on
+the machine that runs the comparison, they are not part of the repository.
+
+Usage: python -m benchmarks.bench_pipeline --scenarios small medium [--save-baseline] [--trace-allocations]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from specklepy.api import operations
+from benchmarks.offline import InMemoryServerTransport, StubAutomationContext
+from benchmarks.synthetic import create_model
+from main import FunctionInputs, automate_function
+from src.utils.instrumentation import Instrumentation
+
+SCENARIOS = {
+    'small': {'columns': 200, 'beams': 200, 'slabs': 20},
+    'medium': {'columns': 2000, 'beams': 1000, 'slabs': 100},
+    'large': {'columns': 10000, 'beams': 5000, 'slabs': 500, 'combinations': 5, 'stations': 5}}
+BASELINES = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+def run(scenario: dict, trace_allocations: bool = False, **inputs) -> dict:
+    """One offline run of automate_function() on a synthetic commit, sent to and received from memory"""
+    transport = InMemoryServerTransport()
+    object_id = operations.send(create_model(**scenario), [transport], use_default_cache=False)
+    automate_context = StubAutomationContext(object_id)
+    instrumentation = Instrumentation(trace_allocations=trace_allocations)
+    function_inputs = FunctionInputs(persistent_design_cache=False, **inputs)
+
+    start = time.perf_counter()
+    automate_function(automate_context, function_inputs, transport, instrumentation)
+    wall_time = time.perf_counter() - start
+
+    if automate_context.status != 'succeeded':
+        raise RuntimeError(f'Run {automate_context.status}: {automate_context.status_message}')
+    return {'columns': scenario['columns'],
+            'wall_time': wall_time,
+            'columns_per_second': scenario['columns'] / wall_time,
+            'stages': {span['name']: {key: span[key] for key in ['wall_time', 'cpu_time', 'peak_rss', 'peak_allocated']}
+                       for span in instrumentation.report()}}
+
+def print_stages(result: dict) -> None:
+    print(f'  {"stage":<45} {"wall (s)":>9} {"cpu (s)":>9} {"RSS (MB)":>9} {"alloc (MB)":>11}')
+    for name, stage in result['stages'].items():
+        allocated = f'{stage["peak_allocated"]:>11.1f}' if stage['peak_allocated'] is not None else f'{"-":>11}'
+        rss = f'{stage["peak_rss"]:>9.1f}' if stage['peak_rss'] is not None else f'{"-":>9}'
+        print(f'  {name:<45} {stage["wall_time"]:>9.3f} {stage["cpu_time"]:>9.3f} {rss} {allocated}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=['small', 'medium'])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per scenario, the fastest one is kept')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed throughput loss against the baseline')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--trace-allocations', action='store_true', help='peak allocations per stage (slower)')
+    args = parser.parse_args()
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as file:
+            baselines = json.load(file)
+
+    regressions = []
+    for name in args.scenarios:
+        result = min((run(SCENARIOS[name], args.trace_allocations) for _ in range(args.repeat)),
+                     key=lambda result: result['wall_time'])
+        baseline = baselines.get(name)
+        comparison = ''
+        if baseline is not None:
+            ratio = result['columns_per_second'] / baseline['columns_per_second']
+            comparison = f' ({ratio:.2f}x baseline of {baseline["columns_per_second"]:.0f})'
+            if ratio < 1 - args.tolerance:
+                regressions.append(name)
+        print(f'{name}: {result["columns"]} columns in {result["wall_time"]:.3f} s, '
+              f'{result["columns_per_second"]:.0f} columns/s{comparison}')
+        print_stages(result)
+        if args.save_baseline:
+            baselines[name] = result
+
+    if args.save_baseline:
+        with open(BASELINES, 'w') as file:
+            json.dump(baselines, file, indent=2)
+    if regressions:
+        print(f'Throughput regression in: {", ".join(regressions)}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Stand-ins for the Speckle server and the AutomationContext, to run automate_function() offline."""
+
+import json
+from types import SimpleNamespace
+from typing import List, Optional
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.memory import MemoryTransport
+
+class InMemoryServerTransport(MemoryTransport):
+    """MemoryTransport that can also be received from, as a ServerTransport"""
+    def copy_object_and_children(self, id: str, target_transport: AbstractTransport) -> str:
+        root = self.get_object(id)
+        if root is None:
+            raise ValueError(f'Object {id} not found')
+        target_transport.begin_write()
+        for child_id in json.loads(root).get('__closure', {}):
+            target_transport.save_object(child_id, self.objects[child_id])
+        target_transport.save_object(id, root)
+        target_transport.end_write()
+        return root
+
+class StubClient:
+    """The calls of SpeckleClient made by automate_function(), commits are kept in memory"""
+    def __init__(self, source_application: str, referenced_object: str):
+        self.versions = {'version': SimpleNamespace(sourceApplication=source_application, referencedObject=referenced_object)}
+        self.models = {}
+        self.commit = SimpleNamespace(get=self.get_commit, create=self.create_commit)
+        self.branch = SimpleNamespace(get=self.get_branch, create=self.create_branch)
+
+    def get_commit(self, project_id: str, version_id: str):
+        return self.versions[version_id]
+
+    def create_commit(self, project_id: str, object_id: str, branch_name: str, **kwargs) -> str:
+        commit_id = f'commit{len(self.versions)}'
+        self.versions[commit_id] = SimpleNamespace(sourceApplication='Timber Design', referencedObject=object_id)
+        self.models.setdefault(branch_name, []).insert(0, self.versions[commit_id])
+        return commit_id
+
+    def get_branch(self, project_id: str, name: str, commits_limit: int = 10):
+        if name not in self.models:
+            return None
+        return SimpleNamespace(name=name, commits=SimpleNamespace(items=self.models[name][:commits_limit]))
+
+    def create_branch(self, stream_id: str, name: str, **kwargs) -> str:
+        self.models.setdefault(name, [])
+        return name
+
+class StubAutomationContext:
+    """The parts of AutomationContext used by automate_function(), results are kept for inspection"""
+    def __init__(self, referenced_object: str, source_application: str = 'ETABS'):
+        self.speckle_client = StubClient(source_application, referenced_object)
+        self.automation_run_data = SimpleNamespace(
+            project_id='project', triggers=[SimpleNamespace(payload=SimpleNamespace(version_id='version'))])
+        self.object_results: List[tuple] = []
+        self.files: List[str] = []
+        self.status: Optional[str] = None
+        self.status_message: Optional[str] = None
+
+    def attach_info_to_objects(self, category: str, object_ids: List[str], message: str = None, metadata: dict = None):
+        self.object_results.append(('info', category, object_ids, message, metadata))
+
+    def attach_warning_to_objects(self, category: str, object_ids: List[str], message: str = None, metadata: dict = None):
+        self.object_results.append(('warning', category, object_ids, message, metadata))
+
+    def store_file_result(self, file_path: str) -> None:
+        self.files.append(file_path)
+
+    def mark_run_success(self, status_message: Optional[str]) -> None:
+        self.status, self.status_message = 'succeeded', status_message
+
+    def mark_run_failed(self, status_message: str) -> None:
+        self.status, self.status_message = 'failed', status_message
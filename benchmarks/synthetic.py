@@ -0,0 +1,87 @@
+"""Synthetic ETABS commits for benchmarking, mirroring what an "Everything" send with analysis results contains."""
+
+import numpy as np
+from specklepy.objects import Base
+from specklepy.objects.geometry import Line, Point, Vector
+from specklepy.objects.structural import (Element1D, ElementType1D, Model, ModelInfo, ModelSettings, ModelUnits, Node,
+                                          Property1D, Restraint, SectionProfile, StructuralMaterial)
+
+MATERIALS = ['C16', 'C24', 'GL24h', 'GL28c', 'GL32h']
+SECTIONS = [(200, 200), (240, 240), (200, 300), (280, 280), (300, 400)] # NOTE: width and depth in mm
+
+def create_profile(width: float, depth: float) -> SectionProfile:
+    profile = SectionProfile(name=f'{int(width)}x{int(depth)}', area=width * depth,
+                             Iyy=width * depth ** 3 / 12, Izz=depth * width ** 3 / 12)
+    profile.shapeName = 'Rectangular'
+    profile.width = width
+    profile.depth = depth
+    return profile
+
+def create_analysis_results(rng: np.random.Generator, length: float, combinations: int, stations: int) -> Base:
+    """Column forces in kN and kNmm, compression dominated"""
+    analysis_results = Base()
+    analysis_results.resultsByLoadCombination = []
+    for combination in range(combinations):
+        result_case = Base()
+        result_case.name = f'ULS{combination + 1}'
+        results = Base()
+        results.resultCase = result_case
+        results.results1D = []
+        axial_force = -rng.uniform(50, 600)
+        for position in np.linspace(0, length, stations):
+            result = Base()
+            result.position = float(position)
+            result.forceX = float(axial_force + rng.uniform(-5, 5))
+            result.forceY, result.forceZ = (float(value) for value in rng.uniform(-10, 10, 2))
+            result.momentXX, result.momentYY, result.momentZZ = (float(value) for value in rng.uniform(-5e3, 5e3, 3))
+            results.results1D.append(result)
+        analysis_results.resultsByLoadCombination.append(results)
+    return analysis_results
+
+def create_element(rng: np.random.Generator, index: int, element_type: ElementType1D, combinations: int,
+                   stations: int) -> Element1D:
+    x, y = float(index % 100) * 6000, float(index // 100) * 6000
+    length = 3000.0 if element_type == ElementType1D.Column else 6000.0
+    end = Point(x=x, y=y, z=length) if element_type == ElementType1D.Column else Point(x=x + length, y=y, z=3000.0)
+    width, depth = SECTIONS[index % len(SECTIONS)]
+    element = Element1D(name=f'{element_type.name}{index}',
+                        baseLine=Line(start=Point(x=x, y=y, z=0.0 if element_type == ElementType1D.Column else 3000.0),
+                                      end=end),
+                        property=Property1D(name=f'{element_type.name} {width}x{depth}',
+                                            material=StructuralMaterial(name=MATERIALS[index % len(MATERIALS)]),
+                                            profile=create_profile(width, depth)),
+                        type=element_type)
+    element.baseLine.length = length
+    element.end1Node, element.end2Node = Node(basePoint=element.baseLine.start), Node(basePoint=element.baseLine.end)
+    element.end1Offset, element.end2Offset = Vector(x=0.0, y=0.0, z=0.0), Vector(x=0.0, y=0.0, z=0.0)
+    element.end1Releases, element.end2Releases = Restraint(code='FFFFFF'), Restraint(code='FFFFFF')
+    element.StiffnessModifiers = [1.0] * 8
+    element.AnalysisResults = create_analysis_results(rng, length, combinations, stations)
+    return element
+
+def create_model(columns: int = 1000,
+                 beams: int = 0,
+                 slabs: int = 0,
+                 combinations: int = 3,
+                 stations: int = 3,
+                 seed: int = 0) -> Base:
+    """Commit with '@Model' holding specs.settings.modelUnits (mm, kN) and elements. Slabs are plain Base objects as
+    they are only ever filtered out"""
+    rng = np.random.default_rng(seed)
+    elements = [create_element(rng, i, ElementType1D.Column, combinations, stations) for i in range(columns)]
+    elements += [create_element(rng, i, ElementType1D.Beam, combinations, stations) for i in range(beams)]
+    for i in range(slabs):
+        slab = Base()
+        slab.name = f'Slab{i}'
+        slab.type = 'ElementType2D.Slab'
+        elements.append(slab)
+    model = Model(specs=ModelInfo(settings=ModelSettings(modelUnits=ModelUnits(length='mm', force='kN'))),
+                  elements=elements)
+    commit = Base()
+    commit['@Model'] = model
+    return commit
+
+def assign_ids(commit: Base) -> None:
+    """Received objects carry an id, synthetic ones get a stable stand-in"""
+    for i, element in enumerate(commit['@Model'].elements):
+        element.id = f'{i:032x}'
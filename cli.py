@@ -0,0 +1,165 @@
+"""Offline runner: designs serialised commits from disk without a Speckle server or an AutomationContext.
+
+Inputs are Speckle SQLite transports (.db, as written by SQLiteTransport) or JSON files (as written by
+operations.serialize()). The results model of every input is written to a SQLite transport in the output directory,
+and a summary of all runs to summary.json. With --export-results, the design results are also written to a Parquet
+file per input (requires pyarrow, column design only). Files are designed concurrently by a process pool.
+
+Usage: python cli.py archive/*.db --output results --workers 4 --design-mode Column
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+from specklepy.api import operations
+from specklepy.transports.sqlite import SQLiteTransport
+from main import AvailableDesignModes, ForcesEnvelopes, LoadDurationClasses, LogLevels
+from src.design.cache import DesignCache
+from src.design.loader import code_loader
+from src.model.factory import model_loader
+from src.model.streaming import StreamingReceiver
+from src.project.export import write_parquet
+
+@dataclass
+class RunOptions:
+    output: str
+    design_mode: str = AvailableDesignModes.Columns.value
+    design_code: str = 'Eurocode'
+    load_duration_class: str = LoadDurationClasses.Permanent.value
+    log_level: str = LogLevels.Full.value
+    forces_envelope: str = ForcesEnvelopes.Off.value
+    source_application: str = 'ETABS' # NOTE: commits on disk do not carry their version's sourceApplication
+    object_id: Optional[str] = None # NOTE: root object of SQLite inputs, found by its '@Model' if not given
+    model_attribute: str = '@Model'
+    instancing: bool = False # NOTE: shared mesh definitions, see InstancedColumnVisualizer
+    export_results: bool = False # NOTE: design results as a Parquet file next to the results model
+
+@dataclass
+class RunSummary:
+    input: str
+    output: Optional[str] = None
+    table: Optional[str] = None # NOTE: Parquet file of the design results, with export_results
+    object_id: Optional[str] = None # NOTE: of the results model in the output transport
+    columns: int = 0
+    passed: int = 0
+    failed: int = 0
+    wall_time: float = 0.0
+    error: Optional[str] = None
+
+def find_root(path: str, model_attribute: str = '@Model') -> str:
+    """Id of the object of a SQLite transport that holds the model, the largest one if there are several"""
+    connection = sqlite3.connect(path)
+    try:
+        rows = connection.execute('SELECT hash, content FROM objects WHERE content LIKE ?', (f'%"{model_attribute}"%',))
+        roots = [(json.loads(content).get('totalChildrenCount', 0), object_id) for object_id, content in rows
+                 if model_attribute in json.loads(content)]
+    finally:
+        connection.close()
+    if not roots:
+        raise ValueError(f'No object with "{model_attribute}" found in {path}')
+    return max(roots)[1]
+
+def load_commit(path: str, options: RunOptions):
+    """Commit object of a SQLite transport (columns only, see StreamingReceiver) or of a JSON file"""
+    if path.endswith('.json'):
+        with open(path) as file:
+            return operations.deserialize(file.read())
+    base_path, file_name = os.path.split(os.path.abspath(path))
+    transport = SQLiteTransport(base_path=base_path, scope=os.path.splitext(file_name)[0])
+    return StreamingReceiver(options.object_id or find_root(path, options.model_attribute), local_transport=transport,
+                             model_attribute=options.model_attribute).receive()
+
+def output_scopes(paths: List[str]) -> List[str]:
+    """Scope of the results transport of every input, '{stem}-results'. Inputs sharing a stem (e.g. a/model.db and
+    b/model.db) also get their position in the inputs, so that no two runs write to the same transport"""
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    return [f'{stem}-{i}-results' if stems.count(stem) > 1 else f'{stem}-results' for i, stem in enumerate(stems)]
+
+def design_file(path: str, options: RunOptions, scope: Optional[str] = None) -> RunSummary:
+    """model_loader -> setup_model -> design of one file, the results are sent to a SQLite transport"""
+    summary = RunSummary(path)
+    start = time.perf_counter()
+    try:
+        design_code = code_loader(design_code=options.design_code,
+                                  design_parameters={'service_class': 1,
+                                                     'load_duration_class': options.load_duration_class,
+                                                     'log_level': options.log_level})
+        structural_model = model_loader(options.source_application, load_commit(path, options), design_code, None)
+        structural_model.setup_model()
+        structural_model.column_designer.cache = DesignCache()
+        if options.forces_envelope != ForcesEnvelopes.Off.value:
+            structural_model.forces_envelope = options.forces_envelope
+        structural_model.create_column_objects()
+        if options.design_mode == AvailableDesignModes.ColumnSizing.value:
+            structural_model.size_columns()
+        else:
+            structural_model.design_columns(generate_meshes=True, instancing=options.instancing)
+
+        scope = scope or output_scopes([path])[0]
+        transport = SQLiteTransport(base_path=os.path.abspath(options.output), scope=scope)
+        summary.object_id = operations.send(structural_model.columns_commit, [transport], use_default_cache=False)
+        transport.close()
+        summary.output = os.path.join(options.output, f'{scope}.db')
+        if options.export_results:
+            summary.table = write_parquet(os.path.join(options.output, f'{scope}.parquet'),
+                                          structural_model.columns, structural_model.design_groups)
+        summary.columns = len(structural_model.automate_results.elements_selected_conformity)
+        summary.passed = len(structural_model.automate_results.elements_selected_passed)
+        summary.failed = len(structural_model.automate_results.elements_selected_failed)
+    except Exception as e: # NOTE: one bad file does not stop the others
+        summary.error = f'{type(e).__name__}: {e}'
+    summary.wall_time = time.perf_counter() - start
+    return summary
+
+def design_files(paths: List[str], options: RunOptions, workers: int = 1) -> List[RunSummary]:
+    """Design of many files, in a process pool with more than one worker. Summaries are in the input order"""
+    os.makedirs(options.output, exist_ok=True)
+    scopes = output_scopes(paths)
+    if workers <= 1:
+        return [design_file(path, options, scope) for path, scope in zip(paths, scopes)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(design_file, paths, [options] * len(paths), scopes))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help='SQLite transports (.db) or serialised commits (.json)')
+    parser.add_argument('--output', default='results')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--design-mode', choices=[mode.value for mode in AvailableDesignModes],
+                        default=AvailableDesignModes.Columns.value)
+    parser.add_argument('--load-duration-class', choices=[duration.value for duration in LoadDurationClasses],
+                        default=LoadDurationClasses.Permanent.value)
+    parser.add_argument('--log-level', choices=[level.value for level in LogLevels], default=LogLevels.Full.value)
+    parser.add_argument('--forces-envelope', choices=[envelope.value for envelope in ForcesEnvelopes],
+                        default=ForcesEnvelopes.Off.value)
+    parser.add_argument('--source-application', default='ETABS')
+    parser.add_argument('--object-id', help='root object of the SQLite inputs, found by its model if not given')
+    parser.add_argument('--instancing', action='store_true', help='shared mesh definitions placed by transforms')
+    parser.add_argument('--export-results', action='store_true', help='design results as Parquet files (requires pyarrow)')
+    args = parser.parse_args(argv)
+    if args.export_results and args.design_mode != AvailableDesignModes.Columns.value:
+        parser.error(f'--export-results is only available with --design-mode {AvailableDesignModes.Columns.value!r}')
+
+    options = RunOptions(output=args.output, design_mode=args.design_mode,
+                         load_duration_class=args.load_duration_class, log_level=args.log_level,
+                         forces_envelope=args.forces_envelope, source_application=args.source_application,
+                         object_id=args.object_id, instancing=args.instancing,
+                         export_results=args.export_results)
+    start = time.perf_counter()
+    summaries = design_files(args.inputs, options, args.workers)
+    for summary in summaries:
+        status = summary.error or f'{summary.columns} columns, {summary.passed} passed, {summary.failed} failed'
+        print(f'{summary.input}: {status} ({summary.wall_time:.2f} s)')
+    print(f'{len(summaries)} files in {time.perf_counter() - start:.2f} s')
+    with open(os.path.join(args.output, 'summary.json'), 'w') as file:
+        json.dump([asdict(summary) for summary in summaries], file, indent=2)
+    return 1 if any(summary.error for summary in summaries) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,27 +1,40 @@
 """Helper module for a simple speckle object tree flattening."""
 
 from collections.abc import Iterable
+from typing import Optional
 
 from specklepy.objects import Base
 
+_END = object() # NOTE: end of the children, None can be an element itself
 
-def flatten_base(base: Base) -> Iterable[Base]:
+def flatten_base(base: Base, max_depth: Optional[int] = None) -> Iterable[Base]:
     """Flatten a base object into an iterable of bases.
     
-    This function recursively traverses the `elements` or `@elements` attribute of the 
-    base object, yielding each nested base object.
+    This function traverses the `elements` or `@elements` attribute of the 
+    base object, yielding each nested base object. The traversal is iterative,
+    deep trees do not hit the recursion limit, and lazy, children are only
+    visited as the iterable is consumed.
 
     Args:
         base (Base): The base object to flatten.
+        max_depth (int, optional): Bases nested deeper than this are not visited.
 
     Yields:
-        Base: Each nested base object in the hierarchy.
+        Base: Each nested base object in the hierarchy, children before their parent.
     """
+    stack = [(base, iter(get_elements(base)), 0)]
+    while stack:
+        parent, children, depth = stack[-1]
+        child = next(children, _END)
+        if child is _END:
+            stack.pop()
+            yield parent # NOTE: same (post-)order as the recursive implementation
+        elif max_depth is None or depth < max_depth:
+            stack.append((child, iter(get_elements(child)), depth + 1))
+
+
+def get_elements(base: Base) -> Iterable[Base]:
+    """The `elements` or `@elements` of a base object, empty if it has none."""
     # Attempt to get the elements attribute, fallback to @elements if necessary
     elements = getattr(base, "elements", getattr(base, "@elements", None))
-    
-    if elements is not None:
-        for element in elements:
-            yield from flatten_base(element)
-    
-    yield base
+    return elements if elements is not None else ()
@@ -1,19 +1,28 @@
 from enum import Enum
+from typing import Optional
 from pydantic import Field
 from speckle_automate import (
     AutomateBase,
     AutomationContext,
     execute_automate_function, ObjectResultLevel,
 )
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.server import ServerTransport
 from src.model.factory import model_loader
+from src.model.incremental import DesignHistory
+from src.model.streaming import StreamingReceiver
+from src.design.cache import DEFAULT_CACHE_PATH, DesignCache
 from src.design.loader import code_loader
 from src.project.project import Project
+from src.project.reporting import Reporter
+from src.utils.instrumentation import Instrumentation
 
 class AvailableDesignModes(Enum):
     """
     AvailableDesignModes: What elements can be designed?
     """
     Columns = 'Column'
+    ColumnSizing = 'Column sizing'
 
 class LoadDurationClasses(Enum):
     """
@@ -25,6 +34,22 @@ class LoadDurationClasses(Enum):
     ShortTerm = 'Short term'
     Instantaneous = 'Instantaneous'
 
+class LogLevels(Enum):
+    """
+    LogLevels: How much of the calculation is written to the results model
+    """
+    Full = 'full'
+    Summary = 'summary'
+    Off = 'none'
+
+class ForcesEnvelopes(Enum):
+    """
+    ForcesEnvelopes: Reduction of the internal forces while parsing
+    """
+    Off = 'none'
+    PerCombination = 'combination'
+    PerElement = 'element'
+
 class AvailableDesignCodes(Enum):
     """
     AvailableDesignCodes: Abstractions of DesignCode
@@ -88,10 +113,80 @@ class FunctionInputs(AutomateBase):
         },
     )
 
+    chosen_log_level: LogLevels = Field(
+        default=LogLevels.Full,
+        title='Calculation Log',
+        description='Every calculation step, only the governing values, or no calculation log is written to the results model. Less logging is faster on large models.',
+        json_schema_extra={
+            "oneOf": create_one_of_enum(LogLevels)
+        },
+    )
+
+    chosen_forces_envelope: ForcesEnvelopes = Field(
+        default=ForcesEnvelopes.Off,
+        title='Internal Forces Envelope',
+        description='Reduces the internal forces of each element to the extreme values per load combination or over all load combinations while parsing. This saves memory and time on large analysis results, the design is the same when the extremes occur at the same station and conservative otherwise.',
+        json_schema_extra={
+            "oneOf": create_one_of_enum(ForcesEnvelopes)
+        },
+    )
+
+    incremental_design: bool = Field(
+        default=False,
+        title='Incremental Design',
+        description='Only columns that changed since the last results are parsed and designed again. The results of unchanged columns are taken from the results model.',
+    )
+
+    persistent_design_cache: bool = Field(
+        default=False,
+        title='Persistent Design Cache',
+        description='Columns with identical design inputs are designed once. With this option the results are also kept on disk, in a cache directory of the user, and reused by later runs on the same runner.',
+    )
+
+    include_forces: bool = Field(
+        default=False,
+        title='Include Internal Forces',
+        description='Adds the internal forces of every combination and station to the column results. By default the results reference the analysis elements and carry the governing values only.',
+    )
+
+    report_not_selected: bool = Field(
+        default=False,
+        title='Report Elements Not Selected',
+        description='Lists the elements that are not targeted by the Design Mode (e.g. every beam and slab for a column design) in the run results.',
+    )
+
+    store_element_lists: bool = Field(
+        default=False,
+        title='Store Element Lists',
+        description='The run results show at most 200 elements per category. With this option the full lists are stored as a JSON file result of the run.',
+    )
+
+    instrumentation: bool = Field(
+        default=False,
+        title='Instrumentation',
+        description='Measures the time and memory of every stage of the run. The timings are added to the status message and the full report is printed to the run log as JSON.',
+    )
+
+    instanced_meshes: bool = Field(
+        default=False,
+        title='Instanced Meshes',
+        description='Column meshes are shared definitions placed by a transform per column, instead of a pair of meshes per column. This makes the results model smaller for models with many equal sections and lengths.',
+    )
+
+    pipelined_upload: bool = Field(
+        default=True,
+        title='Pipelined Upload',
+        description='Column results are uploaded in chunks while the remaining columns are prepared, instead of all at once at the end of the run.',
+    )
+
 def automate_function(
     automate_context: AutomationContext,
     function_inputs: FunctionInputs,
+    transport: Optional[AbstractTransport] = None,
+    instrumentation: Optional[Instrumentation] = None,
 ) -> None:
+    """The transport replaces the server transports of the project and the instrumentation the one set up from the
+    function inputs, both are used to run the function offline (see benchmarks/bench_pipeline.py)"""
 
     version_id = automate_context.automation_run_data.triggers[0].payload.version_id
     commit = automate_context.speckle_client.commit.get(
@@ -104,66 +199,73 @@ def automate_function(
     design_code = code_loader(design_code=function_inputs.chosen_design_code.value,
                               design_parameters=
                               {'service_class': 1,
-                               'load_duration_class': function_inputs.chosen_load_duration_class.value}
+                               'load_duration_class': function_inputs.chosen_load_duration_class.value,
+                               'log_level': function_inputs.chosen_log_level.value}
                               )
 
-    structural_model = model_loader(source_application, automate_context.receive_version(), design_code, automate_context)
-    structural_model.setup_model()
-
-    if function_inputs.chosen_design_mode.value == 'Column':
-        structural_model.create_column_objects()
-        structural_model.design_columns(generate_meshes=True)
-    if structural_model.automate_results.elements_not_selected:
-        automate_context.attach_info_to_objects(
-            category=f"Elements not defined as {str(function_inputs.chosen_design_mode.value).lower()}",
-            object_ids=structural_model.automate_results.elements_not_selected,
-            message="The Design Mode targets a specific structural element. These elements were filtered out according to their type. Check element definition and assignment in the source application."
-        )
-    if structural_model.automate_results.elements_selected_material_nonconformity:
-        automate_context.attach_info_to_objects(
-            category=f"Failing to parse material as timber",
-            object_ids=structural_model.automate_results.elements_selected_material_nonconformity,
-            message="These elements were found according to the given Design Mode, however, no match was found in the selected region for the defined material. This indicates either that the element(s) are not timber elements, or that the name of the material needs to be updated to match the database."
-        )
-    if structural_model.automate_results.elements_selected_length_nonconformity:
-        automate_context.attach_info_to_objects(
-            category=f"Failing to parse length of element",
-            object_ids=structural_model.automate_results.elements_selected_length_nonconformity,
-            message="The length of these elements could not be parsed and converted to SI units. Check validity of object.baseLine.length."
-        )
-    if structural_model.automate_results.elements_selected_cross_section_nonconformity:
-        automate_context.attach_info_to_objects(
-            category=f"Failing to parse element cross-section",
-            object_ids=structural_model.automate_results.elements_selected_cross_section_nonconformity,
-            message="The defined cross-section of the element could not be parsed. Check validity of object.property.profile. This is currently restricted to 'Rectangular' cross-sections."
-        )
-    if structural_model.automate_results.elements_selected_forces_nonconformity:
-        automate_context.attach_info_to_objects(
-            category=f"Failing to parse internal forces",
-            object_ids=structural_model.automate_results.elements_selected_forces_nonconformity,
-            message="The forces could not be parsed. Check that the analysis results have been sent with the model."
-        )
+    instrumentation = instrumentation or Instrumentation(enabled=function_inputs.instrumentation)
+
+    # NOTE: instead of automate_context.receive_version(), only the columns are deserialised (see StreamingReceiver)
+    server_transport = transport or ServerTransport(automate_context.automation_run_data.project_id,
+                                                    automate_context.speckle_client)
+    receiver = StreamingReceiver(commit.referencedObject, server_transport)
+    try:
+        with instrumentation.span('receive_version'):
+            received_object = receiver.receive()
+
+        structural_model = model_loader(source_application, received_object, design_code, automate_context)
+        structural_model.instrumentation = instrumentation
+        with instrumentation.span('setup_model'):
+            structural_model.setup_model()
+        design_cache = DesignCache(path=DEFAULT_CACHE_PATH if function_inputs.persistent_design_cache else None)
+        structural_model.column_designer.cache = design_cache
+        if function_inputs.chosen_forces_envelope != ForcesEnvelopes.Off:
+            structural_model.forces_envelope = function_inputs.chosen_forces_envelope.value
+
+        speckle_results_model = Project(automate_context.speckle_client,
+                                        automate_context.automation_run_data.project_id,
+                                        function_inputs.results_model,
+                                        transport)
+        speckle_results_model.get_results_model()
+        results_sender = speckle_results_model.create_sender() if function_inputs.pipelined_upload else None
+        structural_model.results_sender = results_sender
+        structural_model.include_forces = function_inputs.include_forces
+        if function_inputs.incremental_design:
+            try:
+                with instrumentation.span('receive_latest_results'):
+                    structural_model.design_history = DesignHistory.from_commit(speckle_results_model.receive_latest_results())
+            except Exception as e: # NOTE: everything is designed without a history
+                print(f'Error receiving previous results: {e}')
+
+        if function_inputs.chosen_design_mode.value == 'Column':
+            structural_model.create_column_objects()
+            structural_model.design_columns(generate_meshes=True, instancing=function_inputs.instanced_meshes)
+        elif function_inputs.chosen_design_mode.value == 'Column sizing':
+            structural_model.create_column_objects()
+            structural_model.size_columns()
+    finally:
+        receiver.close() # NOTE: the local copy of the commit is removed, also when parsing or design fails
+    with instrumentation.span('report'):
+        reporter = Reporter(automate_context, include_not_selected=function_inputs.report_not_selected)
+        reporter.report(structural_model.automate_results,
+                        design_mode=str(function_inputs.chosen_design_mode.value).lower(), code=design_code.code)
+        if function_inputs.store_element_lists:
+            try:
+                reporter.store_full_lists(structural_model.automate_results)
+            except Exception as e:
+                print(f'Error storing the element lists: {e}')
+
+    with instrumentation.span('send_results_model'):
+        speckle_results_model.send_results_model(structural_model.columns_commit, results_sender)
+
+    # NOTE: the run is marked last so that the status message can carry the timings of every stage
+    if function_inputs.instrumentation:
+        print(instrumentation.to_json())
     if not structural_model.automate_results.elements_selected_conformity:
         automate_context.mark_run_failed(
             status_message=f"Failing to find and parse elements. No elements to design")
     if structural_model.automate_results.elements_selected_conformity:
-        automate_context.mark_run_success(f"Design of {function_inputs.chosen_design_mode.value} conducted. See results model for more information.")
-        if structural_model.automate_results.elements_selected_passed:
-            automate_context.attach_info_to_objects(
-                category=f"Elements passing design check according to {design_code.code}",
-                object_ids=structural_model.automate_results.elements_selected_passed,
-                message="The elements passed the design check with a utilisation < 1.0. See results model for more information.")
-        if structural_model.automate_results.elements_selected_failed:
-            automate_context.attach_warning_to_objects(
-                category=f"Elements not passing design check according to {design_code.code}",
-                object_ids=structural_model.automate_results.elements_selected_failed,
-                message="The elements did not pass the design check with a utilisation > 1.0. See results model for more information.")
-
-    speckle_results_model = Project(automate_context.speckle_client,
-                                    automate_context.automation_run_data.project_id,
-                                    function_inputs.results_model)
-    speckle_results_model.get_results_model()
-    speckle_results_model.send_results_model(structural_model.columns_commit)
+        automate_context.mark_run_success(f"Design of {function_inputs.chosen_design_mode.value} conducted. See results model for more information. {design_cache.statistics.summary()} {instrumentation.summary()}".strip())
 
 if __name__ == "__main__":
     execute_automate_function(automate_function, FunctionInputs)
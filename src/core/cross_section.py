@@ -1,35 +1,64 @@
 import math
 from abc import ABC
+from typing import Callable, Dict, Hashable, Union
+
+SQRT_12 = math.sqrt(12)
 
 class CrossSection(ABC):
-    """Cross-section base class"""
+    """Cross-section base class. Instances are shared between columns (see SectionCache) and are immutable"""
+    __slots__ = ('area', 'moment_of_inertia_about_y', 'moment_of_inertia_about_z')
+
     def __init__(self,
                  area: float,
                  moment_of_inertia_about_y: float,
                  moment_of_inertia_about_z: float) -> None:
-        self.area = area
-        self.moment_of_inertia_about_y = moment_of_inertia_about_y
-        self.moment_of_inertia_about_z = moment_of_inertia_about_z
+        object.__setattr__(self, 'area', area)
+        object.__setattr__(self, 'moment_of_inertia_about_y', moment_of_inertia_about_y)
+        object.__setattr__(self, 'moment_of_inertia_about_z', moment_of_inertia_about_z)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
 
 class RectangularSection(CrossSection):
     """A rectangular (or square) cross-section"""
+    __slots__ = ('width', 'depth', 'radius_of_gyration_y', 'radius_of_gyration_z', 'section_modulus_y', 'section_modulus_z')
+    shape = 'Rectangular'
+
     def __init__(self,
                  width: float,
                  depth: float,
                  area: float,
                  moment_of_inertia_about_y: float,
                  moment_of_inertia_about_z: float) -> None:
-        self.shape = 'Rectangular'
-        self.width = width
-        self.depth = depth
+        object.__setattr__(self, 'width', width)
+        object.__setattr__(self, 'depth', depth)
+        object.__setattr__(self, 'radius_of_gyration_y', depth / SQRT_12) # NOTE: Radius of gyration along y-axis
+        object.__setattr__(self, 'radius_of_gyration_z', width / SQRT_12) # NOTE: Radius of gyration along z-axis
+        object.__setattr__(self, 'section_modulus_y', moment_of_inertia_about_y / (depth / 2)) # NOTE: Elastic section modulus about y-axis
+        object.__setattr__(self, 'section_modulus_z', moment_of_inertia_about_z / (width / 2)) # NOTE: Elastic section modulus about z-axis
         super().__init__(area, moment_of_inertia_about_y, moment_of_inertia_about_z)
 
-    @property
-    def radius_of_gyration_y(self) -> float:
-        """Radius of gyration along y-axis"""
-        return self.depth / math.sqrt(12)
+    def __reduce__(self):
+        return RectangularSection, (self.width, self.depth, self.area, self.moment_of_inertia_about_y,
+                                    self.moment_of_inertia_about_z)
+
+class SectionCache:
+    """Interns cross-sections so that identical profiles resolve to one shared instance. Profiles that could not be
+    parsed are cached as well, parsing then costs O(distinct sections) instead of O(columns)"""
+    def __init__(self) -> None:
+        self._sections: Dict[Hashable, Union[CrossSection, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sections)
 
-    @property
-    def radius_of_gyration_z(self) -> float:
-        """Radius of gyration along z-axis"""
-        return self.width / math.sqrt(12)
+    def get(self, key: Hashable, create: Callable[[], CrossSection]) -> CrossSection:
+        section = self._sections.get(key)
+        if section is None:
+            try:
+                section = create()
+            except ValueError as e:
+                section = str(e)
+            section = self._sections.setdefault(key, section)
+        if isinstance(section, str):
+            raise ValueError(section)
+        return section
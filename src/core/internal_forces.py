@@ -1,6 +1,245 @@
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+COMPONENTS = ('axial_force', 'shear_y', 'shear_z', 'bending_y', 'bending_z', 'torsion')
+ENVELOPES = ('combination', 'element') # NOTE: reduction of the rows at parse time, see ForcesStoreBuilder
+
+@dataclass
+class Envelope:
+    """Minimum and maximum of a force component, per element or per element and load combination"""
+    element_index: np.ndarray
+    combination_index: Optional[np.ndarray]
+    minimum: np.ndarray
+    maximum: np.ndarray
+
+class ForcesStore:
+    """Model-wide columnar store of the internal forces from the analysis results. Every row is one station of one load
+    combination of one element, rows of an element are contiguous. Forces are in SI units (N, Nm)"""
+    def __init__(self,
+                 element_ids: List[str],
+                 combinations: List[str],
+                 offsets: np.ndarray,
+                 combination_index: np.ndarray,
+                 station: np.ndarray,
+                 components: Dict[str, np.ndarray]) -> None:
+        self.element_ids = element_ids
+        self.element_positions = {element_id: i for i, element_id in enumerate(element_ids)}
+        self.combinations = combinations
+        self.offsets = offsets # NOTE: rows of element i are offsets[i]:offsets[i + 1]
+        self.element_index = np.repeat(np.arange(len(element_ids)), np.diff(offsets))
+        self.combination_index = combination_index
+        self.station = station
+        self.components = components
+        self._envelopes: Dict[tuple, Envelope] = {}
+
+    @classmethod
+    def from_records(cls, data: List[dict], element_id: str = None) -> 'ForcesStore':
+        """Store of a single element from a list of row dicts (result_case, station and force components)"""
+        builder = ForcesStoreBuilder()
+        builder.start_element(element_id)
+        for row in data:
+            builder.append(row.get('result_case'), row.get('station', np.nan),
+                           *[row.get(component, np.nan) for component in COMPONENTS])
+        builder.end_element()
+        return builder.build()
+
+    @classmethod
+    def concatenate(cls, stores: List['ForcesStore']) -> 'ForcesStore':
+        """Join stores (e.g. parsed in chunks) in the given order, combination indices are remapped onto one list"""
+        builder = ForcesStoreBuilder()
+        element_ids, offsets, combination_index = [], [np.zeros(1, dtype=np.int64)], []
+        for store in stores:
+            remap = np.array([builder.combination(name) for name in store.combinations], dtype=np.int64)
+            element_ids.extend(store.element_ids)
+            offsets.append(store.offsets[1:] + offsets[-1][-1])
+            combination_index.append(remap[store.combination_index] if len(remap) else store.combination_index)
+        return cls(element_ids,
+                   builder.combinations,
+                   np.concatenate(offsets),
+                   np.concatenate(combination_index) if combination_index else np.array([], dtype=np.int64),
+                   np.concatenate([store.station for store in stores]) if stores else np.array([]),
+                   {component: np.concatenate([store.components[component] for store in stores]) if stores else np.array([])
+                    for component in COMPONENTS})
+
+    def __len__(self) -> int:
+        return len(self.station)
+
+    def rows(self, element_index: int) -> slice:
+        return slice(int(self.offsets[element_index]), int(self.offsets[element_index + 1]))
+
+    def envelope(self, component: str, per_combination: bool = False) -> Envelope:
+        """Grouped min/max reduction of a component over all elements (or elements and combinations). NaN is ignored"""
+        key = (component, per_combination)
+        if key not in self._envelopes:
+            values = self.components[component]
+            if per_combination:
+                group_keys = self.element_index * max(len(self.combinations), 1) + self.combination_index
+                if len(group_keys) > 1 and np.any(group_keys[1:] < group_keys[:-1]):
+                    order = np.argsort(group_keys, kind='stable')
+                    group_keys, values = group_keys[order], values[order]
+                starts = np.flatnonzero(np.r_[True, group_keys[1:] != group_keys[:-1]]) if len(group_keys) else np.array([], dtype=int)
+                minimum = np.fmin.reduceat(values, starts) if len(starts) else np.array([])
+                maximum = np.fmax.reduceat(values, starts) if len(starts) else np.array([])
+                group_keys = group_keys[starts]
+                self._envelopes[key] = Envelope(group_keys // max(len(self.combinations), 1),
+                                                group_keys % max(len(self.combinations), 1),
+                                                minimum, maximum)
+            else:
+                minimum = np.full(len(self.element_ids), np.nan)
+                maximum = np.full(len(self.element_ids), np.nan)
+                counts = np.diff(self.offsets)
+                non_empty = counts > 0
+                if non_empty.any(): # NOTE: reduceat is not defined for empty groups, these remain NaN like pandas
+                    starts = self.offsets[:-1][non_empty]
+                    minimum[non_empty] = np.fmin.reduceat(values, starts)
+                    maximum[non_empty] = np.fmax.reduceat(values, starts)
+                self._envelopes[key] = Envelope(np.arange(len(self.element_ids)), None, minimum, maximum)
+        return self._envelopes[key]
+
+class ForcesStoreBuilder:
+    """Collects the rows of all elements in one sweep before they are frozen into a ForcesStore.
+
+    With an envelope, the rows of an element are not kept. Every component is reduced as it is appended to the value of
+    largest magnitude (with its sign), per load combination ('combination') or over all of them ('element', as a single
+    'Envelope' combination). Each group becomes one row without a station. The design check is then evaluated on the
+    envelope, which is the same as on all rows whenever the extremes of the components occur at the same station, and
+    conservative otherwise"""
+    def __init__(self, envelope: Optional[str] = None) -> None:
+        if envelope is not None and envelope not in ENVELOPES:
+            raise ValueError(f'Envelope {envelope} not recognised, use one of {ENVELOPES}')
+        self.envelope = envelope
+        self.element_ids: List[str] = []
+        self.offsets = array('q', [0])
+        self.combinations: List[str] = []
+        self._combination_positions: Dict[str, int] = {}
+        self.combination_index = array('q')
+        self.station = array('d')
+        self.components = {component: array('d') for component in COMPONENTS}
+
+    def start_element(self, element_id: str) -> None:
+        self.element_ids.append(element_id)
+
+    def end_element(self) -> None:
+        if self.envelope is not None:
+            self.reduce_element()
+        self.offsets.append(len(self.station))
+
+    def discard_element(self) -> None:
+        """Removes the rows of the current element, e.g. when its results could not be parsed"""
+        start = self.offsets[-1]
+        del self.combination_index[start:]
+        del self.station[start:]
+        for values in self.components.values():
+            del values[start:]
+        self.element_ids.pop()
+
+    def group(self, result_case: str) -> str:
+        """Name under which the rows of a load combination are kept"""
+        return 'Envelope' if self.envelope == 'element' else result_case
+
+    def combination(self, name: str) -> int:
+        position = self._combination_positions.get(name)
+        if position is None:
+            position = self._combination_positions[name] = len(self.combinations)
+            self.combinations.append(name)
+        return position
+
+    def append(self, result_case: str, station: float, axial_force: float, shear_y: float, shear_z: float,
+               bending_y: float, bending_z: float, torsion: float) -> None:
+        self.combination_index.append(self.combination(self.group(result_case)))
+        self.station.append(station)
+        self.components['axial_force'].append(axial_force)
+        self.components['shear_y'].append(shear_y)
+        self.components['shear_z'].append(shear_z)
+        self.components['bending_y'].append(bending_y)
+        self.components['bending_z'].append(bending_z)
+        self.components['torsion'].append(torsion)
+
+    def extend(self, result_case: str, rows: List[tuple]) -> None:
+        """Appends the rows (station and components) of one load combination"""
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        self.combination_index.extend([self.combination(self.group(result_case))] * len(rows))
+        self.station.extend(columns[0])
+        for component, values in zip(COMPONENTS, columns[1:]):
+            self.components[component].extend(values)
+
+    def reduce_element(self) -> None:
+        """Replaces the rows of the current element by one row per group, holding the signed values of largest magnitude"""
+        start = self.offsets[-1]
+        if len(self.station) == start:
+            return
+        groups = np.frombuffer(self.combination_index, dtype=np.int64)[start:]
+        order = np.argsort(groups, kind='stable')
+        groups = groups[order]
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        combinations = groups[starts]
+        extremes = {}
+        for component, values in self.components.items():
+            values = np.frombuffer(values, dtype=np.float64)[start:][order]
+            magnitude = np.where(np.isnan(values), -1.0, np.abs(values)) # NOTE: NaN only if a group has no value
+            extremes[component] = values[np.lexsort((-magnitude, groups))[starts]]
+        del groups, order, values # NOTE: views onto the arrays must be released before they are resized
+        del self.combination_index[start:]
+        del self.station[start:]
+        for values in self.components.values():
+            del values[start:]
+        self.combination_index.frombytes(combinations.astype(np.int64).tobytes())
+        self.station.frombytes(np.full(len(combinations), np.nan).tobytes())
+        for component in COMPONENTS:
+            self.components[component].frombytes(extremes[component].tobytes())
+
+    def build(self, factors: Dict[str, float] = None) -> ForcesStore:
+        """Freeze into a ForcesStore, applying unit conversion factors as one multiply per component"""
+        factors = factors or {}
+        components = {}
+        for component, values in self.components.items():
+            components[component] = np.frombuffer(values, dtype=np.float64) * factors.get(component, 1.0)
+        return ForcesStore(self.element_ids,
+                           self.combinations,
+                           np.frombuffer(self.offsets, dtype=np.int64).copy(),
+                           np.frombuffer(self.combination_index, dtype=np.int64).copy(),
+                           np.frombuffer(self.station, dtype=np.float64).copy(),
+                           components)
+
 class InternalForces:
-    """Dataframe for internal forces from the analysis results. This comes from the parse_internal_forces()"""
-    def __init__(self, data):
-        self.dataframe = pd.DataFrame(data)
+    """Internal forces of one element from the analysis results. This comes from the parse_internal_forces() and is a
+    view onto the rows of the element in the model-wide ForcesStore"""
+    def __init__(self, data: List[dict] = None, store: ForcesStore = None, element_index: int = 0):
+        if store is None:
+            store = ForcesStore.from_records(data or [])
+            element_index = 0
+        self.store = store
+        self.element_index = element_index
+
+    def __len__(self) -> int:
+        rows = self.store.rows(self.element_index)
+        return rows.stop - rows.start
+
+    def component(self, name: str) -> np.ndarray:
+        return self.store.components[name][self.store.rows(self.element_index)]
+
+    def case(self, row: int) -> Tuple[str, float]:
+        """Load combination and station of one row of the element"""
+        row = self.store.rows(self.element_index).start + row
+        return self.store.combinations[self.store.combination_index[row]], float(self.store.station[row])
+
+    def minimum(self, name: str) -> float:
+        return float(self.store.envelope(name).minimum[self.element_index])
+
+    def maximum(self, name: str) -> float:
+        return float(self.store.envelope(name).maximum[self.element_index])
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """Row-wise view of the forces, built on demand"""
+        rows = self.store.rows(self.element_index)
+        data = {'result_case': [self.store.combinations[i] for i in self.store.combination_index[rows]],
+                'station': self.store.station[rows]}
+        for name, values in self.store.components.items():
+            data[name] = values[rows]
+        return pd.DataFrame(data)
@@ -1,4 +1,5 @@
 from enum import Enum, EnumMeta
+from typing import Dict, Tuple, Type, Union
 from dataclasses import dataclass
 from abc import ABC, ABCMeta
 from ..utils.units import Convert
@@ -11,28 +12,8 @@ class MaterialFactory:
 
     @staticmethod
     def get_material(region: str, material_name: str) -> 'TimberMaterial':
-        """Returns the TimberMaterial object based on the region and material_name."""
-        # Dictionary mapping region names to their corresponding strength class enums
-        region_classes = {
-            "Britain": BritishStandards,
-            # Add other regions here as needed
-        }
-
-        # Get the strength class enum for the region
-        strength_class_enum = region_classes.get(region)
-
-        if not strength_class_enum:
-            raise ValueError(f"Unsupported region: {region}")
-
-        # Get the material properties based on the material_name
-        try:
-            strength_class = strength_class_enum[material_name]
-        except KeyError as exc:
-            # Re-raise the KeyError with a ValueError using `from` to preserve context
-            raise ValueError(f"Material '{material_name}' not found in region '{region}'") from exc
-
-        # Return a TimberMaterial object
-        return TimberMaterial(strength_class)
+        """Returns the shared TimberMaterial object based on the region and material_name."""
+        return MATERIAL_REGISTRY.get(region, material_name)
 
 @dataclass(frozen=True)
 class StrengthProperties:
@@ -136,26 +117,59 @@ class BritishStandards(StrengthClass, Enum, metaclass = ABCEnumMeta):
     )
 
 class TimberMaterial:
-    """Timber material object"""
-    def __init__(self, strength_class: StrengthClass):
-        self.strength_class = strength_class
-
-    @property
-    def description(self) -> str:
-        """A basic description of the material (Solid / Glulam)"""
-        return self.strength_class.properties.description
+    """Timber material object. Instances are shared between all columns (see MaterialRegistry) and are immutable, the
+    properties of the strength class are resolved once so that access is a plain attribute read"""
+    __slots__ = ('strength_class', 'name', 'description', 'strength', 'stiffness', 'density')
 
-    @property
-    def strength(self) -> StrengthProperties:
-        """Strength properties for bending, tension, compression and shear"""
-        return self.strength_class.properties.strength
-
-    @property
-    def stiffness(self) -> StiffnessProperties:
-        """Young's and shear modulus"""
-        return self.strength_class.properties.stiffness
+    def __init__(self, strength_class: StrengthClass):
+        properties = strength_class.properties
+        object.__setattr__(self, 'strength_class', strength_class)
+        object.__setattr__(self, 'name', strength_class.name)
+        object.__setattr__(self, 'description', properties.description) # NOTE: A basic description (Solid / Glulam)
+        object.__setattr__(self, 'strength', properties.strength)
+        object.__setattr__(self, 'stiffness', properties.stiffness)
+        object.__setattr__(self, 'density', properties.density)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return TimberMaterial, (self.strength_class,)
+
+class MaterialRegistry:
+    """Index of region -> material name -> TimberMaterial. Names are matched on a normalised alias (case, spaces,
+    hyphens and underscores are ignored, e.g. 'GL 28c' for 'GL28c'). Resolved and failed lookups are cached"""
+
+    def __init__(self, regions: Dict[str, Type[StrengthClass]]):
+        self.index: Dict[str, Dict[str, TimberMaterial]] = {
+            region: {self.normalise(strength_class.name): TimberMaterial(strength_class) for strength_class in strength_classes}
+            for region, strength_classes in regions.items()}
+        self._lookups: Dict[Tuple[str, str], Union[TimberMaterial, str]] = {}
 
-    @property
-    def density(self) -> DensityProperties:
-        """"Density properties"""
-        return self.strength_class.properties.density
+    @staticmethod
+    def normalise(material_name: str) -> str:
+        return ''.join(character for character in str(material_name) if character not in ' -_').lower()
+
+    def resolve(self, region: str, material_name: str) -> Union[TimberMaterial, str]:
+        """TimberMaterial, or the error message if it cannot be resolved"""
+        materials = self.index.get(region)
+        if materials is None:
+            return f"Unsupported region: {region}"
+        material = materials.get(self.normalise(material_name))
+        if material is None:
+            return f"Material '{material_name}' not found in region '{region}'"
+        return material
+
+    def get(self, region: str, material_name: str) -> TimberMaterial:
+        key = (region, material_name)
+        result = self._lookups.get(key)
+        if result is None:
+            result = self._lookups[key] = self.resolve(region, material_name)
+        if isinstance(result, str):
+            raise ValueError(result)
+        return result
+
+MATERIAL_REGISTRY = MaterialRegistry({
+    "Britain": BritishStandards,
+    # Add other regions here as needed
+})
@@ -14,6 +14,7 @@ class StructuralElement1D(ABC):
     is_designable: bool = False
     _design: Optional['DesignResults'] = None
     display_meshes: 'DisplayMeshes' = None
+    sizing_results: Optional['SizingResult'] = None # NOTE: set in the section sizing design mode
 
     def set_design_results(self, results: 'DesignResults') -> None:
         if self.is_designable:
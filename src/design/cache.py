@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict, defaultdict
+from copy import copy
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.design.designer import DesignResults
+from src.design.logger import CalculationLog, CompactLog, LogSchema, copy_log
+
+CACHE_VERSION = 2 # NOTE: bump when a change to the design codes invalidates stored results
+# NOTE: in a directory of the user only, stored results are read back by later runs
+DEFAULT_CACHE_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                                  'timber-design', 'design-cache.sqlite')
+
+@dataclass
+class CacheStatistics:
+    hits: int = 0
+    misses: int = 0
+    time_saved: float = 0.0 # NOTE: seconds, the design time of the results that were served from the cache
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+
+    def summary(self) -> str:
+        return f'Design cache: {self.hits} of {self.hits + self.misses} columns ({self.hit_rate:.0%}), {self.time_saved:.2f} s saved.'
+
+class DesignCache:
+    """Content-addressed cache of design results, keyed by the design inputs of a column (see DesignCode.design_inputs).
+    Results are kept in memory with LRU eviction and, given a path, in an sqlite database that outlives the run. On disk
+    they are plain JSON (see dump_results()), never pickles, so that a planted row cannot run code"""
+    def __init__(self, maxsize: int = 4096, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.statistics = CacheStatistics()
+        self._results: OrderedDict[str, Tuple['DesignResults', float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._schemas: Dict[str, LogSchema] = {} # NOTE: one LogSchema per stored schema, shared by the loaded logs
+        self._connection = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, duration REAL, value TEXT)')
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def key(design_code: 'DesignCode', column: 'Column') -> str:
+        inputs = [CACHE_VERSION, design_code.code, design_code.design_parameters, design_code.design_inputs(column)]
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional['DesignResults']:
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                self._results.move_to_end(key)
+            elif self._connection is not None:
+                row = self._connection.execute('SELECT value, duration FROM results WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    entry = self._remember(key, self.load_results(row[0]), row[1])
+            if entry is None:
+                self.statistics.misses += 1
+                return None
+            self.statistics.hits += 1
+            self.statistics.time_saved += entry[1]
+        results = copy(entry[0])
+        results.calculation_log = copy_log(results.calculation_log) # NOTE: cached results never share a log with a column
+        return results
+
+    def put(self, key: str, results: 'DesignResults', duration: float) -> None:
+        self.put_many([(key, results, duration)])
+
+    def put_many(self, entries: List[Tuple[str, 'DesignResults', float]]) -> None:
+        """Store (key, results, design time) entries, written to disk in one transaction"""
+        with self._lock:
+            for key, results, duration in entries:
+                self._remember(key, results, duration)
+            if self._connection is not None:
+                self._connection.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                                             [(key, duration, self.dump_results(results)) for key, results, duration in entries])
+                self._connection.commit()
+
+    @staticmethod
+    def dump_results(results: DesignResults) -> str:
+        """JSON of design results. A CompactLog is stored as its schema and row of values"""
+        calculation_log = results.calculation_log
+        if isinstance(calculation_log, CompactLog):
+            log = {'schema': [[section, asdict(template)] for section, template in calculation_log.schema.entries],
+                   'values': calculation_log.values.tolist(),
+                   'material': calculation_log.material}
+        else:
+            log = {'sections': [[section, [asdict(step) for step in steps]] for section, steps in calculation_log.items()]}
+        return json.dumps({'calculation_log': log,
+                           'utilisation': results.utilisation,
+                           'governing_combination': results.governing_combination,
+                           'governing_station': results.governing_station})
+
+    def load_results(self, value: str) -> DesignResults:
+        stored = json.loads(value)
+        log = stored['calculation_log']
+        if 'schema' in log:
+            schema_key = json.dumps(log['schema'])
+            if schema_key not in self._schemas:
+                self._schemas[schema_key] = LogSchema([(section, CalculationLog(**template))
+                                                       for section, template in log['schema']])
+            calculation_log = CompactLog(self._schemas[schema_key], np.array(log['values'], dtype=float), log['material'])
+        else:
+            calculation_log = defaultdict(list)
+            for section, steps in log['sections']:
+                calculation_log[section] = [CalculationLog(**step) for step in steps]
+        return DesignResults(calculation_log, stored['utilisation'], stored['governing_combination'],
+                             stored['governing_station'])
+
+    def _remember(self, key: str, results: 'DesignResults', duration: float) -> Tuple['DesignResults', float]:
+        self._results[key] = (results, duration)
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return self._results[key]
@@ -1,21 +1,56 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import defaultdict
-from src.design.logger import CalculationLog
+from src.design.logger import CalculationLog, LogLevel, LogSchema
 
 class DesignCode(ABC):
     """Design code base class"""
+    log_schemas: Dict[LogLevel, LogSchema] = {} # NOTE: logged symbols per log level, all of them if not given
 
     def __init__(self, code: str, design_parameters: dict):
         self.code = code
         self.design_parameters = design_parameters
-        self.calculation_log: defaultdict[str, List[CalculationLog]] = defaultdict(list)
+        self.log_level = LogLevel(design_parameters.get('log_level', LogLevel.FULL.value))
 
     @abstractmethod
     def design_column(self, column: 'Column') -> 'DesignResults':
-        """Region specific design checks contained within implementation. Log needs to be cleared beforehand."""
-        self.calculation_log.clear()  # NOTE: Every column design should receive a blank instance of the logger
+        """Region specific design checks contained within implementation. Implementations must not keep state between
+        calls, so that one instance can design columns from several threads or processes at once"""
 
-        self.calculation_log['Geometric Parameters'].append(CalculationLog('b', column.cross_section.width, 'm'))
-        self.calculation_log['Geometric Parameters'].append(CalculationLog('h', column.cross_section.depth, 'm'))
-        self.calculation_log['Geometric Parameters'].append(CalculationLog('l', column.length, 'm'))
\ No newline at end of file
+    @staticmethod
+    def create_calculation_log(column: 'Column') -> defaultdict[str, List[CalculationLog]]:
+        """A blank calculation log for the design of one column, starting with its geometric parameters"""
+        calculation_log = defaultdict(list)
+        calculation_log['Geometric Parameters'].append(CalculationLog('b', column.cross_section.width, 'm'))
+        calculation_log['Geometric Parameters'].append(CalculationLog('h', column.cross_section.depth, 'm'))
+        calculation_log['Geometric Parameters'].append(CalculationLog('l', column.length, 'm'))
+        return calculation_log
+
+    def apply_log_level(self, calculation_log: defaultdict) -> defaultdict:
+        """The calculation log restricted to what the log level asks for"""
+        schema = self.log_schemas.get(self.log_level)
+        return calculation_log if schema is None or self.log_level == LogLevel.FULL else schema.select(calculation_log)
+
+    def design_signature(self, column: 'Column') -> tuple:
+        """Everything design_column() depends on besides the design parameters and the internal forces. Columns with
+        equal signatures are one design group (see ColumnDesigner.group()). Implementations that read more of the
+        column must extend this"""
+        section = column.cross_section
+        return (column.length, section.shape, getattr(section, 'width', None), getattr(section, 'depth', None),
+                section.area, section.moment_of_inertia_about_y, section.moment_of_inertia_about_z,
+                column.material.name, column.speckle_object.property.material.name) # NOTE: the latter appears in the log
+
+    def design_inputs(self, column: 'Column') -> tuple:
+        """Everything design_column() depends on besides the design parameters, columns with equal inputs have equal
+        results (see DesignCache)"""
+        return self.design_signature(column) + (column.internal_forces.minimum('axial_force'),)
+
+    def size_columns(self, columns: List['Column'], catalogue: 'SectionCatalogue') -> List[Optional['SizingResult']]:
+        """Optional implementation of the lightest catalogue section per column that passes the design checks. Without
+        one no column is sized (None per column)"""
+        return [None] * len(columns)
+
+    def design_columns(self, columns: List['Column']) -> List['DesignResults']:
+        """Batch design of columns. Implementations can override this with a vectorised version, the fallback
+        designs column by column"""
+        return [self.design_column(column) for column in columns]
@@ -1,17 +1,81 @@
-from dataclasses import dataclass
-from typing import List
+import time
+from dataclasses import dataclass, replace
+from typing import List, Optional
 from collections import defaultdict
+from src.design.logger import copy_log
 
 class ColumnDesigner:
-    def __init__(self, design_code: 'DesignCode'):
+    def __init__(self, design_code: 'DesignCode', cache: Optional['DesignCache'] = None):
         self.design_code = design_code
+        self.cache = cache # NOTE: optional DesignCache in front of the design code
 
     def design(self, column: 'Column'):
         if column.is_designable:
-            results = self.design_code.design_column(column)
+            key = self.cache.key(self.design_code, column) if self.cache is not None else None
+            results = self.cache.get(key) if key is not None else None
+            if results is None:
+                start = time.perf_counter()
+                results = self.design_code.design_column(column)
+                if key is not None:
+                    self.cache.put(key, replace(results, calculation_log=copy_log(results.calculation_log)),
+                                   time.perf_counter() - start)
             column.set_design_results(results)
 
+    def design_all(self, columns: List['Column']):
+        designable = [column for column in columns if column.is_designable]
+        if self.cache is None:
+            for column, results in zip(designable, self.design_code.design_columns(designable)):
+                column.set_design_results(results)
+            return
+        pending = {} # NOTE: columns with equal inputs within the batch are designed once
+        for column in designable:
+            key = self.cache.key(self.design_code, column)
+            results = self.cache.get(key) if key not in pending else None
+            if results is not None:
+                column.set_design_results(results)
+            else:
+                pending.setdefault(key, []).append(column)
+        if not pending:
+            return
+        start = time.perf_counter()
+        designed = self.design_code.design_columns([columns[0] for columns in pending.values()])
+        duration = (time.perf_counter() - start) / len(designed)
+        self.cache.put_many([(key, replace(results, calculation_log=copy_log(results.calculation_log)), duration)
+                             for key, results in zip(pending, designed)])
+        for columns, results in zip(pending.values(), designed):
+            for i, column in enumerate(columns):
+                if i > 0:
+                    self.cache.statistics.hits += 1
+                    self.cache.statistics.time_saved += duration
+                    results = replace(results, calculation_log=copy_log(results.calculation_log))
+                column.set_design_results(results)
+
+    def group(self, columns: List['Column']) -> List['DesignGroup']:
+        """Designed columns grouped by design signature (length, section and material, the design parameters being
+        those of the design code), in the order of their first column"""
+        groups = {}
+        for column in columns:
+            if column.design_results is not None:
+                groups.setdefault(self.design_code.design_signature(column), []).append(column)
+        return [DesignGroup(f'DG{i}', members) for i, members in enumerate(groups.values(), start=1)]
+
+@dataclass()
+class DesignGroup:
+    """Columns that only differ in their internal forces, their stability and resistances are computed once"""
+    name: str
+    columns: List['Column']
+
+    @property
+    def governing_column(self) -> 'Column':
+        return max(self.columns, key=lambda column: column.design_results.utilisation)
+
+    @property
+    def utilisation(self) -> float:
+        return self.governing_column.design_results.utilisation
+
 @dataclass()
 class DesignResults:
     calculation_log: defaultdict[str, List['CalculationLog']]
     utilisation: float
+    governing_combination: Optional[str] = None # NOTE: load combination and station of the governing utilisation
+    governing_station: Optional[float] = None
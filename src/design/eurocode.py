@@ -1,114 +1,383 @@
+import hashlib
 from math import pi, sqrt
+from typing import List, Optional
+from collections import defaultdict
+import numpy as np
 from .design_code import DesignCode
 from .designer import DesignResults
-from src.design.logger import CalculationLog
+from src.design.logger import CalculationLog, CompactLog, LogLevel, LogSchema
+from src.design.sizing import SizingResult
+
+STRENGTH_MODIFICATION_FACTORS = {'Permanent': 0.6, 'Long term': 0.7, 'Medium term': 0.8, 'Short term': 0.9,
+                                 'Instantaneous': 1.1} # NOTE: EN 1995-1-1:2004+A1:2008 (E), Table 3.1
+MATERIAL_SAFETY_FACTORS = {'Solid': 1.3, 'Glulam': 1.25, 'LVL': 1.2} # NOTE: EN 1995-1-1:2004+A1:2008 (E), Table 2.3
+STRAIGHTNESS_FACTORS = {'Solid': 0.2, 'Glulam': 0.1} # NOTE: EN 1995-1-1:2004+A1:2008 (E), Eq. 6.29
+BENDING_REDISTRIBUTION_FACTOR = 0.7 # NOTE: k_m of rectangular sections, EN 1995-1-1:2004+A1:2008 (E), Cl. 6.1.6(2)
+
+COLUMN_LOG_SCHEMA = LogSchema(
+    [('Geometric Parameters', CalculationLog('b', None, 'm')),
+     ('Geometric Parameters', CalculationLog('h', None, 'm')),
+     ('Geometric Parameters', CalculationLog('l', None, 'm')),
+     ('Material Parameters ({material})', CalculationLog('f_c,0,k', None, 'N/m²')),
+     ('Material Parameters ({material})', CalculationLog('E_0.05', None, 'N/m²')),
+     ('Material Parameters ({material})', CalculationLog('f_m,k', None, 'N/m²'))] +
+    [entry for axis in ['y', 'z'] for entry in [
+     ('Stability', CalculationLog(f'lambda_{axis}', None, note=f'Slenderness ratio about the {axis}-axis')),
+     ('Stability', CalculationLog(f'lambda_rel,{axis}', None, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.21 and 6.22',
+                                  note=f'Relative slenderness about the {axis}-axis')),
+     ('Stability', CalculationLog('beta_c', None, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.29')),
+     ('Stability', CalculationLog(f'k_{axis}', None, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.27 and 6.28',
+                                  note=f'Buckling factor about the {axis}-axis')),
+     ('Stability', CalculationLog(f'k_c,{axis}', None, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.25 and 6.26',
+                                  note=f'Buckling reduction factor about the {axis}-axis'))]] +
+    [('Stability', CalculationLog('k_mod', None, code='EN 1995-1-1:2004+A1:2008 (E), Table 3.1')),
+     ('Proof', CalculationLog('gamma_M', None, code='EN 1995-1-1:2004+A1:2008 (E), Table 2.3')),
+     ('Stability', CalculationLog('k_c,min', None, note='Governing buckling reduction factor')),
+     ('Proof', CalculationLog('R_d', None, 'N/m²', 'EN 1995-1-1:2004+A1:2008 (E), Cl. 2.4.3')),
+     ('Proof', CalculationLog('E_d', None, 'N/m²', note='Compressive stress of the governing station')),
+     ('Proof', CalculationLog('f_m,d', None, 'N/m²', 'EN 1995-1-1:2004+A1:2008 (E), Cl. 2.4.1')),
+     ('Proof', CalculationLog('sigma_m,y,d', None, 'N/m²', note='Bending stress about the y-axis of the governing station')),
+     ('Proof', CalculationLog('sigma_m,z,d', None, 'N/m²', note='Bending stress about the z-axis of the governing station')),
+     ('Proof', CalculationLog('k_m', None, code='EN 1995-1-1:2004+A1:2008 (E), Cl. 6.1.6(2)')),
+     ('Proof', CalculationLog('eta_y', None, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.23')),
+     ('Proof', CalculationLog('eta_z', None, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.24')),
+     ('Proof', CalculationLog('eta', None, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.23 and 6.24',
+                              note='Utilisation under combined axial and bending stresses'))])
 
 class Eurocode(DesignCode):
+    log_schemas = {LogLevel.FULL: COLUMN_LOG_SCHEMA,
+                   LogLevel.SUMMARY: COLUMN_LOG_SCHEMA.subset(['b', 'h', 'l', 'k_c,min', 'R_d', 'E_d', 'eta']),
+                   LogLevel.NONE: LogSchema([])}
+
     def __init__(self, design_parameters):
         super().__init__(code='EN 1995-1-1:2004+A1:2008 (E)', design_parameters=design_parameters)
 
     def design_column(self, column: 'Column') -> DesignResults:
 
-        super().design_column(column) # NOTE: Every column design should receive a blank instance of the logger
+        calculation_log = self.create_calculation_log(column) # NOTE: Every column design receives its own log
 
         buckling_length = column.length * 1.0 # NOTE: Currently assuming pin-pin columns
         characteristic_comp_strength = column.material.strength.compression_parallel_to_grain
         modulus_of_elasticity_fifth_percentile = column.material.stiffness.fifth_percentile_moe_parallel_to_grain
-        self.calculation_log[f'Material Parameters ({column.speckle_object.property.material.name})'].append(
+        calculation_log[f'Material Parameters ({column.speckle_object.property.material.name})'].append(
             CalculationLog('f_c,0,k', characteristic_comp_strength, 'N/m²'))
-        self.calculation_log[f'Material Parameters ({column.speckle_object.property.material.name})'].append(
+        calculation_log[f'Material Parameters ({column.speckle_object.property.material.name})'].append(
             CalculationLog('E_0.05', modulus_of_elasticity_fifth_percentile, 'N/m²'))
+        characteristic_bending_strength = column.material.strength.bending_parallel_to_grain
+        calculation_log[f'Material Parameters ({column.speckle_object.property.material.name})'].append(
+            CalculationLog('f_m,k', characteristic_bending_strength, 'N/m²'))
 
         results = {}
 
         for axis in ['y', 'z']:
 
             radius_of_gyration = getattr(column.cross_section, f'radius_of_gyration_{axis}')
-            slenderness_ratio = self.slenderness_ratio(axis, buckling_length, radius_of_gyration)
-            relative_slenderness = self.relative_slenderness(axis, slenderness_ratio, characteristic_comp_strength,
+            slenderness_ratio = self.slenderness_ratio(calculation_log, axis, buckling_length, radius_of_gyration)
+            relative_slenderness = self.relative_slenderness(calculation_log, axis, slenderness_ratio,
+                                                             characteristic_comp_strength,
                                                              modulus_of_elasticity_fifth_percentile)
             factor_for_member_within_straightness_limits = self.member_within_straightness_limits(
-                column.material.description)
-            buckling_factor = self.buckling_factor(axis, factor_for_member_within_straightness_limits,
+                calculation_log, column.material.description)
+            buckling_factor = self.buckling_factor(calculation_log, axis, factor_for_member_within_straightness_limits,
                                                    relative_slenderness)
-            buckling_reduction_factor = self.buckling_reduction_factor(axis, buckling_factor, relative_slenderness)
+            buckling_reduction_factor = self.buckling_reduction_factor(calculation_log, axis, buckling_factor, relative_slenderness)
 
             results[axis] = buckling_reduction_factor
 
         governing_buckling_reduction_factor = min(results.values())
-        strength_modification_factor = self.strength_modification_factor()
+        strength_modification_factor = self.strength_modification_factor(calculation_log)
+        material_safety_factor = self.material_safety_factor(calculation_log, column)
         design_resistance = ((governing_buckling_reduction_factor * strength_modification_factor)
-                             / self.material_safety_factor(column)) * characteristic_comp_strength
-        design_action = abs(column.internal_forces.dataframe['axial_force'].min()) / column.cross_section.area
-        utilisation = round(design_action / design_resistance, 3)
+                             / material_safety_factor) * characteristic_comp_strength
+        compression_resistance = {axis: ((results[axis] * strength_modification_factor) / material_safety_factor)
+                                        * characteristic_comp_strength for axis in ['y', 'z']}
+        bending_resistance = (strength_modification_factor / material_safety_factor) * characteristic_bending_strength
 
-        self.calculation_log['Stability'].append(
+        internal_forces = column.internal_forces
+        axial_stress, bending_stress_y, bending_stress_z, eta_y, eta_z = self.combined_utilisation(
+            internal_forces.component('axial_force'), internal_forces.component('bending_y'),
+            internal_forces.component('bending_z'), column.cross_section.area, column.cross_section.section_modulus_y,
+            column.cross_section.section_modulus_z, compression_resistance['y'], compression_resistance['z'],
+            bending_resistance)
+        row_utilisation = np.maximum(eta_y, eta_z)
+        governing = int(np.argmax(row_utilisation)) if len(row_utilisation) else None
+        governing_values = [float(values[governing]) if governing is not None else float('nan')
+                            for values in (axial_stress, bending_stress_y, bending_stress_z, eta_y, eta_z)]
+        design_action, bending_stress_y, bending_stress_z, eta_y, eta_z = governing_values
+        utilisation = round(max(eta_y, eta_z), 3) if governing is not None else float('nan')
+
+        calculation_log['Stability'].append(
             CalculationLog('k_c,min', governing_buckling_reduction_factor, note='Governing buckling reduction factor'))
-        self.calculation_log['Proof'].append(CalculationLog('R_d', design_resistance, 'N/m²', 'EN 1995-1-1:2004+A1:2008 (E), Cl. 2.4.3'))
-        self.calculation_log['Proof'].append(CalculationLog('E_d', design_action, 'N/m²'))
-        self.calculation_log['Proof'].append(
-            CalculationLog('eta', utilisation, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.23 and 6.24', note='Utilisation under axial stresses only'))
+        calculation_log['Proof'].append(CalculationLog('R_d', design_resistance, 'N/m²', 'EN 1995-1-1:2004+A1:2008 (E), Cl. 2.4.3'))
+        calculation_log['Proof'].append(CalculationLog('E_d', design_action, 'N/m²', note='Compressive stress of the governing station'))
+        calculation_log['Proof'].append(CalculationLog('f_m,d', bending_resistance, 'N/m²', 'EN 1995-1-1:2004+A1:2008 (E), Cl. 2.4.1'))
+        calculation_log['Proof'].append(
+            CalculationLog('sigma_m,y,d', bending_stress_y, 'N/m²', note='Bending stress about the y-axis of the governing station'))
+        calculation_log['Proof'].append(
+            CalculationLog('sigma_m,z,d', bending_stress_z, 'N/m²', note='Bending stress about the z-axis of the governing station'))
+        calculation_log['Proof'].append(
+            CalculationLog('k_m', BENDING_REDISTRIBUTION_FACTOR, code='EN 1995-1-1:2004+A1:2008 (E), Cl. 6.1.6(2)'))
+        calculation_log['Proof'].append(CalculationLog('eta_y', eta_y, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.23'))
+        calculation_log['Proof'].append(CalculationLog('eta_z', eta_z, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.24'))
+        calculation_log['Proof'].append(
+            CalculationLog('eta', utilisation, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.23 and 6.24',
+                           note='Utilisation under combined axial and bending stresses'))
+
+        governing_combination, governing_station = internal_forces.case(governing) if governing is not None else (None, None)
+        return DesignResults(self.apply_log_level(calculation_log), utilisation, governing_combination, governing_station)
+
+    def design_inputs(self, column: 'Column') -> tuple:
+        """Every station takes part in the combined check, so the inputs include a digest of all forces instead of the
+        governing axial force only"""
+        internal_forces = column.internal_forces
+        rows = internal_forces.store.rows(internal_forces.element_index)
+        digest = hashlib.sha256()
+        for name in ['axial_force', 'bending_y', 'bending_z']:
+            digest.update(internal_forces.component(name).tobytes())
+        digest.update(internal_forces.store.station[rows].tobytes())
+        combination_index = internal_forces.store.combination_index[rows]
+        digest.update(combination_index.tobytes())
+        digest.update('\n'.join(internal_forces.store.combinations[i] for i in np.unique(combination_index)).encode())
+        return self.design_signature(column) + (digest.hexdigest(),)
+
+    def design_signature(self, column: 'Column') -> tuple:
+        return super().design_signature(column) + (column.material.strength.bending_parallel_to_grain,)
+
+    @staticmethod
+    def combined_utilisation(axial_force: np.ndarray,
+                             bending_y: np.ndarray,
+                             bending_z: np.ndarray,
+                             area,
+                             section_modulus_y,
+                             section_modulus_z,
+                             compression_resistance_y,
+                             compression_resistance_z,
+                             bending_resistance):
+        """Stresses and utilisations of every station under compression and biaxial bending (EN 1995-1-1:2004,
+        Eq. 6.23 and 6.24). Section properties and resistances are scalars or arrays aligned with the forces. Missing
+        force components count as zero"""
+        axial_stress = np.abs(np.nan_to_num(axial_force)) / area # NOTE: conservatively, tension is checked as compression
+        bending_stress_y = np.abs(np.nan_to_num(bending_y)) / section_modulus_y
+        bending_stress_z = np.abs(np.nan_to_num(bending_z)) / section_modulus_z
+        eta_y = (axial_stress / compression_resistance_y + bending_stress_y / bending_resistance
+                 + BENDING_REDISTRIBUTION_FACTOR * bending_stress_z / bending_resistance)
+        eta_z = (axial_stress / compression_resistance_z + BENDING_REDISTRIBUTION_FACTOR * bending_stress_y / bending_resistance
+                 + bending_stress_z / bending_resistance)
+        return axial_stress, bending_stress_y, bending_stress_z, eta_y, eta_z
+
+    @staticmethod
+    def stability(buckling_length, radius_of_gyration, characteristic_comp_strength,
+                  modulus_of_elasticity_fifth_percentile, beta_c):
+        """Slenderness ratio, relative slenderness, buckling factor and buckling reduction factor about one axis, for
+        arrays of any (broadcastable) shape (EN 1995-1-1:2004, Eq. 6.21 to 6.29)"""
+        slenderness_ratio = buckling_length / radius_of_gyration
+        relative_slenderness = (slenderness_ratio / pi) * np.sqrt(
+            characteristic_comp_strength / modulus_of_elasticity_fifth_percentile)
+        buckling_factor = 0.5 * (1 + beta_c * (relative_slenderness - 0.3) + relative_slenderness ** 2)
+        buckling_reduction_factor = 1 / (buckling_factor + np.sqrt(buckling_factor ** 2 - relative_slenderness ** 2))
+        return slenderness_ratio, relative_slenderness, buckling_factor, buckling_reduction_factor
+
+    def design_columns(self, columns: List['Column']) -> List[DesignResults]:
+        """Batch design of columns. All columns and both axes are computed in one pass over NumPy arrays,
+        the returned DesignResults are identical to those of design_column(). Stability and resistances are computed
+        per design group (columns with equal design_signature()), the stations of all columns in bulk"""
+        if not columns:
+            return []
+
+        strength_modification_factor = STRENGTH_MODIFICATION_FACTORS.get(self.design_parameters['load_duration_class'])
+        if strength_modification_factor is None:
+            raise ValueError(f'Load duration class {self.design_parameters["load_duration_class"]} not recognised')
+        # NOTE: the member parameters are computed once per design group, then repeated per column with member[]
+        signatures = {}
+        member = np.array([signatures.setdefault(self.design_signature(column), len(signatures)) for column in columns],
+                          dtype=np.int64)
+        members = [columns[i] for i in np.unique(member, return_index=True)[1]]
+        descriptions = [column.material.description for column in members]
+        for description in set(descriptions):
+            if description not in STRAIGHTNESS_FACTORS:
+                raise ValueError(f'Timber type {description} not recognised')
+
+        buckling_length = np.array([column.length for column in members], dtype=float) * 1.0 # NOTE: Currently assuming pin-pin columns
+        radius_of_gyration = {
+            'y': np.array([column.cross_section.radius_of_gyration_y for column in members], dtype=float),
+            'z': np.array([column.cross_section.radius_of_gyration_z for column in members], dtype=float)}
+        characteristic_comp_strength = np.array(
+            [column.material.strength.compression_parallel_to_grain for column in members], dtype=float)
+        modulus_of_elasticity_fifth_percentile = np.array(
+            [column.material.stiffness.fifth_percentile_moe_parallel_to_grain for column in members], dtype=float)
+        beta_c = np.array([STRAIGHTNESS_FACTORS[description] for description in descriptions], dtype=float)
+        material_safety_factor = np.array([MATERIAL_SAFETY_FACTORS[description] for description in descriptions], dtype=float)
+        characteristic_bending_strength = np.array(
+            [column.material.strength.bending_parallel_to_grain for column in members], dtype=float)
+        area = np.array([column.cross_section.area for column in members], dtype=float)
+        section_modulus_y = np.array([column.cross_section.section_modulus_y for column in members], dtype=float)
+        section_modulus_z = np.array([column.cross_section.section_modulus_z for column in members], dtype=float)
+
+        stability = {axis: self.stability(buckling_length, radius_of_gyration[axis], characteristic_comp_strength,
+                                          modulus_of_elasticity_fifth_percentile, beta_c) for axis in ['y', 'z']}
+
+        governing_buckling_reduction_factor = np.minimum(stability['y'][3], stability['z'][3])
+        design_resistance = ((governing_buckling_reduction_factor * strength_modification_factor)
+                             / material_safety_factor) * characteristic_comp_strength
+        compression_resistance = {axis: ((stability[axis][3] * strength_modification_factor) / material_safety_factor)
+                                        * characteristic_comp_strength for axis in ['y', 'z']}
+        bending_resistance = (strength_modification_factor / material_safety_factor) * characteristic_bending_strength
+
+        # NOTE: every station of every combination of every column in one array, parameters are repeated per row
+        rows = np.array([len(column.internal_forces) for column in columns], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(rows)])
+        row_column = np.repeat(np.arange(len(columns)), rows)
+        row_member = member[row_column]
+        forces = {name: np.concatenate([column.internal_forces.component(name) for column in columns])
+                  for name in ['axial_force', 'bending_y', 'bending_z']}
+        axial_stress, bending_stress_y, bending_stress_z, eta_y, eta_z = self.combined_utilisation(
+            forces['axial_force'], forces['bending_y'], forces['bending_z'], area[row_member],
+            section_modulus_y[row_member], section_modulus_z[row_member], compression_resistance['y'][row_member],
+            compression_resistance['z'][row_member], bending_resistance[row_member])
+        row_utilisation = np.maximum(eta_y, eta_z)
+
+        # NOTE: the governing row of a column is its first row of maximum utilisation, as np.argmax() in design_column()
+        order = np.lexsort((-row_utilisation, row_column))
+        has_rows = rows > 0
+        governing = np.zeros(len(columns), dtype=np.int64)
+        governing[has_rows] = order[offsets[:-1][has_rows]]
+        governing_values = [np.where(has_rows, values[governing] if len(values) else np.nan, np.nan)
+                            for values in (axial_stress, bending_stress_y, bending_stress_z, eta_y, eta_z)]
+        design_action, bending_stress_y, bending_stress_z, eta_y, eta_z = governing_values
+        utilisation = np.maximum(eta_y, eta_z)
+        utilisation = np.array([round(value, 3) for value in utilisation.tolist()]) # NOTE: as round() in design_column()
+
+        schema = self.log_schemas[self.log_level]
+        logged = [np.array([column.cross_section.width for column in members], dtype=float),
+                  np.array([column.cross_section.depth for column in members], dtype=float),
+                  buckling_length, characteristic_comp_strength, modulus_of_elasticity_fifth_percentile,
+                  characteristic_bending_strength]
+        for axis in ['y', 'z']:
+            slenderness_ratio, relative_slenderness, buckling_factor, buckling_reduction_factor = stability[axis]
+            logged += [slenderness_ratio, relative_slenderness, beta_c, buckling_factor, buckling_reduction_factor]
+        logged = [array[member] for array in logged]
+        logged += [strength_modification_factor, material_safety_factor[member], governing_buckling_reduction_factor[member],
+                   design_resistance[member], design_action, bending_resistance[member], bending_stress_y,
+                   bending_stress_z, BENDING_REDISTRIBUTION_FACTOR, eta_y, eta_z, utilisation]
+        values = np.empty((len(columns), len(schema))) # NOTE: one allocation for the logs of the whole batch
+        j = 0
+        for (_, template), array in zip(COLUMN_LOG_SCHEMA.entries, logged):
+            if template.symbol in schema.symbols:
+                values[:, j] = array
+                j += 1
+
+        results = []
+        for i, column in enumerate(columns):
+            governing_combination, governing_station = (column.internal_forces.case(int(governing[i] - offsets[i]))
+                                                        if has_rows[i] else (None, None))
+            results.append(DesignResults(CompactLog(schema, values[i], column.speckle_object.property.material.name),
+                                         float(utilisation[i]), governing_combination, governing_station))
+        return results
+
+    def size_columns(self, columns: List['Column'], catalogue: 'SectionCatalogue') -> List[Optional['SizingResult']]:
+        """Lightest catalogue section per column with a utilisation <= 1.0 under the combined check, None if there is
+        none. All columns x candidates are bounded in one broadcast: the check on the envelope of |N|, |M_y| and |M_z|
+        is an upper bound of the utilisation and each of its terms alone a lower bound (utilisation is monotonic in the
+        forces and, through k_c, in the slenderness). Only candidates lighter than the first one within the upper bound,
+        and not excluded by the lower bound, go through the check of every station"""
+        strength_modification_factor = STRENGTH_MODIFICATION_FACTORS.get(self.design_parameters['load_duration_class'])
+        if strength_modification_factor is None:
+            raise ValueError(f'Load duration class {self.design_parameters["load_duration_class"]} not recognised')
+        if not columns or not len(catalogue):
+            return [None] * len(columns)
+        beta_c = np.array([STRAIGHTNESS_FACTORS[description] for description in catalogue.descriptions], dtype=float)
+        material_safety_factor = np.array([MATERIAL_SAFETY_FACTORS[description] for description in catalogue.descriptions], dtype=float)
+
+        buckling_length = np.array([column.length for column in columns], dtype=float)[:, np.newaxis] * 1.0 # NOTE: Currently assuming pin-pin columns
+        forces = [{name: np.abs(np.nan_to_num(column.internal_forces.component(name)))
+                   for name in ['axial_force', 'bending_y', 'bending_z']} for column in columns]
+        envelope = {name: np.array([values[name].max(initial=0.0) for values in forces])[:, np.newaxis]
+                    for name in ['axial_force', 'bending_y', 'bending_z']}
+
+        compression_resistance = {}
+        for axis in ['y', 'z']:
+            buckling_reduction_factor = self.stability(buckling_length, getattr(catalogue, f'radius_of_gyration_{axis}'),
+                                                       catalogue.compression_strength, catalogue.modulus_of_elasticity,
+                                                       beta_c)[3]
+            compression_resistance[axis] = ((buckling_reduction_factor * strength_modification_factor)
+                                            / material_safety_factor) * catalogue.compression_strength
+        bending_resistance = (strength_modification_factor / material_safety_factor) * catalogue.bending_strength
+        axial_stress, bending_stress_y, bending_stress_z, eta_y, eta_z = self.combined_utilisation(
+            envelope['axial_force'], envelope['bending_y'], envelope['bending_z'], catalogue.area,
+            catalogue.section_modulus_y, catalogue.section_modulus_z, compression_resistance['y'],
+            compression_resistance['z'], bending_resistance)
+        upper_bound = np.maximum(eta_y, eta_z)
+        lower_bound = np.maximum.reduce([axial_stress / np.minimum(compression_resistance['y'], compression_resistance['z']),
+                                         bending_stress_y / bending_resistance, bending_stress_z / bending_resistance])
+        within_upper_bound = upper_bound <= 1.0
+        first = np.where(within_upper_bound.any(axis=1), within_upper_bound.argmax(axis=1), len(catalogue))
+        candidates = (lower_bound <= 1.0) & (np.arange(len(catalogue)) <= first[:, np.newaxis])
 
-        return DesignResults(self.calculation_log, utilisation)
+        results = []
+        for i, column_forces in enumerate(forces):
+            checked = np.flatnonzero(candidates[i])
+            if not len(checked) or not len(column_forces['axial_force']):
+                results.append(None)
+                continue
+            utilisation = np.maximum(*self.combined_utilisation(
+                column_forces['axial_force'][:, np.newaxis], column_forces['bending_y'][:, np.newaxis],
+                column_forces['bending_z'][:, np.newaxis], catalogue.area[checked], catalogue.section_modulus_y[checked],
+                catalogue.section_modulus_z[checked], compression_resistance['y'][i, checked],
+                compression_resistance['z'][i, checked], bending_resistance[checked])[3:]).max(axis=0)
+            feasible = np.flatnonzero(utilisation <= 1.0)
+            if not len(feasible):
+                results.append(None)
+                continue
+            j = checked[feasible[0]]
+            results.append(SizingResult(float(catalogue.width[j]), float(catalogue.depth[j]), catalogue.strength_classes[j].name,
+                                        round(float(utilisation[feasible[0]]), 3), float(catalogue.weight[j]), len(checked)))
+        return results
 
-    def strength_modification_factor(self):
+    def strength_modification_factor(self, calculation_log: defaultdict):
         """Strength modification factor (kmod)"""
-        result = None
-        if self.design_parameters['load_duration_class'] == 'Permanent':
-            result = 0.6
-        elif self.design_parameters['load_duration_class'] == 'Long term':
-            result = 0.7
-        elif self.design_parameters['load_duration_class'] == 'Medium term':
-            result = 0.8
-        elif self.design_parameters['load_duration_class'] == 'Short term':
-            result = 0.9
-        elif self.design_parameters['load_duration_class'] == 'Instantaneous':
-            result = 1.1
-        else:
+        result = STRENGTH_MODIFICATION_FACTORS.get(self.design_parameters['load_duration_class'])
+        if result is None:
             return ValueError(f'Load duration class {self.design_parameters["load_duration_class"]} not recognised')
-        self.calculation_log['Stability'].append(CalculationLog('k_mod', result, code='EN 1995-1-1:2004+A1:2008 (E), Table 3.1'))
+        calculation_log['Stability'].append(CalculationLog('k_mod', result, code='EN 1995-1-1:2004+A1:2008 (E), Table 3.1'))
         return result
 
-    def material_safety_factor(self, structural_element: 'StructuralElement') -> float:
+    def material_safety_factor(self, calculation_log: defaultdict, structural_element: 'StructuralElement') -> float:
         """Material safety factor (EN 1995-1-1:2004, Table 2.3)"""
-        if structural_element.material.description == 'Solid':
-            result = 1.3
-        elif structural_element.material.description == 'Glulam':
-            result = 1.25
-        elif structural_element.material.description == 'LVL':
-            result = 1.2
-        else:
+        result = MATERIAL_SAFETY_FACTORS.get(structural_element.material.description)
+        if result is None:
             raise ValueError(f'Material of description {structural_element.material.note} not recognised')
-        self.calculation_log['Proof'].append(CalculationLog('gamma_M', result, code='EN 1995-1-1:2004+A1:2008 (E), Table 2.3'))
+        calculation_log['Proof'].append(CalculationLog('gamma_M', result, code='EN 1995-1-1:2004+A1:2008 (E), Table 2.3'))
         return result
 
-    def system_modification_factor(self, material_property: str):
+    def system_modification_factor(self, calculation_log: defaultdict, structural_element: 'StructuralElement',
+                                   material_property: str):
         """Multiple of relevant member and system modification factors"""
         if material_property == 'bending_parallel_to_grain' or material_property == 'tension_parallel_to_grain':
-            height = self.structural_element.cross_section.height if material_property == 'bending_parallel_to_grain' else max(
-                self.structural_element.cross_section.height, self.structural_element.cross_section.breadth)
-            if self.structural_element.material.description == 'Solid':
-                if self.structural_element.material.density.minimum <= 700 and height < 150:
+            height = structural_element.cross_section.height if material_property == 'bending_parallel_to_grain' else max(
+                structural_element.cross_section.height, structural_element.cross_section.breadth)
+            if structural_element.material.description == 'Solid':
+                if structural_element.material.density.minimum <= 700 and height < 150:
                     result = min(pow(150/height, 0.2), 1.3)
-                    self.calculation_log['Modification Factors'].append(CalculationLog('k_h', result, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 3.1'))
-            elif self.structural_element.material.description == 'Glulam':
+                    calculation_log['Modification Factors'].append(CalculationLog('k_h', result, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 3.1'))
+            elif structural_element.material.description == 'Glulam':
                 result = min(pow(600/height, 0.1), 1.1)
-                self.calculation_log['Modification Factors'].append(CalculationLog('k_h', result, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 3.2'))
-            elif self.structural_element.material.description == 'LVL':
+                calculation_log['Modification Factors'].append(CalculationLog('k_h', result, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 3.2'))
+            elif structural_element.material.description == 'LVL':
                 raise NotImplementedError('Size effect parameter required form manufacturer')
             else:
                 raise ValueError(f'Material of description {material_property} not recognised')
             return result
         return None
 
-    def slenderness_ratio(self, axis: str, buckling_length: float, radius_of_gyration: float):
+    def slenderness_ratio(self, calculation_log: defaultdict, axis: str, buckling_length: float, radius_of_gyration: float):
         """Geometric slenderness ratio"""
         result = buckling_length/radius_of_gyration
-        self.calculation_log['Stability'].append(
+        calculation_log['Stability'].append(
             CalculationLog(f'lambda_{axis}', result, note=f'Slenderness ratio about the {axis}-axis'))
         return result
 
     def relative_slenderness(self,
+                                calculation_log: defaultdict,
                                 axis: str,
                                 slenderness: float,
                                 characteristic_comp_strength: float,
@@ -116,41 +385,40 @@ class Eurocode(DesignCode):
         """Relative slenderness (EN 1995-1-1:2004, Eq. 6.21 and 6.22)"""
         result = (slenderness/pi)*sqrt(
             characteristic_comp_strength/modulus_of_elasticity_fifth_percentile)
-        self.calculation_log['Stability'].append(
+        calculation_log['Stability'].append(
             CalculationLog(f'lambda_rel,{axis}', result, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.21 and 6.22',
                            note=f'Relative slenderness about the {axis}-axis'))
         return result
 
-    def member_within_straightness_limits(self, timber_type: str) -> float:
+    def member_within_straightness_limits(self, calculation_log: defaultdict, timber_type: str) -> float:
         """Factor for members within the straightness limits (EN 1995-1-1:2004+A1:2008 (E), Eq. 6.29)"""
-        if timber_type == 'Solid':
-            result = 0.2
-        elif timber_type == 'Glulam':
-            result = 0.1
-        else:
+        result = STRAIGHTNESS_FACTORS.get(timber_type)
+        if result is None:
             raise ValueError(f'Timber type {timber_type} not recognised')
-        self.calculation_log['Stability'].append(
+        calculation_log['Stability'].append(
             CalculationLog('beta_c', result, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.29'))
         return result
 
     def buckling_factor(self,
+                        calculation_log: defaultdict,
                         axis: str,
                         beta_c: float,
                         lambda_rel: float):
         """Buckling factor (EN 1995-1-1:2004, Eq. 6.27 and 6.28)"""
         result = 0.5*(1 + beta_c*(lambda_rel-0.3)+lambda_rel**2)
-        self.calculation_log['Stability'].append(
+        calculation_log['Stability'].append(
             CalculationLog(f'k_{axis}', result, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.27 and 6.28',
                            note=f'Buckling factor about the {axis}-axis'))
         return result
 
     def buckling_reduction_factor(self,
+                                    calculation_log: defaultdict,
                                     axis: str,
                                     buckling_factor: float,
                                     relative_slenderness: float):
         """Buckling reduction factor (EN 1995-1-1:2004, Eq. 6.25 and 6.26)"""
         result = 1/(buckling_factor+sqrt(buckling_factor**2-relative_slenderness**2))
-        self.calculation_log['Stability'].append(
+        calculation_log['Stability'].append(
             CalculationLog(f'k_c,{axis}', result, code='EN 1995-1-1:2004+A1:2008 (E), Eq. 6.25 and 6.26',
                            note=f'Buckling reduction factor about the {axis}-axis'))
         return result
@@ -1,4 +1,8 @@
-from dataclasses import dataclass, field
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from typing import DefaultDict, Dict, List, Sequence, Tuple
+import numpy as np
 
 @dataclass
 class CalculationLog:
@@ -18,3 +22,72 @@ class AutomationIDLogger:
     elements_selected_conformity: list = field(default_factory=list)
     elements_selected_passed: list = field(default_factory=list)
     elements_selected_failed: list = field(default_factory=list)
+
+class LogLevel(Enum):
+    """How much of the calculation is logged: nothing, the governing values, or every step"""
+    NONE = 'none'
+    SUMMARY = 'summary'
+    FULL = 'full'
+
+class LogSchema:
+    """Fixed, ordered set of (section, CalculationLog template) entries. Section names may contain '{material}'. Values
+    are kept in a float array per column (see CompactLog) and only turned into CalculationLogs when read"""
+    def __init__(self, entries: Sequence[Tuple[str, CalculationLog]]):
+        self.entries = tuple(entries)
+        self.symbols = tuple(template.symbol for _, template in self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def subset(self, symbols: Sequence[str]) -> 'LogSchema':
+        return LogSchema([entry for entry in self.entries if entry[1].symbol in symbols])
+
+    def select(self, calculation_log: Dict[str, List[CalculationLog]]) -> DefaultDict[str, List[CalculationLog]]:
+        """Copy of an eager calculation log restricted to the symbols of the schema"""
+        selected = defaultdict(list)
+        for section, logs in calculation_log.items():
+            for log in logs:
+                if log.symbol in self.symbols:
+                    selected[section].append(log)
+        return selected
+
+class CompactLog:
+    """Calculation log of one column as a row of values against a shared LogSchema. Reads like the eager
+    defaultdict(list) of CalculationLogs, which is only materialised on items() (i.e. at commit time)"""
+    __slots__ = ('schema', 'values', 'material')
+
+    def __init__(self, schema: LogSchema, values: np.ndarray, material: str = ''):
+        self.schema = schema
+        self.values = values
+        self.material = material
+
+    def __len__(self) -> int:
+        return len(self.materialise())
+
+    def __getitem__(self, section: str) -> List[CalculationLog]:
+        return self.materialise().get(section, [])
+
+    def __iter__(self):
+        return iter(self.materialise())
+
+    def keys(self):
+        return self.materialise().keys()
+
+    def items(self):
+        return self.materialise().items()
+
+    def materialise(self) -> DefaultDict[str, List[CalculationLog]]:
+        calculation_log = defaultdict(list)
+        for (section, template), value in zip(self.schema.entries, self.values.tolist()):
+            calculation_log[section.format(material=self.material)].append(replace(template, value=value))
+        return calculation_log
+
+def copy_log(calculation_log):
+    """Copy of a calculation log that shares no list or array with the original, e.g. between a cache and a column"""
+    if isinstance(calculation_log, CompactLog):
+        return CompactLog(calculation_log.schema, calculation_log.values.copy(), calculation_log.material)
+    copied = defaultdict(list)
+    for section, logs in calculation_log.items():
+        copied[section] = list(logs)
+    return copied
+
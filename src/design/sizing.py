@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from src.core.cross_section import SQRT_12
+from src.core.materials import BritishStandards
+from src.utils.units import Convert
+
+# NOTE: common sizes in mm (width, depth), solid timber from BS EN 336 and glulam from typical manufacturer ranges
+STANDARD_SECTIONS = {
+    'Solid': [(width, depth) for width in (47, 63, 75, 100, 150, 200)
+              for depth in (75, 100, 125, 150, 175, 200, 225, 250, 300) if depth >= width],
+    'Glulam': [(width, depth) for width in (90, 115, 140, 165, 190, 215, 240, 265)
+               for depth in range(90, 631, 45) if depth >= width]}
+
+@dataclass(frozen=True)
+class SizingResult:
+    """Lightest catalogue section of a column with a utilisation <= 1.0"""
+    width: float # NOTE: m
+    depth: float # NOTE: m
+    strength_class: str
+    utilisation: float
+    weight: float # NOTE: kg/m, from the mean density
+    candidates_checked: int # NOTE: candidates that went through the full check after pruning
+
+class SectionCatalogue:
+    """Candidate sections (rectangular sizes x strength classes) as arrays, sorted from the lightest to the heaviest"""
+    def __init__(self,
+                 sections: Dict[str, List[Tuple[float, float]]] = None,
+                 strength_classes: Iterable['StrengthClass'] = BritishStandards):
+        sections = sections or STANDARD_SECTIONS
+        candidates = [(Convert.length(width, input_unit='mm'), Convert.length(depth, input_unit='mm'), strength_class)
+                      for strength_class in strength_classes
+                      for width, depth in sections.get(strength_class.properties.description, [])]
+        candidates.sort(key=lambda candidate: candidate[0] * candidate[1] * candidate[2].properties.density.mean)
+        self.strength_classes = [strength_class for _, _, strength_class in candidates]
+        self.descriptions = [strength_class.properties.description for strength_class in self.strength_classes]
+        self.width = np.array([width for width, _, _ in candidates], dtype=float)
+        self.depth = np.array([depth for _, depth, _ in candidates], dtype=float)
+        self.area = self.width * self.depth
+        self.radius_of_gyration_y = self.depth / SQRT_12
+        self.radius_of_gyration_z = self.width / SQRT_12
+        self.section_modulus_y = (self.width * self.depth ** 3 / 12) / (self.depth / 2) # NOTE: as RectangularSection
+        self.section_modulus_z = (self.depth * self.width ** 3 / 12) / (self.width / 2)
+        properties = [strength_class.properties for strength_class in self.strength_classes]
+        self.compression_strength = np.array([p.strength.compression_parallel_to_grain for p in properties], dtype=float)
+        self.bending_strength = np.array([p.strength.bending_parallel_to_grain for p in properties], dtype=float)
+        self.modulus_of_elasticity = np.array([p.stiffness.fifth_percentile_moe_parallel_to_grain for p in properties], dtype=float)
+        self.weight = self.area * np.array([p.density.mean for p in properties], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.width)
@@ -2,8 +2,7 @@ from typing import List
 from src.model.structural_model import StructuralModel
 from src.core.cross_section import RectangularSection
 from src.core.materials import MaterialFactory
-from src.utils.units import Convert
-from src.core.internal_forces import InternalForces
+from src.core.internal_forces import InternalForces, ForcesStoreBuilder
 
 class EtabsModel(StructuralModel):
     """Implementation StructuralModel base class specific for ETABS"""
@@ -30,7 +29,7 @@ class EtabsModel(StructuralModel):
 
     def filter_columns(self) -> List['Element1D']:
         columns = []
-        for element in self.model.elements: #TODO: multithreading
+        for element in self.model.elements: # NOTE: attribute parsing is parallelised in create_column_objects()
             if str(getattr(element, 'type', '')) == 'ElementType1D.Column':
                 columns.append(element)
             else: # NOTE: these objects are logged for automation results
@@ -39,45 +38,69 @@ class EtabsModel(StructuralModel):
 
     # NOTE: error handling within the design_columns() base class function
     def parse_length(self, element_1d) -> float:
-        return Convert.length(element_1d.baseLine.length, input_unit = self.units.length_unit)
+        return float(element_1d.baseLine.length * self.units.context.length)
 
     # NOTE: error handling within the design_columns() base class function
     def parse_cross_section(self, element_1d) -> 'CrossSection':
-        if element_1d.property.profile.shapeName == 'Rectangular':
-            width = Convert.length(element_1d.property.profile.width, input_unit = self.units.length_unit)
-            depth = Convert.length(element_1d.property.profile.depth, input_unit = self.units.length_unit)
-            area = Convert.area(element_1d.property.profile.area, input_unit = self.units.length_unit)
-            moment_of_intertia_about_y = Convert.moment_of_inertia(element_1d.property.profile.Iyy, input_unit = self.units.length_unit)
-            moment_of_intertia_about_z = Convert.moment_of_inertia(element_1d.property.profile.Izz, input_unit = self.units.length_unit)
+        profile = element_1d.property.profile
+        key = (getattr(profile, 'id', None) or (profile.shapeName, getattr(profile, 'width', None), getattr(profile, 'depth', None),
+                                                profile.area, profile.Iyy, profile.Izz), self.units.length_unit)
+        return self.section_cache.get(key, lambda: self.create_cross_section(profile))
+
+    def create_cross_section(self, profile) -> 'CrossSection':
+        if profile.shapeName == 'Rectangular':
+            units = self.units.context
+            width = float(profile.width * units.length)
+            depth = float(profile.depth * units.length)
+            area = float(profile.area * units.area)
+            moment_of_intertia_about_y = float(profile.Iyy * units.moment_of_inertia)
+            moment_of_intertia_about_z = float(profile.Izz * units.moment_of_inertia)
             return RectangularSection(width,
                                       depth,
                                       area,
                                       moment_of_intertia_about_y,
                                       moment_of_intertia_about_z)
         else:
-            raise ValueError(f'Shape {element_1d.property.profile.shapeName} not recognised')
+            raise ValueError(f'Shape {profile.shapeName} not recognised')
 
     # NOTE: error handling within the design_columns() base class function
     def parse_material(self, element_1d) -> 'Material':
         return MaterialFactory.get_material(region = 'Britain',
                                             material_name=element_1d.property.material.name)
 
+    @classmethod
+    def build_forces_store(cls, elements_1d: List['Element1D'], units: 'ModelUnits', envelope: str = None) -> 'ForcesStore':
+        """One sweep over the results1D of all elements into a columnar ForcesStore, converted to SI units at the end"""
+        builder = ForcesStoreBuilder(envelope)
+        for element_1d in elements_1d:
+            if not hasattr(element_1d, 'AnalysisResults'):
+                continue # NOTE: parse_internal_forces() raises for elements missing from the store
+            builder.start_element(element_1d.id)
+            try:
+                for load_combination in element_1d.AnalysisResults.resultsByLoadCombination:
+                    result_case = load_combination.resultCase.name
+                    builder.extend(result_case, [(result.position, result.forceX, result.forceY, result.forceZ,
+                                                  result.momentYY, result.momentZZ, result.momentXX)
+                                                 for result in load_combination.results1D])
+            except Exception:
+                builder.discard_element()
+                continue
+            builder.end_element()
+        context = units.context
+        return builder.build({'axial_force': context.force,
+                              'shear_y': context.force,
+                              'shear_z': context.force,
+                              'bending_y': context.moment,
+                              'bending_z': context.moment,
+                              'torsion': context.moment})
+
     # NOTE: error handling within the design_columns() base class function
     def parse_internal_forces(self, element_1d) -> InternalForces:
-        data = []
         if not hasattr(element_1d, 'AnalysisResults'):
             raise ValueError('Send "Column Forces" with model')
-        for load_combination in element_1d.AnalysisResults.resultsByLoadCombination:
-            result_case = load_combination.resultCase.name
-            for result in load_combination.results1D:
-                data.append({
-                    'result_case': result_case,
-                    'station': result.position,
-                    'axial_force': Convert.force(result.forceX, input_unit = self.units.force_unit),
-                    'shear_y': Convert.force(result.forceY, input_unit = self.units.force_unit),
-                    'shear_z': Convert.force(result.forceZ, input_unit = self.units.force_unit),
-                    'bending_y': Convert.force(Convert.length(result.momentYY, input_unit = self.units.length_unit), input_unit = self.units.force_unit),
-                    'bending_z': Convert.force(Convert.length(result.momentZZ, input_unit = self.units.length_unit), input_unit = self.units.force_unit),
-                    'torsion': Convert.force(Convert.length(result.momentXX, input_unit = self.units.length_unit), input_unit = self.units.force_unit)
-                })
-        return InternalForces(data = data)
+        if self.forces_store is None:
+            raise ValueError('Internal forces have not been prepared')
+        element_index = self.forces_store.element_positions.get(element_1d.id)
+        if element_index is None:
+            raise ValueError(f'Internal forces of {element_1d.id} could not be parsed')
+        return InternalForces(store = self.forces_store, element_index = element_index)
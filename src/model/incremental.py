@@ -0,0 +1,37 @@
+import hashlib
+import json
+from typing import Dict, Optional
+from specklepy.objects import Base
+
+FINGERPRINT_VERSION = 1 # NOTE: bump when a change to the design or to the result objects invalidates previous results
+
+def fingerprint(element_id: str, design_code: 'DesignCode', units: 'ModelUnits', forces_envelope: Optional[str] = None,
+                include_forces: bool = False) -> str:
+    """Fingerprint of the design of one element. The Speckle id of an element is a hash of its whole subtree (geometry,
+    profile, material and AnalysisResults), so it changes with any of its design inputs. The design code, its parameters,
+    the model units, the envelope of the internal forces and what the result objects carry complete the inputs"""
+    inputs = [FINGERPRINT_VERSION, element_id, design_code.code, design_code.design_parameters, units.length_unit,
+              units.force_unit, forces_envelope, include_forces]
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+class DesignHistory:
+    """Column results of a previous results commit, by fingerprint. Columns whose fingerprint is unchanged are not parsed
+    or designed again, their previous commit objects are sent as they are, which the server already has"""
+    def __init__(self, columns: Dict[str, Base]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    @classmethod
+    def from_commit(cls, commit: Optional[Base]) -> 'DesignHistory':
+        columns = {}
+        for column in (getattr(commit, '@Columns', None) or []) if commit is not None else []:
+            design_results = getattr(column, 'designResults', None)
+            key = getattr(design_results, 'fingerprint', None)
+            if key is not None and isinstance(getattr(design_results, 'utilisation', None), (int, float)):
+                columns[key] = column
+        return cls(columns)
+
+    def get(self, key: str) -> Optional[Base]:
+        return self.columns.get(key)
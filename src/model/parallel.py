@@ -0,0 +1,60 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, List, Tuple
+from src.core.internal_forces import ForcesStore
+
+BACKENDS = ('thread', 'process')
+
+def chunk(items: list, chunks: int) -> List[list]:
+    """Split into contiguous chunks of near equal size, keeping the order of the items"""
+    size, remainder = divmod(len(items), chunks)
+    result, start = [], 0
+    for i in range(chunks):
+        end = start + size + (1 if i < remainder else 0)
+        if end > start:
+            result.append(items[start:end])
+        start = end
+    return result
+
+class ParallelParser:
+    """Opt-in parallel parsing of columns for StructuralModel.create_column_objects().
+
+    The columns are split into contiguous chunks, one per worker. The internal forces of each chunk are swept into a
+    ForcesStore (in worker processes for the 'process' backend, as the conversion is CPU-bound, or in worker threads for
+    the 'thread' backend). The attribute-heavy traversal of length, cross-section and material always runs on a thread
+    pool. Results come back in the input order, so the AutomationIDLogger categorisation is deterministic."""
+
+    def __init__(self, model: 'StructuralModel', workers: int = 4, backend: str = 'thread'):
+        if backend not in BACKENDS:
+            raise ValueError(f'Backend {backend} not recognised, use one of {BACKENDS}')
+        self.model = model
+        self.workers = max(int(workers), 1)
+        self.backend = backend
+
+    def executor(self, backend: str) -> Executor:
+        if backend == 'process':
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    def prepare_internal_forces(self, elements_1d: List['Element1D']) -> None:
+        """Builds the model-wide ForcesStore from one store per chunk, concatenated in chunk order"""
+        chunks = chunk(elements_1d, self.workers)
+        with self.executor(self.backend) as executor:
+            stores = list(executor.map(self.model.build_forces_store, chunks, [self.model.units] * len(chunks),
+                                       [self.model.forces_envelope] * len(chunks)))
+        if any(store is None for store in stores): # NOTE: model does not implement build_forces_store()
+            self.model.forces_store = None
+            return
+        self.model.forces_store = ForcesStore.concatenate(stores)
+
+    def parse_chunk(self, elements_1d: List['Element1D']) -> List[Tuple['Column', List[str]]]:
+        return [self.model.parse_column(element_1d) for element_1d in elements_1d]
+
+    def parse(self, elements_1d: List['Element1D']) -> Iterator[Tuple['Column', List[str]]]:
+        """Parses all columns, yielding (Column, categories) in the order of elements_1d"""
+        try:
+            self.prepare_internal_forces(elements_1d)
+        except Exception as e: # NOTE: columns are then logged as forces nonconformity by parse_internal_forces()
+            print(f'Error preparing internal forces: {e}')
+        with self.executor('thread') as executor:
+            for parsed_chunk in executor.map(self.parse_chunk, chunk(elements_1d, self.workers)):
+                yield from parsed_chunk
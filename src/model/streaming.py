@@ -0,0 +1,97 @@
+import json
+import tempfile
+from typing import Iterator, Optional
+from specklepy.objects import Base
+from specklepy.objects.structural import ElementType1D
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+COLUMN_TYPES = (ElementType1D.Column.value, 'Column', 'ElementType1D.Column') # NOTE: as serialised by the connectors
+
+def is_column(obj: dict) -> bool:
+    """Whether a serialised element is a column, without deserialising it"""
+    return obj.get('type') in COLUMN_TYPES
+
+class LazyElements:
+    """Elements of a serialised model, read one at a time from the transport. Columns are deserialised in full, every
+    other element is reduced to a stub with its id and type so that its subtree is never loaded"""
+    def __init__(self, references: list, transport: AbstractTransport, serializer: BaseObjectSerializer,
+                 directory: Optional[tempfile.TemporaryDirectory] = None):
+        self.references = references
+        self.transport = transport
+        self.serializer = serializer
+        self.directory = directory # NOTE: keeps the temporary directory of the transport while elements are read
+
+    def __iter__(self) -> Iterator[Base]:
+        for obj in self.objects(self.references):
+            if is_column(obj):
+                yield self.serializer.recompose_base(obj)
+            else:
+                stub = Base()
+                stub.id = obj.get('id')
+                stub.type = obj.get('type')
+                yield stub
+
+    def objects(self, values: list) -> Iterator[dict]:
+        """Serialised objects of a (possibly chunked) list of references"""
+        for value in values:
+            if isinstance(value, dict) and value.get('speckle_type') == 'reference':
+                value = json.loads(self.transport.get_object(value['referencedId']))
+            if not isinstance(value, dict):
+                continue
+            if 'DataChunk' in value.get('speckle_type', ''):
+                yield from self.objects(value.get('data', []))
+            else:
+                yield value
+
+class StreamingReceiver:
+    """Receives a commit without deserialising the whole object tree. The serialised objects are copied from the remote
+    transport into a local (on disk) transport, then only '@Model.specs' is deserialised up front while '@Model.elements'
+    is a LazyElements, which yields deserialised columns only. Without a given local transport the objects are copied to a
+    temporary directory, which is removed by close() once the elements have been read"""
+    def __init__(self,
+                 object_id: str,
+                 remote_transport: Optional[AbstractTransport] = None,
+                 local_transport: Optional[AbstractTransport] = None,
+                 model_attribute: str = '@Model'):
+        self.object_id = object_id
+        self.remote_transport = remote_transport
+        self.directory = tempfile.TemporaryDirectory() if local_transport is None else None
+        self.local_transport = local_transport or SQLiteTransport(base_path=self.directory.name, scope='StreamingReceiver')
+        self.model_attribute = model_attribute
+        self.serializer = BaseObjectSerializer(read_transport=self.local_transport)
+
+    def get(self, value):
+        """Serialised object of a value, following references"""
+        if isinstance(value, dict) and value.get('speckle_type') == 'reference':
+            return json.loads(self.local_transport.get_object(value['referencedId']))
+        return value
+
+    def receive(self) -> Base:
+        if self.remote_transport is not None:
+            self.remote_transport.copy_object_and_children(self.object_id, self.local_transport)
+        root = json.loads(self.local_transport.get_object(self.object_id))
+        commit = Base()
+        commit.id = root.get('id')
+        serialised_model = self.get(root.get(self.model_attribute))
+        if not serialised_model:
+            return commit # NOTE: StructuralModel.load() raises for a missing model attribute
+        model = Base()
+        model.id = serialised_model.get('id')
+        if 'specs' in serialised_model:
+            model.specs = self.serializer.handle_value(self.get(serialised_model['specs']))
+        elements = serialised_model.get('elements', serialised_model.get('@elements'))
+        if elements is not None:
+            model.elements = LazyElements(self.get(elements) if isinstance(elements, dict) else elements,
+                                          self.local_transport, self.serializer, self.directory)
+        commit[self.model_attribute] = model
+        return commit
+
+    def close(self) -> None:
+        """Close and remove the temporary local transport, the received elements cannot be read afterwards"""
+        if self.directory is not None:
+            self.local_transport.close()
+            self.directory.cleanup()
+            self.directory = None
+
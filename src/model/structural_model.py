@@ -1,11 +1,17 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Tuple
 from specklepy.objects.geometry import Base
+from src.core.cross_section import SectionCache
 from src.core.structural_elements import Column
-from src.design.designer import ColumnDesigner
+from src.design.designer import ColumnDesigner, DesignGroup
+from src.design.sizing import SectionCatalogue
 from src.design.logger import AutomationIDLogger
-from src.visualizer.visualizer import ColumnVisualizer, DisplayMeshes
+from src.model.incremental import DesignHistory, fingerprint
+from src.model.parallel import ParallelParser
+from src.utils.instrumentation import Instrumentation, instrumented
+from src.utils.units import UnitContext
+from src.visualizer.visualizer import BatchColumnVisualizer, ColumnVisualizer, InstancedColumnVisualizer
 
 @dataclass
 class ModelUnits:
@@ -13,6 +19,11 @@ class ModelUnits:
     length_unit: str # NOTE: 'mm', 'm', 'cm' etc.
     force_unit: str # NOTE: 'N', 'kN' etc.
 
+    @property
+    def context(self) -> UnitContext:
+        """Compiled conversion factors, shared by all models with the same units"""
+        return UnitContext.from_units(self.length_unit, self.force_unit)
+
 class StructuralModel(ABC):
     """StructuralModel base class"""
 
@@ -22,9 +33,18 @@ class StructuralModel(ABC):
         self.automate_results: AutomationIDLogger = AutomationIDLogger() # NOTE: used to keep track of results
         self.model: 'Model' = None # NOTE: attribute of the root model object
         self.units: ModelUnits = None
+        self.forces_store: 'ForcesStore' = None # NOTE: model-wide internal forces, see prepare_internal_forces()
+        self.forces_envelope: Optional[str] = None # NOTE: 'combination' or 'element' reduces the forces while parsing
+        self.section_cache = SectionCache() # NOTE: identical profiles share one cross-section
+        self.design_history: Optional[DesignHistory] = None # NOTE: set for an incremental design, see reuse_columns()
+        self.reused_columns: List[Tuple[str, Base]] = [] # NOTE: (element id, previous commit object)
         self.columns: List['Column'] = [] # NOTE: invoked when the design mode is for columns
+        self.design_groups: List[DesignGroup] = [] # NOTE: designed columns by design signature, see design_columns()
         self.column_designer = ColumnDesigner(design_code)
         self.columns_commit = Base()
+        self.instrumentation = Instrumentation(enabled=False) # NOTE: timings and memory of the template methods
+        self.results_sender: Optional['ChunkedSender'] = None # NOTE: uploads columns_commit in chunks as it is built
+        self.include_forces = False # NOTE: result objects reference the analysis elements, forces are left out by default
 
     @abstractmethod
     def setup_model(self) -> None:
@@ -50,32 +70,75 @@ class StructuralModel(ABC):
         """Get units for appropriate conversions to SI units"""
         self.units = ModelUnits(length_unit, force_unit)
 
-    def create_column_objects(self):
-        """Template method for getting columns and parsing attributes"""
-        for column in self.filter_columns():
+    @instrumented(lambda model: {'columns': len(model.columns), 'reused_columns': len(model.reused_columns)})
+    def create_column_objects(self, workers: int = 1, backend: str = 'thread'):
+        """Template method for getting columns and parsing attributes. With more than one worker the columns are parsed
+        in parallel (see ParallelParser), results are logged in the input order either way"""
+        with self.instrumentation.span('filter_columns') as span:
+            columns = self.filter_columns()
+            span.count(columns=len(columns))
+        if self.design_history:
+            columns = self.reuse_columns(columns)
+        if workers > 1:
+            parsed_columns = ParallelParser(self, workers, backend).parse(columns)
+        else:
+            try:
+                with self.instrumentation.span('prepare_internal_forces'):
+                    self.prepare_internal_forces(columns)
+            except Exception as e: # NOTE: columns are then logged as forces nonconformity by parse_internal_forces()
+                print(f'Error preparing internal forces: {e}')
+            parsed_columns = map(self.parse_column, columns)
+        with self.instrumentation.span('parse_columns'):
+            for column, categories in parsed_columns:
+                for category in categories:
+                    getattr(self.automate_results, category).append(column.speckle_object.id)
+                self.columns.append(column)
 
-            is_designable = True
-            cross_section, material, internal_forces = None, None, None
-            length = self.parse_length(column)
+    def reuse_columns(self, elements_1d: List['Element1D']) -> List['Element1D']:
+        """Set aside the columns whose fingerprint is found in the design history. Returns the changed or new columns,
+        which are parsed and designed as usual"""
+        changed = []
+        for element_1d in elements_1d:
+            previous = self.design_history.get(self.fingerprint(element_1d))
+            if previous is None:
+                changed.append(element_1d)
+            else:
+                self.reused_columns.append((element_1d.id, previous))
+                self.automate_results.elements_selected_conformity.append(element_1d.id)
+        return changed
 
-            try:
-                cross_section = self.parse_cross_section(column)
-            except Exception:
-                is_designable = False
-                self.automate_results.elements_selected_cross_section_nonconformity.append(column.id)
-            try:
-                material = self.parse_material(column)
-            except Exception:
-                is_designable = False
-                self.automate_results.elements_selected_material_nonconformity.append(column.id)
-            try:
-                internal_forces = self.parse_internal_forces(column)
-            except Exception:
-                is_designable = False
-                self.automate_results.elements_selected_forces_nonconformity.append(column.id)
-            if is_designable:
-                self.automate_results.elements_selected_conformity.append(column.id)
-            self.columns.append(Column(column, length, cross_section, material, internal_forces, is_designable))
+    def fingerprint(self, element_1d) -> str:
+        return fingerprint(element_1d.id, self.column_designer.design_code, self.units, self.forces_envelope,
+                           self.include_forces)
+
+    def parse_column(self, element_1d) -> Tuple[Column, List[str]]:
+        """Parse the attributes of one column. Returns the Column and the AutomationIDLogger lists it belongs to, so
+        that this can run on worker threads without touching shared state"""
+        is_designable = True
+        categories = []
+        cross_section, material, internal_forces = None, None, None
+        length = self.parse_length(element_1d)
+
+        try:
+            cross_section = self.parse_cross_section(element_1d)
+        except Exception:
+            is_designable = False
+            categories.append('elements_selected_cross_section_nonconformity')
+        try:
+            material = self.parse_material(element_1d)
+        except Exception:
+            is_designable = False
+            categories.append('elements_selected_material_nonconformity')
+        try:
+            internal_forces = self.parse_internal_forces(element_1d)
+            if not len(internal_forces): # NOTE: without any station the design has no utilisation
+                raise ValueError(f'No internal forces for {element_1d.id}')
+        except Exception:
+            is_designable = False
+            categories.append('elements_selected_forces_nonconformity')
+        if is_designable:
+            categories.append('elements_selected_conformity')
+        return Column(element_1d, length, cross_section, material, internal_forces, is_designable), categories
 
     @abstractmethod
     def filter_columns(self) -> List['Element1D']:
@@ -93,30 +156,137 @@ class StructuralModel(ABC):
     def parse_material(self, element_1d) -> 'Material':
         """Parse material attribute to ensure correctness and unit conversion"""
 
+    def prepare_internal_forces(self, elements_1d: List['Element1D']) -> None:
+        """Parse the internal forces of all elements in one sweep before parse_internal_forces()"""
+        self.forces_store = self.build_forces_store(elements_1d, self.units, self.forces_envelope)
+
+    @classmethod
+    def build_forces_store(cls, elements_1d: List['Element1D'], units: ModelUnits,
+                           envelope: Optional[str] = None) -> Optional['ForcesStore']:
+        """Optional implementation to parse internal forces into a ForcesStore, optionally reduced to an envelope (see
+        ForcesStoreBuilder). Must not depend on instance state as it may run in a worker process"""
+        return None
+
     @abstractmethod
     def parse_internal_forces(self, element_1d) -> 'InternalForces':
         """Parse internal forces attribute to ensure correctness and unit conversion"""
 
-    def design_columns(self, generate_meshes: bool = False) -> None:
-        """Design of all column objects in the model"""
+    @instrumented(lambda model: {'columns': len(model.columns_commit['@Columns'])})
+    def size_columns(self, catalogue: Optional[SectionCatalogue] = None) -> None:
+        """Search the lightest catalogue section of every timber column with a length and internal forces (those in
+        elements_selected_conformity). Columns with a section are logged as passed, those without as failed"""
+        self.columns_commit['@Columns'] = []
+        columns = [column for column in self.columns if column.length and column.is_designable]
+        results = self.column_designer.design_code.size_columns(columns, catalogue or SectionCatalogue())
+        for column, result in zip(columns, results):
+            column.sizing_results = result
+            if result is None:
+                self.automate_results.elements_selected_failed.append(column.speckle_object.id)
+                continue
+            self.automate_results.elements_selected_passed.append(column.speckle_object.id)
+            sizing_results = Base()
+            sizing_results['code'] = self.column_designer.design_code.code
+            sizing_results['width (m)'] = result.width
+            sizing_results['depth (m)'] = result.depth
+            sizing_results['strengthClass'] = result.strength_class
+            sizing_results['utilisation'] = result.utilisation
+            sizing_results['weight (kg per m)'] = round(result.weight, 2)
+            result = ColumnVisualizer.result_object(column, self.include_forces)
+            result['sizingResults'] = sizing_results
+            self.columns_commit['@Columns'].append(result)
+        if self.results_sender is not None:
+            self.results_sender.submit('@Columns', self.columns_commit['@Columns'])
+
+    @instrumented(lambda model: {'columns': len(model.columns_commit['@Columns']), 'design_groups': len(model.design_groups)})
+    def design_columns(self, generate_meshes: bool = False, batch: bool = True, instancing: bool = False) -> None:
+        """Design of all column objects in the model. By default all columns are designed in one batch. With instancing,
+        meshes are shared definitions placed by transforms instead of a pair of meshes per column"""
         self.columns_commit['@Columns'] = []
+        if batch:
+            try:
+                with self.instrumentation.span('design', columns=len(self.columns)):
+                    self.column_designer.design_all(self.columns)
+            except ValueError as e: # NOTE: falls back to column-by-column design so errors are reported per column
+                print(f'Error designing columns in batch, designing column by column: {e}')
+                batch = False
+        designed_columns = []
         for column in self.columns:
             try:
-                self.column_designer.design(column)
+                if not batch:
+                    self.column_designer.design(column)
                 utilisation = getattr(column.design_results, 'utilisation', None)
                 if isinstance(utilisation, (int, float)):
                     if utilisation <= 1.0:
                         self.automate_results.elements_selected_passed.append(column.speckle_object.id)
                     elif utilisation > 1.0:
                         self.automate_results.elements_selected_failed.append(column.speckle_object.id)
-                if generate_meshes and column.design_results is not None:
-                    visualizer = ColumnVisualizer(column, self.units)
-                    reference_mesh, utilisation_mesh = visualizer.visualize()
-                    column.display_meshes = DisplayMeshes(reference_mesh, utilisation_mesh)
-                    self.columns_commit['@Columns'].append(
-                        visualizer.prepare_commit(
-                            {'code':self.column_designer.design_code.code,
-                             'serviceClass': self.column_designer.design_code.design_parameters['service_class'],
-                             'loadDurationClass': self.column_designer.design_code.design_parameters['load_duration_class']}))
+                    else: # NOTE: NaN, a column without any station of internal forces
+                        if column.speckle_object.id in self.automate_results.elements_selected_conformity:
+                            self.automate_results.elements_selected_conformity.remove(column.speckle_object.id)
+                        self.automate_results.elements_selected_forces_nonconformity.append(column.speckle_object.id)
+                        continue
+                if column.design_results is not None:
+                    designed_columns.append(column)
             except ValueError as e:
                 print(f'Error designing column {column}: {e}')
+        self.design_groups = self.column_designer.group(designed_columns)
+        self.columns_commit['@DesignGroups'] = [self.design_group_object(group) for group in self.design_groups]
+        if generate_meshes and designed_columns:
+            groups = {id(column): group.name for group in self.design_groups for column in group.columns}
+            attributes = {'code':self.column_designer.design_code.code,
+                          'serviceClass': self.column_designer.design_code.design_parameters['service_class'],
+                          'loadDurationClass': self.column_designer.design_code.design_parameters['load_duration_class']}
+            # NOTE: with a results sender, each chunk is uploaded in the background while the next one is prepared
+            chunk_size = self.results_sender.chunk_size if self.results_sender is not None else len(designed_columns)
+            with self.instrumentation.span('meshes', columns=len(designed_columns)):
+                for start in range(0, len(designed_columns), chunk_size):
+                    columns = designed_columns[start:start + chunk_size]
+                    try:
+                        commit_objects = self.commit_objects(columns, attributes, groups, instancing)
+                    except ValueError: # NOTE: only the columns that fail lose their results, column by column
+                        commit_objects = []
+                        for column in columns:
+                            try:
+                                commit_objects += self.commit_objects([column], attributes, groups, instancing)
+                            except ValueError as e:
+                                print(f'Error generating column meshes of {column.speckle_object.id}: {e}')
+                    self.columns_commit['@Columns'] += commit_objects
+                    if self.results_sender is not None:
+                        self.results_sender.submit('@Columns', commit_objects)
+        for element_id, previous in self.reused_columns:
+            if previous['designResults']['utilisation'] <= 1.0:
+                self.automate_results.elements_selected_passed.append(element_id)
+            else:
+                self.automate_results.elements_selected_failed.append(element_id)
+            # NOTE: design groups are those of the columns designed in this run, a previous name may now mean another one
+            previous['designResults']['designGroup'] = None
+            self.columns_commit['@Columns'].append(previous)
+        if self.results_sender is not None: # NOTE: the server has their meshes already, they are serialised for their ids
+            self.results_sender.submit('@Columns', [previous for _, previous in self.reused_columns])
+
+    def commit_objects(self, columns: List[Column], attributes: dict, groups: dict, instancing: bool) -> List[Base]:
+        """Result objects of designed columns with their display meshes, see design_columns()"""
+        fingerprints = [self.fingerprint(column.speckle_object) for column in columns]
+        visualizer = (InstancedColumnVisualizer if instancing else BatchColumnVisualizer)(columns, self.units)
+        commit_objects = visualizer.prepare_commit(attributes, self.include_forces)
+        for commit_object, column, key in zip(commit_objects, columns, fingerprints):
+            commit_object['designResults']['utilisation'] = column.design_results.utilisation
+            commit_object['designResults']['fingerprint'] = key # NOTE: read back by DesignHistory
+            commit_object['designResults']['designGroup'] = groups[id(column)]
+        return commit_objects
+
+    @staticmethod
+    def design_group_object(group: DesignGroup) -> Base:
+        """Summary of a design group for the results model, its columns are referenced by element id"""
+        column = group.governing_column
+        design_group = Base()
+        design_group['name'] = group.name
+        design_group['length (m)'] = column.length
+        design_group['width (m)'] = getattr(column.cross_section, 'width', None)
+        design_group['depth (m)'] = getattr(column.cross_section, 'depth', None)
+        design_group['material'] = column.material.name
+        design_group['count'] = len(group.columns)
+        design_group['utilisation'] = group.utilisation
+        design_group['governingElement'] = column.speckle_object.id
+        design_group['elements'] = [member.speckle_object.id for member in group.columns]
+        return design_group
@@ -0,0 +1,82 @@
+"""Columnar export of the design results, one row per column, to Arrow tables and Parquet files."""
+
+import numpy as np
+from typing import Dict, List, Optional, Union
+from src.design.logger import CompactLog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # NOTE: optional dependency, only needed to write the table
+    pa = pq = None
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError('Exporting design results to Arrow or Parquet requires pyarrow (pip install pyarrow)')
+
+def field_name(log: 'CalculationLog') -> str:
+    """Name of a logged value, as in the designResults of the results model"""
+    return f'{log.symbol} ({log.unit})' if log.unit != '' else log.symbol
+
+def results_columns(columns: List['Column'], design_groups: Optional[List['DesignGroup']] = None
+                    ) -> Dict[str, Union[np.ndarray, list]]:
+    """One array per field of the designed columns: element, material, section, length, every logged value, utilisation
+    and governing combination. Logged values of CompactLogs are copied one schema at a time from the rows of the batch
+    design (see Eurocode.design_columns), only eager calculation logs are read value by value"""
+    columns = [column for column in columns if column.design_results is not None]
+    results = [column.design_results for column in columns]
+    schemas, eager = {}, []
+    for i, result in enumerate(results):
+        if isinstance(result.calculation_log, CompactLog):
+            schemas.setdefault(id(result.calculation_log.schema), (result.calculation_log.schema, []))[1].append(i)
+        else:
+            eager.append(i)
+
+    fields: Dict[str, int] = {} # NOTE: field name -> column of the logged matrix, in the order of the schemas
+    for schema, _ in schemas.values():
+        for _, template in schema.entries:
+            fields.setdefault(field_name(template), len(fields))
+    for i in eager:
+        for _, logs in results[i].calculation_log.items():
+            for log in logs:
+                fields.setdefault(field_name(log), len(fields))
+
+    logged = np.full((len(columns), len(fields)), np.nan)
+    for schema, rows in schemas.values():
+        entries = {} # NOTE: of a symbol logged twice (beta_c of both axes) the first value is kept
+        for j, (_, template) in enumerate(schema.entries):
+            entries.setdefault(fields[field_name(template)], j)
+        values = np.stack([results[i].calculation_log.values for i in rows]) if rows else np.empty((0, len(schema)))
+        logged[np.ix_(rows, list(entries))] = values[:, list(entries.values())]
+    for i in eager: # NOTE: in reverse, so that the first of repeated symbols is kept here too
+        for _, logs in reversed(list(results[i].calculation_log.items())):
+            for log in reversed(logs):
+                logged[i, fields[field_name(log)]] = log.value
+
+    elements = [column.speckle_object for column in columns]
+    table = {'elementId': [element.id for element in elements],
+             'applicationId': [getattr(element, 'applicationId', None) for element in elements],
+             'name': [getattr(element, 'name', None) for element in elements],
+             'material': [element.property.material.name for element in elements],
+             'section': [getattr(element.property.profile, 'name', None) for element in elements],
+             'width (m)': np.array([getattr(column.cross_section, 'width', None) for column in columns], dtype=float),
+             'depth (m)': np.array([getattr(column.cross_section, 'depth', None) for column in columns], dtype=float),
+             'length (m)': np.array([column.length for column in columns], dtype=float)}
+    if design_groups is not None:
+        groups = {id(column): group.name for group in design_groups for column in group.columns}
+        table['designGroup'] = [groups.get(id(column)) for column in columns]
+    table.update({name: logged[:, j] for name, j in fields.items()})
+    table['utilisation'] = np.array([result.utilisation for result in results], dtype=float)
+    table['governingCombination'] = [result.governing_combination for result in results]
+    table['governingStation'] = np.array([result.governing_station for result in results], dtype=float)
+    return table
+
+def to_arrow(columns: List['Column'], design_groups: Optional[List['DesignGroup']] = None) -> 'pa.Table':
+    require_pyarrow()
+    return pa.table(results_columns(columns, design_groups))
+
+def write_parquet(path: str, columns: List['Column'], design_groups: Optional[List['DesignGroup']] = None) -> str:
+    """Design results of the columns written to a Parquet file in one columnar write"""
+    require_pyarrow()
+    pq.write_table(to_arrow(columns, design_groups), path)
+    return path
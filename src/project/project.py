@@ -1,20 +1,48 @@
+from typing import Optional
+from specklepy.transports.memory import MemoryTransport
 from specklepy.transports.server import ServerTransport
+from specklepy.transports.sqlite import SQLiteTransport
 from specklepy.api.models import Branch
 from specklepy.api.client import SpeckleClient
 from specklepy.api import operations
+from src.project.sender import ChunkedSender, SessionServerTransport
 
 class Project:
-    def __init__(self, client : 'SpeckleClient', project_id: str, model_results_name: str):
+    def __init__(self, client : 'SpeckleClient', project_id: str, model_results_name: str,
+                 transport: Optional['AbstractTransport'] = None):
         self.client = client
         self.project_id = project_id
         self.model_results_name = model_results_name
+        self.results_model: 'Branch' = None
+        self.transport = transport # NOTE: replaces the server transports, e.g. a MemoryTransport for benchmarks
 
     def get_results_model(self):
         model: 'Branch' = self.client.branch.get(self.project_id, self.model_results_name, commits_limit = 1)
         if not model:
             self.client.branch.create(stream_id=self.project_id, name=self.model_results_name)
+        self.results_model = model
 
-    def send_results_model(self, object):
-        remote_transport = ServerTransport(self.project_id, self.client)
-        hash = operations.send(base=object, transports=[remote_transport])
+    def receive_latest_results(self):
+        """The last commit to the results model, None if there is none yet"""
+        commits = getattr(getattr(self.results_model, 'commits', None), 'items', None)
+        if not commits:
+            return None
+        if self.transport is not None: # NOTE: kept out of the default local cache of the user as well
+            return operations.receive(commits[0].referencedObject, self.transport, MemoryTransport())
+        return operations.receive(commits[0].referencedObject, ServerTransport(self.project_id, self.client))
+
+    def create_sender(self, chunk_size: int = 250) -> ChunkedSender:
+        """Sender for a pipelined upload of the results model, with one HTTP session for the run and a local cache. An
+        injected transport is used without a cache"""
+        if self.transport is not None:
+            return ChunkedSender(self.transport, chunk_size=chunk_size)
+        return ChunkedSender(SessionServerTransport(self.project_id, self.client), SQLiteTransport, chunk_size)
+
+    def send_results_model(self, object, sender: Optional[ChunkedSender] = None):
+        """Send the results, through the given sender if objects were submitted to it while they were designed"""
+        if sender is not None:
+            hash = sender.send(object)
+        else:
+            remote_transport = self.transport or ServerTransport(self.project_id, self.client)
+            hash = operations.send(base=object, transports=[remote_transport], use_default_cache=self.transport is None)
         commit_id = self.client.commit.create(self.project_id, object_id=hash, branch_name=self.model_results_name)
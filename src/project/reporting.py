@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+@dataclass(frozen=True)
+class ReportCategory:
+    attribute: str # NOTE: list of AutomationIDLogger
+    level: str # NOTE: 'info' or 'warning', see attach_info_to_objects() and attach_warning_to_objects()
+    category: str # NOTE: may contain {design_mode} and {code}
+    message: str
+
+REPORT_CATEGORIES = [
+    ReportCategory('elements_not_selected', 'info', 'Elements not defined as {design_mode}',
+                   'The Design Mode targets a specific structural element. These elements were filtered out according to their type. Check element definition and assignment in the source application.'),
+    ReportCategory('elements_selected_material_nonconformity', 'info', 'Failing to parse material as timber',
+                   'These elements were found according to the given Design Mode, however, no match was found in the selected region for the defined material. This indicates either that the element(s) are not timber elements, or that the name of the material needs to be updated to match the database.'),
+    ReportCategory('elements_selected_length_nonconformity', 'info', 'Failing to parse length of element',
+                   'The length of these elements could not be parsed and converted to SI units. Check validity of object.baseLine.length.'),
+    ReportCategory('elements_selected_cross_section_nonconformity', 'info', 'Failing to parse element cross-section',
+                   "The defined cross-section of the element could not be parsed. Check validity of object.property.profile. This is currently restricted to 'Rectangular' cross-sections."),
+    ReportCategory('elements_selected_forces_nonconformity', 'info', 'Failing to parse internal forces',
+                   'The forces could not be parsed. Check that the analysis results have been sent with the model.'),
+    ReportCategory('elements_selected_passed', 'info', 'Elements passing design check according to {code}',
+                   'The elements passed the design check with a utilisation < 1.0. See results model for more information.'),
+    ReportCategory('elements_selected_failed', 'warning', 'Elements not passing design check according to {code}',
+                   'The elements did not pass the design check with a utilisation > 1.0. See results model for more information.')]
+
+@dataclass
+class CategorySummary:
+    category: str
+    level: str
+    message: str
+    count: int
+    object_ids: List[str] # NOTE: at most max_ids, spread evenly over the full list
+
+class Reporter:
+    """Reports the AutomationIDLogger lists as one result case per category, with a count and a capped sample of the
+    ids instead of every id. The full lists can be stored as a JSON file result of the run"""
+    def __init__(self,
+                 automate_context: 'AutomationContext',
+                 max_ids: int = 200,
+                 include_not_selected: bool = False,
+                 categories: List[ReportCategory] = REPORT_CATEGORIES):
+        self.automate_context = automate_context
+        self.max_ids = max_ids
+        self.include_not_selected = include_not_selected # NOTE: usually every beam, slab and brace of the model
+        self.categories = categories
+
+    def sample(self, object_ids: List[str]) -> List[str]:
+        if len(object_ids) <= self.max_ids:
+            return list(object_ids)
+        return [object_ids[i * len(object_ids) // self.max_ids] for i in range(self.max_ids)]
+
+    def summarise(self, automate_results: 'AutomationIDLogger', **names) -> List[CategorySummary]:
+        """Summaries of the non-empty categories, names fill in the category titles (design_mode and code)"""
+        summaries = []
+        for category in self.categories:
+            if category.attribute == 'elements_not_selected' and not self.include_not_selected:
+                continue
+            object_ids = getattr(automate_results, category.attribute)
+            if object_ids:
+                summaries.append(CategorySummary(category.category.format(**names), category.level, category.message,
+                                                 len(object_ids), self.sample(object_ids)))
+        return summaries
+
+    def report(self, automate_results: 'AutomationIDLogger', **names) -> List[CategorySummary]:
+        summaries = self.summarise(automate_results, **names)
+        for summary in summaries:
+            message = summary.message
+            if len(summary.object_ids) < summary.count:
+                message += f' Showing {len(summary.object_ids)} of {summary.count} elements.'
+            getattr(self.automate_context, f'attach_{summary.level}_to_objects')(
+                category=summary.category, object_ids=summary.object_ids, message=message,
+                metadata={'count': summary.count})
+        return summaries
+
+    def store_full_lists(self, automate_results: 'AutomationIDLogger', path: Optional[str] = None) -> None:
+        """Every list of the AutomationIDLogger in a JSON file, stored as a file result of the run. Without a path the
+        file is written to a temporary directory, which is removed once it is stored"""
+        lists: Dict[str, List[str]] = {name: list(object_ids) for name, object_ids in vars(automate_results).items()}
+        if path is not None:
+            self.store_file(path, lists)
+            return
+        with tempfile.TemporaryDirectory() as directory:
+            self.store_file(os.path.join(directory, 'element-ids.json'), lists)
+
+    def store_file(self, path: str, lists: Dict[str, List[str]]) -> None:
+        with open(path, 'w') as file:
+            json.dump(lists, file)
+        self.automate_context.store_file_result(path)
@@ -0,0 +1,221 @@
+import gzip
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects import Base
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.server import ServerTransport
+
+class RecordingTransport(AbstractTransport):
+    """Write transport that keeps the serialised objects of one serialisation in order"""
+    def __init__(self):
+        super().__init__()
+        self.objects: List[Tuple[str, str]] = []
+
+    @property
+    def name(self) -> str:
+        return 'RecordingTransport'
+
+    def begin_write(self) -> None:
+        pass
+
+    def end_write(self) -> None:
+        pass
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        self.objects.append((id, serialized_object))
+
+    def save_object_from_transport(self, id: str, source_transport: AbstractTransport) -> None:
+        self.save_object(id, source_transport.get_object(id))
+
+    def get_object(self, id: str) -> Optional[str]:
+        return next((obj for object_id, obj in self.objects if object_id == id), None)
+
+    def has_objects(self, id_list: List[str]) -> Dict[str, bool]:
+        ids = {object_id for object_id, _ in self.objects}
+        return {id: id in ids for id in id_list}
+
+    def copy_object_and_children(self, id: str, target_transport: AbstractTransport) -> str:
+        root = self.get_object(id)
+        if root is None:
+            raise SpeckleException(f'Could not find the object {id} in {self.name}')
+        target_transport.begin_write()
+        for child_id in json.loads(root).get('__closure', {}):
+            child = self.get_object(child_id)
+            if child is None:
+                raise SpeckleException(f'Could not find the child {child_id} of {id} in {self.name}')
+            target_transport.save_object(child_id, child)
+        target_transport.save_object(id, root)
+        target_transport.end_write()
+        return root
+
+class ReferencingSerializer(BaseObjectSerializer):
+    """BaseObjectSerializer that writes a reference to objects serialised before, given their id and closure, instead
+    of traversing them again. Objects are matched by identity and only where they are detached"""
+    def __init__(self, references: Dict[int, Tuple[str, Dict[str, int]]], **kwargs):
+        super().__init__(**kwargs)
+        self.references = references
+
+    def _traverse_base(self, base: Base) -> Tuple[str, Dict]:
+        reference = self.references.get(id(base))
+        if reference is None or not self.detach_lineage[-1]:
+            return super()._traverse_base(base)
+        obj_id, closure = reference
+        self.detach_lineage.pop()
+        # NOTE: the children at the depths _traverse_base() would have given them, the parent adds the object itself
+        depth = len(self.detach_lineage)
+        for parent in self.lineage:
+            family = self.family_tree.setdefault(parent, {})
+            for child_id, child_depth in closure.items():
+                family[child_id] = min(family.get(child_id, child_depth + depth), child_depth + depth)
+        return obj_id, {'id': obj_id}
+
+class SessionServerTransport(ServerTransport):
+    """ServerTransport that uploads on end_write() through its own HTTP session, which is kept for the whole run.
+    Errors are raised by end_write() so that a chunk can be retried (see ChunkedSender)"""
+    max_batch_size = 1_000_000 # NOTE: bytes, as the batches of ServerTransport
+
+    def begin_write(self) -> None:
+        super().begin_write()
+        self._batch: List[Tuple[str, str]] = []
+
+    def save_object(self, id: str, serialized_object: str) -> None:
+        self._batch.append((id, serialized_object))
+
+    def end_write(self) -> None:
+        batch, size = [], 0
+        for id, obj in self._batch:
+            if batch and size + len(obj) > self.max_batch_size:
+                self.post_batch(batch)
+                batch, size = [], 0
+            batch.append((id, obj))
+            size += len(obj)
+        if batch:
+            self.post_batch(batch)
+        self._batch = []
+
+    def post_batch(self, batch: List[Tuple[str, str]]) -> None:
+        ids = [id for id, _ in batch]
+        response = self.session.post(f'{self.url}/api/diff/{self.stream_id}', data={'objects': json.dumps(ids)})
+        response.raise_for_status()
+        has_objects = response.json()
+        new_objects = [obj for id, obj in batch if not has_objects.get(id)]
+        if not new_objects:
+            return
+        upload = gzip.compress(('[' + ','.join(new_objects) + ']').encode())
+        response = self.session.post(f'{self.url}/objects/{self.stream_id}',
+                                     files={'batch-1': ('batch-1', upload, 'application/gzip')})
+        if response.status_code != 201:
+            raise SpeckleException(f'Could not save the objects to the server - status code {response.status_code} '
+                                   f'({response.text[:1000]})')
+
+@dataclass
+class SendStatistics:
+    chunks: int = 0
+    objects: int = 0 # NOTE: uploaded objects, each id once
+    duplicates: int = 0 # NOTE: objects skipped as they were uploaded before in the run
+    retries: int = 0
+
+class ChunkedSender:
+    """Pipelined send of a results commit. Detached objects (the column results) are submitted in chunks while the
+    design goes on, a background thread serialises and uploads them. send() then only writes the root object, which
+    references the uploaded objects, so the result is identical to that of operations.send(). Every id is uploaded once
+    per run and a failed chunk is retried with an exponential backoff"""
+    def __init__(self,
+                 remote_transport: AbstractTransport,
+                 create_cache: Optional[Callable[[], AbstractTransport]] = None,
+                 chunk_size: int = 250,
+                 retries: int = 3,
+                 backoff: float = 1.0):
+        self.remote_transport = remote_transport
+        self.cache_transport: Optional[AbstractTransport] = None # NOTE: keeps a local copy, as operations.send()
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.backoff = backoff
+        self.statistics = SendStatistics()
+        # NOTE: one thread, so one session and chunks in order. The cache is created on it as e.g. the connection of an
+        # SQLiteTransport can only be used on the thread that created it
+        self._executor = ThreadPoolExecutor(max_workers=1, initializer=self.start_cache, initargs=(create_cache,))
+        self._chunks: Dict[str, List[Tuple[List[Base], Future]]] = {}
+        self._sent = set()
+
+    def start_cache(self, create_cache: Optional[Callable[[], AbstractTransport]]) -> None:
+        if create_cache is not None:
+            self.cache_transport = create_cache()
+
+    def submit(self, attribute: str, objects: List[Base]) -> None:
+        """Queue objects of a detached list attribute of the root, in chunks of chunk_size. The objects must not change
+        after they were submitted"""
+        for start in range(0, len(objects), self.chunk_size):
+            chunk = objects[start:start + self.chunk_size]
+            self._chunks.setdefault(attribute, []).append((chunk, self._executor.submit(self.send_chunk, chunk)))
+
+    def send_chunk(self, objects: List[Base]) -> List[Tuple[str, Dict[str, int]]]:
+        """Serialise and upload one chunk. Returns the id and closure of every object"""
+        recorder = RecordingTransport()
+        serializer = BaseObjectSerializer(write_transports=[recorder])
+        references = []
+        for obj in objects:
+            obj_id, serialized = serializer.traverse_base(obj)
+            references.append((obj_id, serialized.get('__closure', {})))
+        self.upload(recorder.objects)
+        return references
+
+    def upload(self, objects: List[Tuple[str, str]]) -> None:
+        new_objects = {}
+        for id, obj in objects:
+            if id not in self._sent:
+                new_objects[id] = obj
+        self.statistics.duplicates += len(objects) - len(new_objects)
+        if not new_objects:
+            return
+        transports = [self.remote_transport] + ([self.cache_transport] if self.cache_transport is not None else [])
+        for attempt in range(self.retries + 1):
+            try:
+                for transport in transports:
+                    transport.begin_write()
+                    for id, obj in new_objects.items():
+                        transport.save_object(id, obj)
+                    transport.end_write()
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                self.statistics.retries += 1
+                print(f'Error uploading chunk, retrying: {e}')
+                time.sleep(self.backoff * 2 ** attempt)
+        self._sent.update(new_objects)
+        self.statistics.chunks += 1
+        self.statistics.objects += len(new_objects)
+
+    def send(self, base: Base) -> str:
+        """Send the root object and return its id. Submitted attributes are only referenced, other attributes are
+        serialised as usual. Falls back to a full serialisation if a submitted attribute has changed since"""
+        references = {} # NOTE: id() of a submitted object -> its id and closure
+        for attribute, chunks in self._chunks.items():
+            results = [future.result() for _, future in chunks] # NOTE: raises if a chunk could not be uploaded
+            submitted = [obj for chunk, _ in chunks for obj in chunk]
+            value = getattr(base, attribute, None) or []
+            if len(value) != len(submitted) or any(a is not b for a, b in zip(value, submitted)):
+                print(f'{attribute} has changed since it was submitted, sending it in full')
+                continue
+            for (chunk, _), chunk_references in zip(chunks, results):
+                references.update(zip(map(id, chunk), chunk_references))
+
+        recorder = RecordingTransport()
+        root_id, _ = ReferencingSerializer(references, write_transports=[recorder]).traverse_base(base)
+        objects = recorder.objects
+        self._executor.submit(self.finish, objects).result()
+        self._executor.shutdown()
+        return root_id
+
+    def finish(self, objects: List[Tuple[str, str]]) -> None:
+        """Upload the last objects and close the cache, on the upload thread"""
+        self.upload(objects)
+        if self.cache_transport is not None and hasattr(self.cache_transport, 'close'):
+            self.cache_transport.close()
+        self.cache_transport = None
@@ -0,0 +1,116 @@
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+try:
+    import resource
+except ImportError: # NOTE: not available on Windows, peak RSS is then not recorded
+    resource = None
+
+@dataclass
+class Span:
+    """Measurements of one stage. Peak RSS is that of the process up to the end of the stage, the peak of traced
+    allocations (with trace_allocations) that within the stage"""
+    name: str # NOTE: '/'-separated path of the enclosing stages
+    wall_time: float = 0.0 # NOTE: s
+    cpu_time: float = 0.0 # NOTE: s, of the whole process including worker threads
+    peak_rss: Optional[float] = None # NOTE: MB
+    peak_allocated: Optional[float] = None # NOTE: MB
+    counts: Dict[str, int] = field(default_factory=dict)
+    _peak_seen: int = field(default=0, repr=False)
+
+    def count(self, **counts: int) -> None:
+        self.counts.update(counts)
+
+class _DisabledSpan:
+    """Shared span of a disabled Instrumentation, every call is a no-op"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def count(self, **counts: int) -> None:
+        pass
+
+DISABLED_SPAN = _DisabledSpan()
+
+class Instrumentation:
+    """Wall time, CPU time, memory and element counts per stage of a run. Stages are entered with span() and may be
+    nested. When disabled, span() returns a shared no-op, so instrumented code costs a method call per stage"""
+    def __init__(self, enabled: bool = True, trace_allocations: bool = False):
+        self.enabled = enabled
+        self.trace_allocations = trace_allocations # NOTE: tracemalloc slows down allocation heavy code noticeably
+        self.spans: List[Span] = []
+        self._stack: List[Span] = []
+
+    def span(self, name: str, **counts: int):
+        if not self.enabled:
+            return DISABLED_SPAN
+        return _SpanContext(self, name, counts)
+
+    def report(self) -> List[dict]:
+        return [{key: value for key, value in asdict(span).items() if not key.startswith('_')} for span in self.spans]
+
+    def to_json(self) -> str:
+        return json.dumps(self.report(), indent=2)
+
+    def summary(self) -> str:
+        """Wall times of the top-level stages, for the status message of a run"""
+        stages = [f'{span.name} {span.wall_time:.2f} s' for span in self.spans if '/' not in span.name]
+        return f'Timings: {", ".join(stages)}.' if stages else ''
+
+class _SpanContext:
+    def __init__(self, instrumentation: Instrumentation, name: str, counts: Dict[str, int]):
+        self.instrumentation = instrumentation
+        stack = instrumentation._stack
+        self.span = Span(f'{stack[-1].name}/{name}' if stack else name, counts=dict(counts))
+        self.started_tracing = False
+
+    def __enter__(self) -> Span:
+        instrumentation = self.instrumentation
+        if instrumentation.trace_allocations:
+            if not tracemalloc.is_tracing(): # NOTE: traced for the outermost span only, stopped when it ends
+                tracemalloc.start()
+                self.started_tracing = True
+            if instrumentation._stack: # NOTE: keeps the peak of the enclosing stage before it is reset
+                parent = instrumentation._stack[-1]
+                parent._peak_seen = max(parent._peak_seen, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        instrumentation._stack.append(self.span)
+        instrumentation.spans.append(self.span)
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        return self.span
+
+    def __exit__(self, *exc) -> bool:
+        instrumentation, span = self.instrumentation, self.span
+        span.wall_time = time.perf_counter() - self.wall
+        span.cpu_time = time.process_time() - self.cpu
+        if resource is not None:
+            span.peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # NOTE: KB on Linux
+        instrumentation._stack.pop()
+        if instrumentation.trace_allocations:
+            peak = max(span._peak_seen, tracemalloc.get_traced_memory()[1])
+            span.peak_allocated = peak / 1024 ** 2
+            if instrumentation._stack:
+                parent = instrumentation._stack[-1]
+                parent._peak_seen = max(parent._peak_seen, peak)
+            if self.started_tracing:
+                tracemalloc.stop()
+        return False
+
+def instrumented(counts: Optional[Callable[[object], Dict[str, int]]] = None):
+    """Decorator for methods of objects with an instrumentation attribute, the method runs in a span of its name.
+    counts, called with the object after the method, gives the element counts of the span"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.span(method.__name__) as span:
+                result = method(self, *args, **kwargs)
+                if counts is not None and self.instrumentation.enabled:
+                    span.count(**counts(self))
+                return result
+        return wrapper
+    return decorator
@@ -1,14 +1,24 @@
+import numpy as np
 from specklepy.objects.geometry import Mesh
 from specklepy.objects.other import RenderMaterial
 
-def trimesh_to_speckle_mesh(mesh: 'trimesh.Trimesh', opacity: float, color: 'Color'):
-    vertices = [item for sublist in mesh.vertices for item in sublist]
-    faces, colors = [], []
-    for face in mesh.faces:
-        faces.append(3)
-        for vertex in face:
-            faces.append(int(vertex))
-            colors.append(color.value)
-    mesh = Mesh.create(faces=faces, vertices=vertices)
+def trimesh_to_speckle_mesh(mesh: 'trimesh.Trimesh', opacity: float, color: 'Color', vertex_colors: bool = False):
+    return arrays_to_speckle_mesh(mesh.vertices, mesh.faces, opacity, color, vertex_colors)
+
+def arrays_to_speckle_mesh(vertices: np.ndarray,
+                           faces: np.ndarray,
+                           opacity: float,
+                           color: 'Color',
+                           vertex_colors: bool = False):
+    """Speckle mesh from a (n, 3) vertex array and a (m, 3) triangle array. Faces are encoded as [3, i, j, k, ...] in one
+    step, per-vertex colors are only emitted when requested as the render material already carries the color"""
+    faces = np.asarray(faces)
+    encoded_faces = np.empty((len(faces), 4), dtype=np.int64)
+    encoded_faces[:, 0] = 3
+    encoded_faces[:, 1:] = faces
+    vertices = np.asarray(vertices, dtype=float).ravel()
+    mesh = Mesh.create(faces=encoded_faces.ravel().tolist(),
+                       vertices=vertices.tolist(),
+                       colors=[color.value] * (len(vertices) // 3) if vertex_colors else None)
     mesh['renderMaterial'] = RenderMaterial(opacity=opacity, diffuse=color.value, emissive=color.value)
-    return mesh
\ No newline at end of file
+    return mesh
@@ -1,3 +1,39 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
+
+PRESSURE_CONVERSION_FACTORS = {
+    'N/mm²': 1e6, # MPa to Pa
+    'N/cm²': 1e4, # N/cm² to Pa
+    'N/m²' : 1, # Pa is the base unit
+    'psi': 6894.76, # psi to Pa
+    'psf': 47.8803 # psf to Pa
+}
+
+FORCE_CONVERSION_FACTORS = {
+    'N': 1,  # Newton is the base unit
+    'kN': 1e3,  # Kilonewtons to Newtons
+    'MN': 1e6,  # Meganewtons to Newtons
+    'lbf': 4.44822,  # Pound-force to Newtons
+    'tonf': 8896.44,  # Ton-force to Newtons
+    'kgf': 9.80665  # Kilogram-force to Newtons
+}
+
+LENGTH_CONVERSION_FACTORS = {
+    'm': 1,  # Meter is the base unit
+    'mm': 0.001,  # Millimeters to meters
+    'cm': 0.01,  # Centimeters to meters
+    'km': 1000,  # Kilometers to meters
+    'in': 0.0254,  # Inches to meters
+    'ft': 0.3048,  # Feet to meters
+    'yd': 0.9144,  # Yards to meters
+    'mile': 1609.34  # Miles to meters
+}
+
+AREA_CONVERSION_FACTORS = {unit: factor**2 for unit, factor in LENGTH_CONVERSION_FACTORS.items()}
+
+MOMENT_OF_INERTIA_CONVERSION_FACTORS = {unit: factor**4 for unit, factor in LENGTH_CONVERSION_FACTORS.items()}
+
 class Convert:
     """The project works exclusively with SI units. This class helps with conversions."""
 
@@ -22,82 +58,57 @@ class Convert:
     @staticmethod
     def pressure(*values, input_unit: str = 'N/mm²'):
         """Converts a list of pressure units to SI units (Pascals, N/m²)"""
-        pressure_conversion_factors = {
-            'N/mm²': 1e6, # MPa to Pa
-            'N/cm²': 1e4, # N/cm² to Pa
-            'N/m²' : 1, # Pa is the base unit
-            'psi': 6894.76, # psi to Pa
-            'psf': 47.8803 # psf to Pa
-        }
-
-        return Convert._convert_units(values, input_unit, pressure_conversion_factors)
+        return Convert._convert_units(values, input_unit, PRESSURE_CONVERSION_FACTORS)
 
     @staticmethod
     def force(*values, input_unit: str = 'kN'):
         """
         Converts a list of force units to SI units (Newtons, N)
         """
-        force_conversion_factors = {
-            'N': 1,  # Newton is the base unit
-            'kN': 1e3,  # Kilonewtons to Newtons
-            'MN': 1e6,  # Meganewtons to Newtons
-            'lbf': 4.44822,  # Pound-force to Newtons
-            'tonf': 8896.44,  # Ton-force to Newtons
-            'kgf': 9.80665  # Kilogram-force to Newtons
-        }
-
-        return Convert._convert_units(values, input_unit, force_conversion_factors)
+        return Convert._convert_units(values, input_unit, FORCE_CONVERSION_FACTORS)
 
     @staticmethod
     def length(*values, input_unit: str = 'm'):
         """
         Converts a list of length units to SI units (meters, m)
         """
-        length_conversion_factors = {
-            'm': 1,  # Meter is the base unit
-            'mm': 0.001,  # Millimeters to meters
-            'cm': 0.01,  # Centimeters to meters
-            'km': 1000,  # Kilometers to meters
-            'in': 0.0254,  # Inches to meters
-            'ft': 0.3048,  # Feet to meters
-            'yd': 0.9144,  # Yards to meters
-            'mile': 1609.34  # Miles to meters
-        }
-
-        return Convert._convert_units(values, input_unit, length_conversion_factors)
+        return Convert._convert_units(values, input_unit, LENGTH_CONVERSION_FACTORS)
 
     @staticmethod
     def area(*values, input_unit: str = 'm'):
         """
         Converts a list of area units to SI units (meters, m²)
         """
-        length_conversion_factors = {
-            'm': 1,  # Meter is the base unit
-            'mm': 0.001**2,  # Millimeters to meters
-            'cm': 0.01**2,  # Centimeters to meters
-            'km': 1000**2,  # Kilometers to meters
-            'in': 0.0254**2,  # Inches to meters
-            'ft': 0.3048**2,  # Feet to meters
-            'yd': 0.9144**2,  # Yards to meters
-            'mile': 1609.34**2  # Miles to meters
-        }
-
-        return Convert._convert_units(values, input_unit, length_conversion_factors)
+        return Convert._convert_units(values, input_unit, AREA_CONVERSION_FACTORS)
 
     @staticmethod
     def moment_of_inertia(*values, input_unit: str = 'm'):
         """
         Converts a list of area units to SI units (meters, m²)
         """
-        length_conversion_factors = {
-            'm': 1,  # Meter is the base unit
-            'mm': 0.001**4,  # Millimeters to meters
-            'cm': 0.01**4,  # Centimeters to meters
-            'km': 1000**4,  # Kilometers to meters
-            'in': 0.0254**4,  # Inches to meters
-            'ft': 0.3048**4,  # Feet to meters
-            'yd': 0.9144**4,  # Yards to meters
-            'mile': 1609.34**4  # Miles to meters
-        }
-
-        return Convert._convert_units(values, input_unit, length_conversion_factors)
+        return Convert._convert_units(values, input_unit, MOMENT_OF_INERTIA_CONVERSION_FACTORS)
+
+@dataclass(frozen=True)
+class UnitContext:
+    """Conversion factors to SI units for one pair of model units, combined and computed once. Fetch it once per model
+    and multiply scalars or whole arrays, instead of a Convert call per value"""
+    length: float
+    force: float
+    moment: float # NOTE: force × length
+    area: float
+    moment_of_inertia: float
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def from_units(length_unit: str, force_unit: str) -> 'UnitContext':
+        length = Convert.length(1, input_unit=length_unit)
+        force = Convert.force(1, input_unit=force_unit)
+        return UnitContext(length=length,
+                           force=force,
+                           moment=force * length,
+                           area=Convert.area(1, input_unit=length_unit),
+                           moment_of_inertia=Convert.moment_of_inertia(1, input_unit=length_unit))
+
+    def to_si(self, values, quantity: str) -> np.ndarray:
+        """Vectorised conversion of an array of values of the given quantity (length, force, moment, area...)"""
+        return np.asarray(values, dtype=float) * getattr(self, quantity)
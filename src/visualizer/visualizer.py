@@ -1,10 +1,15 @@
+import math
 from dataclasses import dataclass
+from typing import Dict, List
 import trimesh
 import numpy as np
-from specklepy.objects.geometry import Base
+from specklepy.objects.geometry import Base, Point
+from specklepy.objects.other import BlockDefinition, BlockInstance, Transform
 from src.utils.colors import Color
-from src.utils.units import Convert
-from src.utils.mesh import trimesh_to_speckle_mesh
+from src.utils.mesh import trimesh_to_speckle_mesh, arrays_to_speckle_mesh
+
+BOX_VERTICES = np.array(trimesh.creation.box((1, 1, 1)).vertices) # NOTE: unit box centred at the origin
+BOX_FACES = np.array(trimesh.creation.box((1, 1, 1)).faces)
 
 @dataclass
 class DisplayMeshes:
@@ -14,18 +19,12 @@ class DisplayMeshes:
 class ColumnVisualizer:
     def __init__(self, column: 'Column', units: 'ModelUnits'):
         self.column = column
-        self.start_point = np.array([
-            Convert.length(column.speckle_object.baseLine.start.x, input_unit=units.length_unit),
-            Convert.length(column.speckle_object.baseLine.start.y, input_unit=units.length_unit),
-            Convert.length(column.speckle_object.baseLine.start.z, input_unit=units.length_unit)
-        ])
-        self.end_point = np.array([
-            Convert.length(column.speckle_object.baseLine.end.x, input_unit=units.length_unit),
-            Convert.length(column.speckle_object.baseLine.end.y, input_unit=units.length_unit),
-            Convert.length(column.speckle_object.baseLine.end.z, input_unit=units.length_unit)
-        ])
-        self.width = Convert.length(column.speckle_object.property.profile.width, input_unit=units.length_unit)
-        self.depth = Convert.length(column.speckle_object.property.profile.depth, input_unit=units.length_unit)
+        factor = units.context.length
+        base_line = column.speckle_object.baseLine
+        self.start_point = np.array([base_line.start.x, base_line.start.y, base_line.start.z], dtype=float) * factor
+        self.end_point = np.array([base_line.end.x, base_line.end.y, base_line.end.z], dtype=float) * factor
+        self.width = float(column.speckle_object.property.profile.width * factor)
+        self.depth = float(column.speckle_object.property.profile.depth * factor)
         self.utilisation = column.design_results.utilisation
 
     def sort_line_orientation(self):
@@ -82,20 +81,156 @@ class ColumnVisualizer:
         utilisation_mesh = trimesh_to_speckle_mesh(self.create_utilisation_mesh(), 1, Color.Success if self.utilisation < 1.0 else Color.Danger)
         return column_mesh, utilisation_mesh
 
-    def prepare_commit(self, attributes: dict):
-        self.column.speckle_object.displayValue = self.column.display_meshes.reference
+    def prepare_commit(self, attributes: dict, include_forces: bool = False):
+        return self.commit_object(self.column, attributes, include_forces)
+
+    @staticmethod
+    def result_object(column: 'Column', include_forces: bool = False) -> Base:
+        """Compact result object of a column. The analysis element is referenced by its id instead of being sent again,
+        its internal forces (every combination and station) are only included on request"""
+        element = column.speckle_object
+        result = Base()
+        result.applicationId = getattr(element, 'applicationId', None)
+        result['elementId'] = element.id
+        result['name'] = getattr(element, 'name', None)
+        result['section'] = getattr(element.property.profile, 'name', None)
+        result['material'] = element.property.material.name
+        result['width (m)'] = getattr(column.cross_section, 'width', None)
+        result['depth (m)'] = getattr(column.cross_section, 'depth', None)
+        result['length (m)'] = column.length
+        if include_forces and hasattr(element, 'AnalysisResults'):
+            result['@AnalysisResults'] = element.AnalysisResults
+        return result
+
+    @staticmethod
+    def commit_object(column: 'Column', attributes: dict, include_forces: bool = False) -> Base:
+        result = ColumnVisualizer.result_object(column, include_forces)
+        result.displayValue = column.display_meshes.reference
         designResults = Base()
         for key, value in attributes.items():
             designResults[key] = value
-        for section, calculations_steps in self.column.design_results.calculation_log.items():
+        for section, calculations_steps in column.design_results.calculation_log.items():
             designResults[section] = {}
             for step in calculations_steps:
                 if step.unit != '':
                     designResults[section][f'{step.symbol} ({step.unit})'] = round(step.value, 2)
                 else:
                     designResults[section][step.symbol] = round(step.value, 2)
-        designResults.displayValue = self.column.display_meshes.utilisation
-        self.column.speckle_object['designResults'] = designResults
-        for to_remove in ['baseLine', 'end1Node', 'end2Node', 'end1Offset', 'end2Offset', 'StiffnessModifiers', 'end1Releases', 'end2Releases']:
-            delattr(self.column.speckle_object, to_remove)
-        return self.column.speckle_object
\ No newline at end of file
+        if column.design_results.governing_combination is not None:
+            designResults['governingCombination'] = column.design_results.governing_combination
+            station = column.design_results.governing_station
+            if station is not None and math.isfinite(station): # NOTE: NaN for an envelope per element, not valid JSON
+                designResults['governingStation'] = station
+        designResults.displayValue = column.display_meshes.utilisation
+        result['designResults'] = designResults
+        return result
+
+class BatchColumnVisualizer:
+    """Reference and utilisation meshes for many columns at once. The 8 vertices of every box are generated from arrays
+    of start points, end points, widths, depths and utilisations, without a trimesh object per column. The geometry is
+    the same as that of ColumnVisualizer"""
+    def __init__(self, columns: List['Column'], units: 'ModelUnits'):
+        self.columns = columns
+        units = units.context
+        base_lines = [column.speckle_object.baseLine for column in columns]
+        profiles = [column.speckle_object.property.profile for column in columns]
+        self.start_points = units.to_si([[line.start.x, line.start.y, line.start.z] for line in base_lines], 'length').reshape(-1, 3)
+        self.end_points = units.to_si([[line.end.x, line.end.y, line.end.z] for line in base_lines], 'length').reshape(-1, 3)
+        self.widths = units.to_si([profile.width for profile in profiles], 'length')
+        self.depths = units.to_si([profile.depth for profile in profiles], 'length')
+        self.utilisations = np.array([column.design_results.utilisation for column in columns], dtype=float)
+        self.sort_line_orientation()
+
+    def sort_line_orientation(self):
+        flipped = self.start_points[:, 2] > self.end_points[:, 2]
+        self.start_points[flipped], self.end_points[flipped] = self.end_points[flipped], self.start_points[flipped]
+
+    def rotation_matrices(self, directions: np.ndarray) -> np.ndarray:
+        """Rotations from the z-axis onto each direction, computed in bulk the same way as trimesh.geometry.align_vectors"""
+        def orthonormal_basis(vectors):
+            basis = np.linalg.svd(vectors[..., np.newaxis])[0]
+            basis[np.linalg.det(basis) < 0, :, -1] *= -1.0
+            return basis
+        z_axis_basis = orthonormal_basis(np.array([[0.0, 0.0, 1.0]]))[0]
+        return orthonormal_basis(directions) @ z_axis_basis.T
+
+    def boxes(self, lengths: np.ndarray, offsets: np.ndarray, origins: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+        """(n, 8, 3) vertices of boxes with the given lengths, offset along the local z-axis, rotated and translated"""
+        extents = np.stack([self.widths, self.depths, lengths], axis=1)
+        vertices = BOX_VERTICES[np.newaxis] * extents[:, np.newaxis]
+        vertices[:, :, 2] += offsets[:, np.newaxis]
+        return np.einsum('nij,nkj->nki', rotations, vertices) + origins[:, np.newaxis]
+
+    def visualize(self) -> List[DisplayMeshes]:
+        directions = self.end_points - self.start_points
+        lengths = np.linalg.norm(directions, axis=1)
+        rotations = self.rotation_matrices(directions)
+        midpoints = (self.start_points + self.end_points) / 2
+        column_boxes = self.boxes(lengths, np.zeros(len(lengths)), midpoints, rotations)
+        utilisation_lengths = np.minimum(self.utilisations, 1.0) * lengths # NOTE: Cap utilisation at 1.0
+        utilisation_boxes = self.boxes(utilisation_lengths, utilisation_lengths / 2, self.start_points, rotations)
+        display_meshes = []
+        for column_box, utilisation_box, utilisation in zip(column_boxes, utilisation_boxes, self.utilisations):
+            display_meshes.append(DisplayMeshes(
+                arrays_to_speckle_mesh(column_box, BOX_FACES, 0.1, Color.Highlight),
+                arrays_to_speckle_mesh(utilisation_box, BOX_FACES, 1, Color.Success if utilisation < 1.0 else Color.Danger)))
+        return display_meshes
+
+    def prepare_commit(self, attributes: dict, include_forces: bool = False) -> List[Base]:
+        commit_objects = []
+        for column, display_meshes in zip(self.columns, self.visualize()):
+            column.display_meshes = display_meshes
+            commit_objects.append(ColumnVisualizer.commit_object(column, attributes, include_forces))
+        return commit_objects
+
+class InstancedColumnVisualizer(BatchColumnVisualizer):
+    """Column meshes as instances of shared definitions. Reference boxes share one definition per (width, depth, length)
+    and utilisation boxes one per (width, depth, quantised utilisation), each placed by a transform. As identical
+    definitions hash to the same id, they are serialised and uploaded once instead of once per column"""
+    def __init__(self, columns: List['Column'], units: 'ModelUnits', utilisation_step: float = 0.01):
+        super().__init__(columns, units)
+        self.utilisation_step = utilisation_step
+        self.definitions: Dict[tuple, BlockDefinition] = {}
+
+    def definition(self, key: tuple, extents: np.ndarray, offset: float, opacity: float, color: 'Color') -> BlockDefinition:
+        if key not in self.definitions:
+            vertices = BOX_VERTICES * extents
+            vertices[:, 2] += offset
+            self.definitions[key] = BlockDefinition(name='_'.join(str(part) for part in key),
+                                                    basePoint=Point(x=0.0, y=0.0, z=0.0),
+                                                    geometry=[arrays_to_speckle_mesh(vertices, BOX_FACES, opacity, color)])
+        return self.definitions[key]
+
+    @staticmethod
+    def transforms(rotations: np.ndarray, scales: np.ndarray, origins: np.ndarray) -> np.ndarray:
+        """(n, 4, 4) transforms that scale along the local z-axis, rotate and then translate"""
+        matrices = np.zeros((len(rotations), 4, 4))
+        matrices[:, :3, :3] = rotations
+        matrices[:, :3, 2] *= scales[:, np.newaxis]
+        matrices[:, :3, 3] = origins
+        matrices[:, 3, 3] = 1.0
+        return matrices
+
+    def visualize(self) -> List[DisplayMeshes]:
+        directions = self.end_points - self.start_points
+        lengths = np.round(np.linalg.norm(directions, axis=1), 6)
+        widths, depths = np.round(self.widths, 6), np.round(self.depths, 6)
+        rotations = self.rotation_matrices(directions)
+        reference_transforms = self.transforms(rotations, np.ones(len(lengths)), (self.start_points + self.end_points) / 2)
+        utilisation_transforms = self.transforms(rotations, lengths, self.start_points) # NOTE: definitions have unit length
+        quantised_utilisations = np.round(np.round(np.minimum(self.utilisations, 1.0) / self.utilisation_step)
+                                          * self.utilisation_step, 6)
+        display_meshes = []
+        for i, utilisation in enumerate(self.utilisations):
+            passed = bool(utilisation < 1.0)
+            reference = self.definition(('Reference', widths[i], depths[i], lengths[i]),
+                                        np.array([widths[i], depths[i], lengths[i]]), 0.0, 0.1, Color.Highlight)
+            utilisation_definition = self.definition(
+                ('Utilisation', widths[i], depths[i], quantised_utilisations[i], 'Passed' if passed else 'Failed'),
+                np.array([widths[i], depths[i], quantised_utilisations[i]]), quantised_utilisations[i] / 2, 1,
+                Color.Success if passed else Color.Danger)
+            display_meshes.append(DisplayMeshes(
+                BlockInstance(definition=reference, transform=Transform.from_list(reference_transforms[i].ravel().tolist())),
+                BlockInstance(definition=utilisation_definition,
+                              transform=Transform.from_list(utilisation_transforms[i].ravel().tolist()))))
+        return display_meshes
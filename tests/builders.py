@@ -0,0 +1,47 @@
+"""Builders of columns and models shared by the tests."""
+
+import os, sys
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from specklepy.api import operations
+from specklepy.transports.memory import MemoryTransport
+from benchmarks.synthetic import create_model
+from src.core.cross_section import RectangularSection
+from src.core.internal_forces import InternalForces
+from src.core.materials import MaterialFactory
+from src.core.structural_elements import Column
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+
+def create_column(width, depth, length, material_name, axial_force, bending=()):
+    """Column without a model, the speckle object only carries what the design reads"""
+    cross_section = RectangularSection(width, depth, width * depth, (width * depth ** 3 / 12), (depth * width ** 3 / 12))
+    material = MaterialFactory.get_material('Britain', material_name)
+    internal_forces = InternalForces(data=[{'result_case': 'Dummy', 'station': 0, 'axial_force': -axial_force},
+                                           {'result_case': 'Dummy', 'station': 1, 'axial_force': -axial_force / 2}] +
+                                          [{'result_case': f'Bending {i}', 'station': 0.5, 'axial_force': -axial_force / 2,
+                                            'bending_y': bending_y, 'bending_z': bending_z}
+                                           for i, (bending_y, bending_z) in enumerate(bending)])
+    speckle_object = SimpleNamespace(property=SimpleNamespace(material=SimpleNamespace(name=material_name)))
+    return Column(speckle_object, length, cross_section, material, internal_forces, True)
+
+def received_model(changed_columns=()):
+    """A synthetic model after a send and receive, so that every element carries its Speckle id"""
+    commit = create_model(columns=10, beams=3, slabs=1)
+    for i in changed_columns:
+        commit['@Model'].elements[i].property.profile.width *= 1.5
+    transport = MemoryTransport()
+    return operations.receive(operations.send(commit, [transport], use_default_cache=False), local_transport=transport)
+
+def design(commit, design_history=None, results_sender=None, forces_envelope=None):
+    model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.setup_model()
+    model.forces_envelope = forces_envelope
+    model.design_history = design_history
+    model.results_sender = results_sender
+    model.create_column_objects()
+    model.design_columns(generate_meshes=True)
+    return model
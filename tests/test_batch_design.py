@@ -0,0 +1,94 @@
+import os, sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from specklepy.api import operations
+from specklepy.transports.memory import MemoryTransport
+from benchmarks.synthetic import create_model
+from src.design.designer import ColumnDesigner
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+from tests.builders import create_column
+
+def flatten_log(calculation_log):
+    return [(section, log.symbol, log.value, log.unit, log.code, log.note)
+            for section, logs in calculation_log.items() for log in logs]
+
+def test_batch_matches_scalar():
+    columns = [create_column(0.16, 0.32, 5.0, 'GL28c', 180e3),
+               create_column(0.14, 0.14, 2.85, 'C24', 65.2e3, [(1e3, -0.5e3), (-2e3, 0.2e3)]),
+               create_column(0.2, 0.2, 3.5, 'C16', 250e3, [(5e3, 5e3)]),
+               create_column(0.24, 0.36, 4.2, 'GL32h', 900e3, [(0.0, 0.0), (40e3, -12e3), (-40e3, 12e3)])]
+    design_code = Eurocode({'service_class': 1, 'load_duration_class': 'Short term'})
+
+    batch_results = design_code.design_columns(columns)
+
+    for column, batch_result in zip(columns, batch_results):
+        scalar_result = design_code.design_column(column)
+        assert batch_result.utilisation == scalar_result.utilisation
+        assert batch_result.governing_combination == scalar_result.governing_combination
+        assert batch_result.governing_station == scalar_result.governing_station
+        assert flatten_log(batch_result.calculation_log) == flatten_log(scalar_result.calculation_log)
+
+def test_log_levels():
+    columns = [create_column(0.16, 0.32, 5.0, 'GL28c', 180e3), create_column(0.14, 0.14, 2.85, 'C24', 65.2e3)]
+    full = Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}).design_columns(columns)
+
+    for log_level, symbols in [('summary', ['b', 'h', 'l', 'k_c,min', 'R_d', 'E_d', 'eta']), ('none', [])]:
+        design_code = Eurocode({'service_class': 1, 'load_duration_class': 'Permanent', 'log_level': log_level})
+        for column, full_result, batch_result in zip(columns, full, design_code.design_columns(columns)):
+            scalar_result = design_code.design_column(column)
+            expected = [log for log in flatten_log(full_result.calculation_log) if log[1] in symbols]
+            assert batch_result.utilisation == scalar_result.utilisation == full_result.utilisation
+            assert flatten_log(batch_result.calculation_log) == flatten_log(scalar_result.calculation_log) == expected
+
+def test_combined_check_finds_governing_combination():
+    axial_only = create_column(0.2, 0.2, 3.5, 'C24', 100e3)
+    combined = create_column(0.2, 0.2, 3.5, 'C24', 100e3, [(2e3, 0.0), (8e3, 1e3), (-8e3, -1e3)])
+    design_code = Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'})
+
+    axial_only_result, combined_result = design_code.design_columns([axial_only, combined])
+
+    assert (axial_only_result.governing_combination, axial_only_result.governing_station) == ('Dummy', 0.0)
+    assert (combined_result.governing_combination, combined_result.governing_station) == ('Bending 1', 0.5)
+    logs = {log.symbol: log.value for logs in combined_result.calculation_log.items() for log in logs[1]}
+    f_m_d = 0.6 / 1.3 * 24e6
+    sigma_m_y, sigma_m_z = 8e3 / (0.2 ** 3 / 6), 1e3 / (0.2 ** 3 / 6)
+    assert abs(logs['eta_y'] - (logs['E_d'] / (logs['k_c,y'] * 0.6 / 1.3 * 21e6) + (sigma_m_y + 0.7 * sigma_m_z) / f_m_d)) < 1e-9
+    assert combined_result.utilisation == round(max(logs['eta_y'], logs['eta_z']), 3) > axial_only_result.utilisation
+
+def test_design_groups():
+    columns = [create_column(0.2, 0.2, 3.5, 'C24', 100e3), create_column(0.14, 0.14, 2.85, 'C24', 65.2e3),
+               create_column(0.2, 0.2, 3.5, 'C24', 150e3, [(8e3, 1e3)]), create_column(0.2, 0.2, 3.5, 'C16', 100e3),
+               create_column(0.14, 0.14, 2.85, 'C24', 30e3)]
+    design_code = Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'})
+    designer = ColumnDesigner(design_code)
+
+    designer.design_all(columns)
+    groups = designer.group(columns)
+
+    assert [(group.name, [columns.index(column) for column in group.columns]) for group in groups] == [
+        ('DG1', [0, 2]), ('DG2', [1, 4]), ('DG3', [3])]
+    assert groups[0].governing_column is columns[2] and groups[1].governing_column is columns[1]
+    for column in columns:
+        scalar_result = design_code.design_column(column)
+        assert column.design_results.utilisation == scalar_result.utilisation
+        assert flatten_log(column.design_results.calculation_log) == flatten_log(scalar_result.calculation_log)
+
+def test_column_without_forces_is_a_forces_nonconformity():
+    commit = create_model(columns=4, beams=1)
+    commit['@Model'].elements[1].AnalysisResults.resultsByLoadCombination = []
+    transport = MemoryTransport()
+    commit = operations.receive(operations.send(commit, [transport], use_default_cache=False), local_transport=transport)
+    model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.setup_model()
+    model.create_column_objects()
+    model.design_columns(generate_meshes=True)
+
+    element_id = commit['@Model'].elements[1].id
+    assert model.automate_results.elements_selected_forces_nonconformity == [element_id]
+    assert element_id not in model.automate_results.elements_selected_conformity
+    assert len(model.automate_results.elements_selected_passed + model.automate_results.elements_selected_failed) == 3
+    assert len(model.columns_commit['@Columns']) == 3
+
@@ -0,0 +1,52 @@
+import os, sys, json
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+import pytest
+from specklepy.api import operations
+from specklepy.transports.sqlite import SQLiteTransport
+from benchmarks.synthetic import create_model
+from cli import main
+
+def test_offline_runner(tmp_path):
+    transport = SQLiteTransport(base_path=str(tmp_path), scope='archived')
+    operations.send(create_model(columns=8, beams=4, slabs=1), [transport], use_default_cache=False)
+    transport.close()
+    (tmp_path / 'serialised.json').write_text(operations.serialize(create_model(columns=5, beams=2, seed=1)))
+    (tmp_path / 'broken.json').write_text('{}')
+    output = tmp_path / 'results'
+
+    exit_code = main([str(tmp_path / 'archived.db'), str(tmp_path / 'serialised.json'), str(tmp_path / 'broken.json'),
+                      '--output', str(output), '--workers', '2'])
+
+    summaries = json.loads((output / 'summary.json').read_text())
+    assert exit_code == 1 # NOTE: for the broken file, the others are designed regardless
+    assert [(summary['columns'], summary['passed'] + summary['failed']) for summary in summaries] == [(8, 8), (5, 5), (0, 0)]
+    assert summaries[2]['error'].startswith('ValueError')
+    results_transport = SQLiteTransport(base_path=str(output), scope='archived-results')
+    results = operations.receive(summaries[0]['object_id'], local_transport=results_transport)
+    assert len(results['@Columns']) == 8
+
+def test_inputs_with_equal_names_get_their_own_output(tmp_path):
+    for i, directory in enumerate(['a', 'b']):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / 'model.json').write_text(operations.serialize(create_model(columns=3 + i, seed=i)))
+    output = tmp_path / 'results'
+
+    assert main([str(tmp_path / 'a' / 'model.json'), str(tmp_path / 'b' / 'model.json'), '--output', str(output),
+                 '--workers', '2']) == 0
+
+    summaries = json.loads((output / 'summary.json').read_text())
+    assert [os.path.basename(summary['output']) for summary in summaries] == ['model-0-results.db', 'model-1-results.db']
+    for i, summary in enumerate(summaries):
+        results_transport = SQLiteTransport(base_path=str(output), scope=f'model-{i}-results')
+        assert len(operations.receive(summary['object_id'], local_transport=results_transport)['@Columns']) == 3 + i
+
+
+def test_export_results_requires_column_design(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main([str(tmp_path / 'model.json'), '--design-mode', 'Column sizing', '--export-results'])
+
+    assert exit.value.code == 2
+    assert '--export-results is only available' in capsys.readouterr().err
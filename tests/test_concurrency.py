@@ -0,0 +1,37 @@
+import os, sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.synthetic import assign_ids, create_model
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+
+DESIGN_CODE = Eurocode({'service_class': 1, 'load_duration_class': 'Medium term'})
+
+def flatten(results):
+    return results.utilisation, [(section, log.symbol, log.value) for section, logs in results.calculation_log.items() for log in logs]
+
+def design(column):
+    return flatten(DESIGN_CODE.design_column(column))
+
+def test_one_design_code_from_many_threads_and_processes():
+    commit = create_model(columns=60, beams=0, slabs=0)
+    assign_ids(commit)
+    model = EtabsModel(commit, DESIGN_CODE, None)
+    model.setup_model()
+    model.create_column_objects()
+    columns = [column for column in model.columns if column.is_designable] * 10
+    rng = np.random.default_rng(0)
+    columns = [columns[i] for i in rng.permutation(len(columns))] # NOTE: interleave equal and different columns
+
+    serial_results = [DESIGN_CODE.design_column(column) for column in columns]
+    assert len({id(results.calculation_log) for results in serial_results}) == len(columns)
+    expected = [flatten(results) for results in serial_results]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        assert list(executor.map(design, columns)) == expected
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(executor.map(design, columns[:100], chunksize=10)) == expected[:100]
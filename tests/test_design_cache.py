@@ -0,0 +1,51 @@
+import os, sys, json
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.synthetic import assign_ids, create_model
+from src.design.cache import DesignCache
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+
+def design(cache=None, batch=True):
+    commit = create_model(columns=12, beams=2, slabs=1)
+    assign_ids(commit)
+    model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.column_designer.cache = cache
+    model.setup_model()
+    model.create_column_objects()
+    model.columns.append(model.columns[0]) # NOTE: equal inputs within one batch
+    model.design_columns(batch=batch)
+    return [(column.design_results.utilisation, dict(column.design_results.calculation_log)) for column in model.columns]
+
+def test_cached_results_match_and_persist(tmp_path):
+    expected = design()
+    path = str(tmp_path / 'cache.sqlite')
+
+    first = DesignCache(path=path)
+    assert design(first) == expected
+    assert (first.statistics.hits, first.statistics.misses) == (1, 12)
+
+    second = DesignCache(path=path) # NOTE: a later run, served from disk
+    assert design(second) == expected
+    assert (second.statistics.hits, second.statistics.misses) == (13, 0)
+    assert second.statistics.time_saved > 0
+
+    scalar = DesignCache(maxsize=4)
+    assert design(scalar, batch=False) == expected
+    assert len(scalar) == 4
+
+def test_stored_results_are_json_and_unshared(tmp_path):
+    path = str(tmp_path / 'cache' / 'cache.sqlite')
+    expected = design(batch=False)
+    assert design(DesignCache(path=path), batch=False) == expected
+
+    cache = DesignCache(path=path) # NOTE: eager calculation logs, read back from disk
+    assert design(cache, batch=False) == expected
+    key, (results, _) = next(iter(cache._results.items()))
+    served = cache.get(key)
+    next(iter(served.calculation_log.values())).clear()
+    assert cache.get(key).calculation_log == results.calculation_log != served.calculation_log
+    value, = cache._connection.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+    assert json.loads(value)['utilisation'] == results.utilisation
@@ -0,0 +1,54 @@
+import os, sys
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.synthetic import create_model
+from main import LoadDurationClasses, LogLevels
+from src.design.loader import code_loader
+from src.model.factory import model_loader
+from src.project.export import field_name, results_columns, write_parquet
+
+def designed_model(columns=6):
+    design_code = code_loader(design_code='Eurocode',
+                              design_parameters={'service_class': 1,
+                                                 'load_duration_class': LoadDurationClasses.Permanent.value,
+                                                 'log_level': LogLevels.Full.value})
+    structural_model = model_loader('ETABS', create_model(columns=columns, beams=2, slabs=1), design_code, None)
+    structural_model.setup_model()
+    structural_model.create_column_objects()
+    structural_model.design_columns()
+    return structural_model
+
+def test_results_columns():
+    structural_model = designed_model()
+    columns = [column for column in structural_model.columns if column.design_results is not None]
+    eager_column = columns[1] # NOTE: an eager calculation log next to the compact ones
+    eager_column.set_design_results(structural_model.column_designer.design_code.design_column(eager_column))
+
+    table = results_columns(structural_model.columns, structural_model.design_groups)
+
+    assert len(set(len(values) for values in table.values())) == 1 and len(table['elementId']) == len(columns)
+    assert table['elementId'] == [column.speckle_object.id for column in columns]
+    assert set(table['designGroup']) == {group.name for group in structural_model.design_groups}
+    for i, column in enumerate(columns):
+        assert table['utilisation'][i] == column.design_results.utilisation
+        assert table['governingCombination'][i] == column.design_results.governing_combination
+        for _, logs in column.design_results.calculation_log.items():
+            for log in logs:
+                if log.symbol != 'beta_c':
+                    assert np.isclose(table[field_name(log)][i], log.value, equal_nan=True)
+
+def test_write_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    structural_model = designed_model()
+
+    path = write_parquet(str(tmp_path / 'results.parquet'), structural_model.columns, structural_model.design_groups)
+
+    table = pq.read_table(path)
+    assert table.num_rows == len(structural_model.columns)
+    assert table.column('utilisation').to_pylist() == [column.design_results.utilisation
+                                                       for column in structural_model.columns]
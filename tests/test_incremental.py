@@ -0,0 +1,62 @@
+import os, sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from specklepy.api import operations
+from specklepy.transports.memory import MemoryTransport
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+from src.model.incremental import DesignHistory
+from tests.builders import design, received_model
+
+def test_incremental_design_only_designs_changed_columns():
+    transport = MemoryTransport() # NOTE: the previous results as received from the results model
+    previous = design(received_model())
+    previous = operations.receive(operations.send(previous.columns_commit, [transport], use_default_cache=False),
+                                  local_transport=transport)
+
+    full = design(received_model(changed_columns=[2, 5]))
+    incremental = design(received_model(changed_columns=[2, 5]), DesignHistory.from_commit(previous))
+
+    assert len(incremental.columns) == 2
+    assert len(incremental.reused_columns) == 8
+    assert len(incremental.columns_commit['@Columns']) == 10
+    for category in ['elements_not_selected', 'elements_selected_conformity', 'elements_selected_passed', 'elements_selected_failed']:
+        assert sorted(getattr(incremental.automate_results, category)) == sorted(getattr(full.automate_results, category))
+
+def test_changed_envelope_redesigns_every_column():
+    transport = MemoryTransport()
+    previous = design(received_model(), forces_envelope='element')
+    previous = operations.receive(operations.send(previous.columns_commit, [transport], use_default_cache=False),
+                                  local_transport=transport)
+
+    full = design(received_model())
+    incremental = design(received_model(), DesignHistory.from_commit(previous))
+
+    assert len(incremental.reused_columns) == 0 and len(incremental.columns) == 10
+    assert ([column.designResults.utilisation for column in incremental.columns_commit['@Columns']] ==
+            [column.designResults.utilisation for column in full.columns_commit['@Columns']])
+
+def test_design_groups_of_an_incremental_design():
+    transport = MemoryTransport()
+    previous = design(received_model())
+    previous = operations.receive(operations.send(previous.columns_commit, [transport], use_default_cache=False),
+                                  local_transport=transport)
+
+    incremental = design(received_model(changed_columns=[2, 5]), DesignHistory.from_commit(previous))
+
+    groups = {group.name: group for group in incremental.columns_commit['@DesignGroups']}
+    for column in incremental.columns_commit['@Columns']:
+        group = column.designResults.designGroup
+        assert group is None or column.elementId in groups[group].elements
+    assert sum(group.count for group in groups.values()) == 2
+
+def test_design_groups_without_meshes():
+    model = EtabsModel(received_model(), Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.setup_model()
+    model.create_column_objects()
+    model.design_columns(generate_meshes=False)
+
+    assert [group.name for group in model.columns_commit['@DesignGroups']] == [f'DG{i}' for i in range(1, 6)]
+
@@ -0,0 +1,44 @@
+import os, sys, json
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+from src.utils.instrumentation import DISABLED_SPAN, Instrumentation
+from tests.builders import design, received_model
+
+def test_nested_spans():
+    instrumentation = Instrumentation(trace_allocations=True)
+
+    with instrumentation.span('outer', elements=3) as outer:
+        with instrumentation.span('inner'):
+            data = [0.0] * 1_000_000
+        del data
+        outer.count(columns=2)
+
+    outer, inner = instrumentation.report()
+    assert (outer['name'], inner['name']) == ('outer', 'outer/inner')
+    assert outer['counts'] == {'elements': 3, 'columns': 2}
+    assert outer['wall_time'] >= inner['wall_time'] > 0.0
+    assert outer['peak_allocated'] >= inner['peak_allocated'] >= 7.5 # NOTE: MB, 8 bytes per list item
+    assert json.loads(instrumentation.to_json()) == instrumentation.report()
+    assert instrumentation.summary().startswith('Timings: outer ')
+
+def test_template_methods_are_instrumented():
+    model = design(received_model()) # NOTE: instrumentation is disabled by default
+    assert model.instrumentation.span('stage') is DISABLED_SPAN and not model.instrumentation.spans
+
+    instrumentation = Instrumentation()
+    structural_model = EtabsModel(received_model(), Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    structural_model.instrumentation = instrumentation
+    structural_model.setup_model()
+    structural_model.create_column_objects()
+    structural_model.design_columns(generate_meshes=True)
+
+    spans = {span['name']: span for span in instrumentation.report()}
+    assert list(spans) == ['create_column_objects', 'create_column_objects/filter_columns',
+                           'create_column_objects/prepare_internal_forces', 'create_column_objects/parse_columns',
+                           'design_columns', 'design_columns/design', 'design_columns/meshes']
+    assert spans['create_column_objects']['counts'] == {'columns': 10, 'reused_columns': 0}
+    assert spans['design_columns']['counts'] == {'columns': 10, 'design_groups': 5}
@@ -0,0 +1,104 @@
+import os, sys, json
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from specklepy.api import operations
+from src.model.etabs import EtabsModel
+from src.model.structural_model import ModelUnits
+from src.design.eurocode import Eurocode
+
+def create_element(element_id, combinations, stations, seed):
+    """Element1D stand-in with analysis results in kN and kNmm"""
+    rng = np.random.default_rng(seed)
+    results_by_load_combination = []
+    for combination in combinations:
+        results_1d = [SimpleNamespace(position=station, **dict(zip(
+            ['forceX', 'forceY', 'forceZ', 'momentXX', 'momentYY', 'momentZZ'], rng.uniform(-500, 500, 6))))
+            for station in stations]
+        results_by_load_combination.append(SimpleNamespace(resultCase=SimpleNamespace(name=combination), results1D=results_1d))
+    return SimpleNamespace(id=element_id,
+                           AnalysisResults=SimpleNamespace(resultsByLoadCombination=results_by_load_combination))
+
+def test_forces_store_envelopes():
+    elements = [create_element(f'column_{i}', ['ULS1', 'ULS2', 'ULS3'], [0, 1500, 3000], i) for i in range(5)]
+    elements.append(SimpleNamespace(id='no_results'))
+    model = EtabsModel(None, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.units = ModelUnits('mm', 'kN')
+    model.prepare_internal_forces(elements)
+
+    for i, element in enumerate(elements[:-1]):
+        internal_forces = model.parse_internal_forces(element)
+        expected = pd.DataFrame([{'result_case': load_combination.resultCase.name,
+                                  'axial_force': result.forceX * 1e3,
+                                  'bending_y': result.momentYY * 1e-3 * 1e3}
+                                 for load_combination in element.AnalysisResults.resultsByLoadCombination
+                                 for result in load_combination.results1D])
+        assert len(internal_forces) == 9
+        assert internal_forces.minimum('axial_force') == expected['axial_force'].min()
+        assert np.isclose(internal_forces.maximum('bending_y'), expected['bending_y'].max())
+
+        envelope = model.forces_store.envelope('axial_force', per_combination=True)
+        grouped = expected.groupby('result_case', sort=False)['axial_force']
+        selected = envelope.element_index == i
+        assert list(envelope.minimum[selected]) == list(grouped.min())
+        assert list(envelope.maximum[selected]) == list(grouped.max())
+        assert [model.forces_store.combinations[j] for j in envelope.combination_index[selected]] == ['ULS1', 'ULS2', 'ULS3']
+
+    with pytest.raises(ValueError):
+        model.parse_internal_forces(elements[-1])
+
+def test_envelope_at_parse_time():
+    elements = [create_element(f'column_{i}', ['ULS1', 'ULS2', 'ULS3'], [0, 1500, 3000], i) for i in range(5)]
+    units = ModelUnits('mm', 'kN')
+    full = EtabsModel.build_forces_store(elements, units)
+    per_combination = EtabsModel.build_forces_store(elements, units, envelope='combination')
+    per_element = EtabsModel.build_forces_store(elements, units, envelope='element')
+
+    assert len(per_combination) == 15 and len(per_element) == 5
+    assert per_element.combinations == ['Envelope'] and np.isnan(per_element.station).all()
+    for component in ['axial_force', 'bending_y', 'bending_z']:
+        values = full.components[component].reshape(5, 3, 3)
+        extremes = np.take_along_axis(values, np.abs(values).argmax(axis=2)[..., np.newaxis], axis=2)
+        assert np.array_equal(per_combination.components[component], extremes.ravel())
+        assert np.array_equal(np.abs(per_element.components[component]), np.abs(values).max(axis=(1, 2)))
+
+    with pytest.raises(ValueError):
+        EtabsModel.build_forces_store(elements, units, envelope='station')
+
+def test_envelope_design_is_conservative():
+    from benchmarks.synthetic import assign_ids, create_model
+    utilisations = {}
+    for envelope in [None, 'combination', 'element']:
+        commit = create_model(columns=20, beams=0, slabs=0)
+        assign_ids(commit)
+        model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+        model.setup_model()
+        model.forces_envelope = envelope
+        model.create_column_objects()
+        model.design_columns()
+        utilisations[envelope] = np.array([column.design_results.utilisation for column in model.columns])
+
+    assert np.all(utilisations['combination'] >= utilisations[None])
+    assert np.all(utilisations['element'] >= utilisations['combination'])
+
+def test_envelope_results_serialise_to_strict_json():
+    from benchmarks.synthetic import assign_ids, create_model
+    for envelope in [None, 'combination', 'element']: # NOTE: the stations of an envelope are NaN
+        commit = create_model(columns=3, beams=0, slabs=0)
+        assign_ids(commit)
+        model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+        model.setup_model()
+        model.forces_envelope = envelope
+        model.create_column_objects()
+        model.design_columns(generate_meshes=True)
+
+        serialised = operations.serialize(model.columns_commit['@Columns'][0])
+        design_results = json.loads(serialised, parse_constant=lambda constant: pytest.fail(f'{constant} in JSON'))
+        design_results = design_results['designResults']
+        assert ('governingStation' in design_results) == (envelope is None)
+
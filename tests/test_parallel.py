@@ -0,0 +1,37 @@
+import os, sys
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.synthetic import assign_ids, create_model
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+
+def parse(commit, workers, backend):
+    model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.setup_model()
+    model.create_column_objects(workers=workers, backend=backend)
+    return model
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_parallel_parsing_is_deterministic(backend):
+    commit = create_model(columns=23, beams=4, slabs=2)
+    assign_ids(commit)
+    elements = commit['@Model'].elements
+    elements[3].property.material.name = 'S355'
+    elements[7].property.profile.shapeName = 'Circular'
+    del elements[11].AnalysisResults
+
+    serial = parse(commit, 1, 'thread')
+    parallel = parse(commit, 3, backend)
+
+    assert parallel.automate_results == serial.automate_results
+    assert [column.speckle_object.id for column in parallel.columns] == [column.speckle_object.id for column in serial.columns]
+    for serial_column, parallel_column in zip(serial.columns, parallel.columns):
+        assert parallel_column.is_designable == serial_column.is_designable
+        if serial_column.internal_forces is not None:
+            assert np.array_equal(parallel_column.internal_forces.component('bending_y'),
+                                  serial_column.internal_forces.component('bending_y'))
+            assert parallel_column.internal_forces.dataframe.equals(serial_column.internal_forces.dataframe)
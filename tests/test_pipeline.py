@@ -0,0 +1,83 @@
+import os, sys, tempfile
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from specklepy.api import operations
+from specklepy.objects.other import BlockInstance
+from benchmarks.bench_pipeline import run
+from benchmarks.offline import InMemoryServerTransport, StubAutomationContext
+from benchmarks.synthetic import create_model
+from main import AvailableDesignModes, FunctionInputs, automate_function
+from src.model.structural_model import StructuralModel
+
+def test_automate_function_offline():
+    transport = InMemoryServerTransport()
+    object_id = operations.send(create_model(columns=12, beams=5, slabs=2), [transport], use_default_cache=False)
+    automate_context = StubAutomationContext(object_id)
+
+    automate_function(automate_context, FunctionInputs(persistent_design_cache=False), transport)
+
+    assert automate_context.status == 'succeeded'
+    assert [(level, len(object_ids)) for level, _, object_ids, _, _ in automate_context.object_results] == [
+        ('info', 6), ('warning', 6)]
+    results = automate_context.speckle_client.get_branch('project', 'Timber Design').commits.items[0]
+    results = operations.receive(results.referencedObject, local_transport=transport)
+    assert len(results['@Columns']) == 12 and len(results['@DesignGroups']) == 5
+
+def test_column_sizing_offline():
+    transport = InMemoryServerTransport()
+    object_id = operations.send(create_model(columns=6, beams=1), [transport], use_default_cache=False)
+    automate_context = StubAutomationContext(object_id)
+
+    automate_function(automate_context, FunctionInputs(chosen_design_mode=AvailableDesignModes.ColumnSizing), transport)
+
+    assert automate_context.status == 'succeeded'
+    results = automate_context.speckle_client.get_branch('project', 'Timber Design').commits.items[0]
+    results = operations.receive(results.referencedObject, local_transport=transport)
+    assert len(results['@Columns']) == 6
+    assert all(column.sizingResults['weight (kg per m)'] > 0 for column in results['@Columns'])
+
+def test_instanced_meshes_input():
+    transport = InMemoryServerTransport()
+    object_id = operations.send(create_model(columns=6, beams=1), [transport], use_default_cache=False)
+    automate_context = StubAutomationContext(object_id)
+
+    automate_function(automate_context, FunctionInputs(instanced_meshes=True), transport)
+
+    results = automate_context.speckle_client.get_branch('project', 'Timber Design').commits.items[0]
+    results = operations.receive(results.referencedObject, local_transport=transport)
+    assert all(isinstance(column.displayValue, BlockInstance) for column in results['@Columns'])
+
+def test_offline_runs_leave_the_user_cache_alone(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path)) # NOTE: where specklepy keeps its default SQLite cache
+    transport = InMemoryServerTransport()
+    object_id = operations.send(create_model(columns=4, beams=1), [transport], use_default_cache=False)
+    automate_context = StubAutomationContext(object_id)
+
+    for pipelined_upload in [True, False]: # NOTE: the second run also receives the results of the first one
+        automate_function(automate_context, FunctionInputs(pipelined_upload=pipelined_upload), transport)
+
+    assert automate_context.status == 'succeeded'
+    assert len(automate_context.speckle_client.models['Timber Design']) == 2
+    assert not list(tmp_path.iterdir())
+
+def test_failed_run_removes_the_received_commit(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path)) # NOTE: where StreamingReceiver copies the commit to
+    monkeypatch.setattr(StructuralModel, 'create_column_objects', lambda model: 1 / 0)
+    transport = InMemoryServerTransport()
+    object_id = operations.send(create_model(columns=4, beams=1), [transport], use_default_cache=False)
+
+    try:
+        automate_function(StubAutomationContext(object_id), FunctionInputs(), transport)
+    except ZeroDivisionError: # NOTE: checked while the traceback still holds the frames of the run
+        assert not list(tmp_path.iterdir())
+    else:
+        pytest.fail('The run did not fail')
+
+def test_benchmark_run():
+    result = run({'columns': 10, 'beams': 2, 'slabs': 1})
+
+    assert result['columns'] == 10 and result['columns_per_second'] > 0
+    assert {'receive_version', 'create_column_objects', 'design_columns/design', 'send_results_model'} <= set(result['stages'])
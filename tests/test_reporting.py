@@ -0,0 +1,56 @@
+import os, sys, json, tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from src.design.logger import AutomationIDLogger
+from src.project.reporting import Reporter
+
+class RecordingContext:
+    """Stand-in for the AutomationContext, keeps the attached results"""
+    def __init__(self):
+        self.results = []
+        self.files = []
+
+    def attach_info_to_objects(self, **kwargs):
+        self.results.append(('info', kwargs))
+
+    def attach_warning_to_objects(self, **kwargs):
+        self.results.append(('warning', kwargs))
+
+    def store_file_result(self, path):
+        self.files.append(path)
+
+def test_reports_are_capped_and_skip_not_selected(tmp_path):
+    automate_results = AutomationIDLogger(elements_not_selected=[f'beam{i}' for i in range(5000)],
+                                          elements_selected_passed=[f'column{i}' for i in range(450)],
+                                          elements_selected_failed=['column450'])
+    context = RecordingContext()
+    reporter = Reporter(context, max_ids=100)
+
+    reporter.report(automate_results, design_mode='column', code='EN 1995-1-1:2004+A1:2008 (E)')
+    reporter.store_full_lists(automate_results, str(tmp_path / 'element-ids.json'))
+
+    (passed_level, passed), (failed_level, failed) = context.results
+    assert (passed_level, failed_level) == ('info', 'warning')
+    assert passed['category'] == 'Elements passing design check according to EN 1995-1-1:2004+A1:2008 (E)'
+    assert passed['object_ids'][:3] == ['column0', 'column4', 'column9'] and len(passed['object_ids']) == 100
+    assert passed['metadata'] == {'count': 450} and passed['message'].endswith('Showing 100 of 450 elements.')
+    assert failed['object_ids'] == ['column450'] and failed['message'].endswith('information.')
+    with open(context.files[0]) as file:
+        assert len(json.load(file)['elements_not_selected']) == 5000
+
+    context.results.clear()
+    Reporter(context, include_not_selected=True).report(automate_results, design_mode='column', code='')
+    assert context.results[0][1]['category'] == 'Elements not defined as column'
+
+def test_full_lists_leave_no_temporary_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    context = RecordingContext()
+    stored = []
+    context.store_file_result = lambda path: stored.append(os.path.exists(path))
+
+    Reporter(context).store_full_lists(AutomationIDLogger(elements_selected_passed=['column0']))
+
+    assert stored == [True]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,97 @@
+import os, sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from specklepy.api import operations
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.sqlite import SQLiteTransport
+from src.model.structural_model import StructuralModel
+from src.project.sender import ChunkedSender, RecordingTransport
+from tests.builders import design, received_model
+
+class FlakyTransport(MemoryTransport):
+    """Stand-in for the server transport, every other upload fails"""
+    def __init__(self):
+        super().__init__()
+        self.uploads = 0
+
+    def end_write(self) -> None:
+        self.uploads += 1
+        if self.uploads % 2:
+            raise ConnectionError('Connection reset')
+
+def test_chunked_send_matches_send():
+    transport = FlakyTransport()
+    model = design(received_model())
+    sender = ChunkedSender(transport, chunk_size=3, backoff=0.0)
+    sender.submit('@Columns', model.columns_commit['@Columns'])
+
+    object_id = sender.send(model.columns_commit)
+
+    assert object_id == operations.send(model.columns_commit, [MemoryTransport()], use_default_cache=False)
+    assert sender.statistics.retries == sender.statistics.chunks == 5 # NOTE: four chunks of columns and the root
+    received = operations.receive(object_id, local_transport=transport)
+    assert ([column.designResults.utilisation for column in received['@Columns']] ==
+            [column.designResults.utilisation for column in model.columns_commit['@Columns']])
+    assert len(received['@DesignGroups']) == 5
+
+def test_pipelined_design():
+    transport = MemoryTransport()
+    model = design(received_model())
+    pipelined = design(received_model(), results_sender=ChunkedSender(transport, chunk_size=4))
+
+    object_id = pipelined.results_sender.send(pipelined.columns_commit)
+
+    assert object_id == operations.send(model.columns_commit, [MemoryTransport()], use_default_cache=False)
+    assert operations.receive(object_id, local_transport=transport)['@Columns'][9].designResults.designGroup == 'DG5'
+
+def test_mesh_error_drops_only_failing_columns(monkeypatch):
+    commit_objects = StructuralModel.commit_objects
+    def failing_commit_objects(model, columns, *args):
+        if any(column.speckle_object.name == 'Column5' for column in columns):
+            raise ValueError('Degenerate section')
+        return commit_objects(model, columns, *args)
+    monkeypatch.setattr(StructuralModel, 'commit_objects', failing_commit_objects)
+    transport = MemoryTransport()
+
+    model = design(received_model(), results_sender=ChunkedSender(transport, chunk_size=4))
+    object_id = model.results_sender.send(model.columns_commit)
+
+    names = [column.name for column in operations.receive(object_id, local_transport=transport)['@Columns']]
+    assert names == [f'Column{i}' for i in range(10) if i != 5]
+
+def test_sqlite_cache_on_upload_thread(tmp_path):
+    transport = MemoryTransport()
+    create_cache = lambda: SQLiteTransport(base_path=str(tmp_path), scope='cache') # NOTE: as Project.create_sender()
+    model = design(received_model(), results_sender=ChunkedSender(transport, create_cache, chunk_size=4, retries=0))
+
+    object_id = model.results_sender.send(model.columns_commit)
+
+    assert model.results_sender.statistics.retries == 0
+    cache = SQLiteTransport(base_path=str(tmp_path), scope='cache')
+    assert cache.get_object(object_id) == transport.get_object(object_id)
+    assert len(operations.receive(object_id, local_transport=cache)['@Columns']) == 10
+
+
+def test_changed_attribute_is_sent_in_full():
+    transport = MemoryTransport()
+    model = design(received_model())
+    sender = ChunkedSender(transport, chunk_size=4)
+    sender.submit('@Columns', model.columns_commit['@Columns'])
+    model.columns_commit['@Columns'] = model.columns_commit['@Columns'][::-1]
+
+    object_id = sender.send(model.columns_commit)
+
+    assert object_id == operations.send(model.columns_commit, [MemoryTransport()], use_default_cache=False)
+    assert operations.receive(object_id, local_transport=transport)['@Columns'][0].name == 'Column9'
+
+def test_recording_transport_copies_children():
+    model = design(received_model())
+    recorder, target = RecordingTransport(), MemoryTransport()
+    object_id, _ = BaseObjectSerializer(write_transports=[recorder]).traverse_base(model.columns_commit)
+
+    assert recorder.copy_object_and_children(object_id, target) == recorder.get_object(object_id)
+    assert set(target.objects) == {id for id, _ in recorder.objects}
+    assert len(operations.receive(object_id, local_transport=target)['@Columns']) == 10
@@ -0,0 +1,71 @@
+import os, sys
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from specklepy.api import operations
+from specklepy.transports.memory import MemoryTransport
+from benchmarks.synthetic import create_model
+from src.core.cross_section import RectangularSection
+from src.core.materials import MaterialFactory
+from src.core.structural_elements import Column
+from src.design.design_code import DesignCode
+from src.design.eurocode import Eurocode
+from src.design.sizing import SectionCatalogue
+from src.model.etabs import EtabsModel
+from tests.builders import create_column
+
+def resize(column, catalogue, j):
+    width, depth = catalogue.width[j], catalogue.depth[j]
+    name = catalogue.strength_classes[j].name
+    cross_section = RectangularSection(width, depth, width * depth, width * depth ** 3 / 12, depth * width ** 3 / 12)
+    speckle_object = SimpleNamespace(property=SimpleNamespace(material=SimpleNamespace(name=name)))
+    return Column(speckle_object, column.length, cross_section, MaterialFactory.get_material('Britain', name),
+                  column.internal_forces, True)
+
+def test_sizing_finds_lightest_passing_section():
+    columns = [create_column(0.1, 0.1, 3.0, 'C24', 50e3),
+               create_column(0.1, 0.1, 4.5, 'C24', 400e3, [(20e3, 5e3), (-5e3, 15e3)]),
+               create_column(0.1, 0.1, 6.0, 'C24', 1500e3, [(60e3, 0.0)]),
+               create_column(0.1, 0.1, 3.0, 'C24', 1e9)]
+    design_code = Eurocode({'service_class': 1, 'load_duration_class': 'Medium term'})
+    catalogue = SectionCatalogue()
+
+    results = design_code.size_columns(columns, catalogue)
+
+    assert results[-1] is None
+    for column, result in zip(columns[:-1], results):
+        utilisations = [design_code.design_column(resize(column, catalogue, j)).utilisation for j in range(len(catalogue))]
+        lightest = next(j for j, utilisation in enumerate(utilisations) if utilisation <= 1.0)
+        assert (result.width, result.depth, result.strength_class) == \
+               (catalogue.width[lightest], catalogue.depth[lightest], catalogue.strength_classes[lightest].name)
+        assert result.utilisation == utilisations[lightest]
+        assert result.candidates_checked < len(catalogue) / 4 # NOTE: most candidates are pruned by the bounds
+
+def test_design_code_without_sizing_sizes_no_column():
+    class UnsizedCode(DesignCode):
+        def design_column(self, column):
+            return None
+
+    columns = [create_column(0.2, 0.2, 3.0, 'C24', 100e3), create_column(0.2, 0.4, 3.0, 'C24', 300e3)]
+
+    assert UnsizedCode('Unsized', {}).size_columns(columns, SectionCatalogue()) == [None, None]
+
+def test_only_conforming_columns_are_sized():
+    commit = create_model(columns=5, beams=1)
+    commit['@Model'].elements[1].property.material.name = 'C30/37' # NOTE: concrete
+    commit['@Model'].elements[3].AnalysisResults.resultsByLoadCombination = []
+    transport = MemoryTransport()
+    commit = operations.receive(operations.send(commit, [transport], use_default_cache=False), local_transport=transport)
+    model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.setup_model()
+    model.create_column_objects()
+
+    model.size_columns()
+
+    sized = model.automate_results.elements_selected_passed + model.automate_results.elements_selected_failed
+    assert sorted(sized) == sorted(model.automate_results.elements_selected_conformity)
+    assert len(sized) == len(model.columns_commit['@Columns']) == 3
+    assert model.columns[1].sizing_results is None and model.columns[3].sizing_results is None
+
@@ -0,0 +1,61 @@
+import os, sys
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from specklepy.api import operations
+from specklepy.objects import Base
+from specklepy.transports.memory import MemoryTransport
+from benchmarks.offline import InMemoryServerTransport
+from benchmarks.synthetic import create_model
+from flatten import flatten_base
+from src.design.eurocode import Eurocode
+from src.model.etabs import EtabsModel
+from src.model.streaming import StreamingReceiver
+
+def parse(commit):
+    model = EtabsModel(commit, Eurocode({'service_class': 1, 'load_duration_class': 'Permanent'}), None)
+    model.setup_model()
+    model.create_column_objects()
+    return model
+
+def test_streamed_model_matches_received_model():
+    transport = MemoryTransport() # NOTE: stands in for the local transport, the remote copy is specklepy's
+    object_id = operations.send(create_model(columns=12, beams=5, slabs=3), [transport], use_default_cache=False)
+
+    eager = parse(operations.receive(object_id, local_transport=transport))
+    streamed = parse(StreamingReceiver(object_id, local_transport=transport).receive())
+
+    assert streamed.automate_results == eager.automate_results
+    assert len(streamed.automate_results.elements_not_selected) == 8
+    assert [column.speckle_object.id for column in streamed.columns] == [column.speckle_object.id for column in eager.columns]
+    for eager_column, streamed_column in zip(eager.columns, streamed.columns):
+        assert np.array_equal(streamed_column.internal_forces.component('axial_force'),
+                              eager_column.internal_forces.component('axial_force'))
+
+def test_flatten_base_is_iterative_and_depth_bounded():
+    root = node = Base(name='0')
+    for depth in range(1, 5000): # NOTE: well past the recursion limit
+        node.elements = [Base(name=str(depth))]
+        node = node.elements[0]
+
+    assert [base.name for base in flatten_base(root)][:2] == ['4999', '4998']
+    assert [base.name for base in flatten_base(root, max_depth=2)] == ['2', '1', '0']
+
+def test_flatten_base_continues_after_none():
+    root = Base(name='root')
+    root.elements = [Base(name='a'), None, Base(name='b')]
+
+    assert [getattr(base, 'name', None) for base in flatten_base(root)] == ['a', None, 'b', 'root']
+
+def test_temporary_local_transport_is_removed():
+    remote = InMemoryServerTransport()
+    object_id = operations.send(create_model(columns=3, beams=1), [remote], use_default_cache=False)
+    receiver = StreamingReceiver(object_id, remote)
+    directory = receiver.directory.name
+
+    assert len(parse(receiver.receive()).columns) == 3
+    receiver.close()
+    assert not os.path.exists(directory)
+
@@ -0,0 +1,63 @@
+import os, sys
+from types import SimpleNamespace
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.append(PROJECT_ROOT)
+
+from src.model.structural_model import ModelUnits
+from src.visualizer.visualizer import BatchColumnVisualizer, ColumnVisualizer, InstancedColumnVisualizer
+from tests.builders import design, received_model
+
+def create_column(start, end, width, depth, utilisation):
+    point = lambda xyz: SimpleNamespace(x=xyz[0], y=xyz[1], z=xyz[2])
+    speckle_object = SimpleNamespace(baseLine=SimpleNamespace(start=point(start), end=point(end)),
+                                     property=SimpleNamespace(profile=SimpleNamespace(width=width, depth=depth)))
+    return SimpleNamespace(speckle_object=speckle_object, design_results=SimpleNamespace(utilisation=utilisation))
+
+def test_batch_meshes_match_column_visualizer():
+    columns = [create_column((0, 0, 0), (0, 0, 3000), 200, 300, 0.5),
+               create_column((1000, 0, 3000), (1000, 0, 0), 240, 240, 1.3),
+               create_column((0, 0, 0), (500, 800, 2900), 200, 400, 0.75),
+               create_column((-200, 300, 4000), (100, -50, 1000), 160, 320, 0.0)]
+    units = ModelUnits('mm', 'kN')
+
+    display_meshes = BatchColumnVisualizer(columns, units).visualize()
+
+    for column, batch_meshes in zip(columns, display_meshes):
+        reference_mesh, utilisation_mesh = ColumnVisualizer(column, units).visualize()
+        for expected, actual in [(reference_mesh, batch_meshes.reference), (utilisation_mesh, batch_meshes.utilisation)]:
+            assert actual.faces == expected.faces
+            assert np.allclose(actual.vertices, expected.vertices, atol=1e-9)
+            assert actual['renderMaterial'].diffuse == expected['renderMaterial'].diffuse
+
+def test_instanced_meshes_match_batch_meshes():
+    columns = [create_column((0, 0, 0), (0, 0, 3000), 200, 300, 0.5),
+               create_column((6000, 0, 0), (6000, 0, 3000), 200, 300, 0.5),
+               create_column((1000, 0, 3000), (1000, 0, 0), 240, 240, 1.3),
+               create_column((0, 0, 0), (500, 800, 2900), 200, 400, 0.75)]
+    units = ModelUnits('mm', 'kN')
+
+    visualizer = InstancedColumnVisualizer(columns, units, utilisation_step=0.01)
+    instances = visualizer.visualize()
+    display_meshes = BatchColumnVisualizer(columns, units).visualize()
+
+    assert len(visualizer.definitions) == 6
+    assert instances[0].reference.definition is instances[1].reference.definition
+    for batch_meshes, instanced in zip(display_meshes, instances):
+        for expected, instance in [(batch_meshes.reference, instanced.reference), (batch_meshes.utilisation, instanced.utilisation)]:
+            vertices = instance.transform.apply_to_points_values(instance.definition.geometry[0].vertices)
+            assert instance.definition.geometry[0].faces == expected.faces
+            assert np.allclose(vertices, expected.vertices, atol=1e-6)
+
+def test_result_objects_reference_elements():
+    model = design(received_model())
+    element = model.columns[0].speckle_object
+
+    result = model.columns_commit['@Columns'][0]
+    full_result = ColumnVisualizer.result_object(model.columns[0], include_forces=True)
+
+    assert (result.elementId, result.material, result['length (m)']) == (element.id, element.property.material.name, 3.0)
+    assert not hasattr(result, 'AnalysisResults') and not hasattr(result, 'property')
+    assert full_result['@AnalysisResults'] is element.AnalysisResults
+    assert hasattr(element, 'baseLine') and not hasattr(element, 'designResults') # NOTE: the element is left as parsed